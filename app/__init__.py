@@ -1,8 +1,17 @@
 import os
-import pandas as pd
 from flask import Flask, json
 
-from app.services.stock.data_loader import stock_data_db, searching_stock_db
+from app.services.stock.market_data_store import market_data_store, print_memory_report
+from app.services.stock.market_snapshot import market_snapshot_cache
+from app.services.stock.latest_quote import latest_quote_store
+from app.services.stock.market_sentiment import market_sentiment_rollup
+from app.services.stock.stock_sentiment_stats import stock_sentiment_stats
+from app.services.stock.price_history import price_history_cache
+from app.services.stock.sentiment_index import stock_sentiment_index
+from app.services.favorites import favorite_codes_cache
+from app.services.stock.stock_detail import stock_detail_cache, configure_detail_executor
+from app.config import config_by_name
+from db import configure_pool
 
 def create_app():
     app = Flask(__name__,
@@ -10,21 +19,47 @@ def create_app():
                 template_folder='templates')
 
     app.config.from_pyfile('config.py')
+    # 환경별 설정 적용 (APP_ENV=development|production, 기본값은 Config)
+    app.config.from_object(config_by_name.get(os.environ.get('APP_ENV', 'default'), config_by_name['default']))
     app.config['SECRET_KEY'] = 'your_super_secret_key_12c345'
     APP_ROOT = app.root_path
     app.config['FAVORITES_FILE'] = os.path.join(APP_ROOT, 'favorites.csv')
 
-    with app.app_context():
+    # 이후 모든 get_connection() 호출이 이 설정의 커넥션 풀을 사용
+    configure_pool(app.config)
+    market_snapshot_cache.check_interval = app.config.get('MARKET_SNAPSHOT_CHECK_INTERVAL', 30)
+    latest_quote_store.refresh_interval = app.config.get('LATEST_QUOTE_REFRESH_INTERVAL', 5)
+    market_sentiment_rollup.refresh_interval = app.config.get('MARKET_SENTIMENT_REFRESH_INTERVAL', 60)
+    market_sentiment_rollup.settle_seconds = app.config.get('MARKET_SENTIMENT_SETTLE_SECONDS', 120)
+    stock_sentiment_stats.refresh_interval = app.config.get('STOCK_SENTIMENT_REFRESH_INTERVAL', 30)
+    stock_sentiment_index.refresh_interval = app.config.get('STOCK_SENTIMENT_INDEX_REFRESH_INTERVAL', 30)
+    market_data_store.snapshot_dir = app.config.get('MARKET_DATA_SNAPSHOT_DIR') or None
+    market_data_store.snapshot_interval = app.config.get('MARKET_DATA_SNAPSHOT_INTERVAL', 3600)
+    market_data_store.stream_chunk_size = app.config.get('MARKET_DATA_STREAM_CHUNK_SIZE')
+    market_data_store.window_months = app.config.get('MARKET_DATA_WINDOW_MONTHS', 3)
+    market_data_store.news_lookback_days = app.config.get('MARKET_DATA_NEWS_LOOKBACK_DAYS', 3)
+    market_data_store.max_staleness = app.config.get('MARKET_DATA_MAX_STALENESS', 900)
+    price_history_cache.max_bytes = app.config.get('PRICE_HISTORY_CACHE_MAX_BYTES')
+    favorite_codes_cache.ttl = app.config.get('FAVORITES_CACHE_TTL', 300)
+    stock_detail_cache.ttl = app.config.get('STOCK_DETAIL_CACHE_TTL', 10)
+    # 캐시 미스 한 건이 뉴스/체결가로 2개씩 쓰므로 요청 스레드 수의 2배, 풀 커넥션 수를 넘으면 대기만 늘어나므로 DB_POOL_SIZE로 제한
+    configure_detail_executor(
+        app.config.get('STOCK_DETAIL_FETCH_WORKERS')
+        or min(2 * int(os.environ.get('GUNICORN_THREADS', 4)), app.config.get('DB_POOL_SIZE', 10)))
+
+    # 시장 데이터 로드는 요청 처리를 막지 않도록 설정에 따라 백그라운드/첫 사용 시점으로 미룸
+    load_mode = app.config.get('MARKET_DATA_LOAD_MODE', 'background')
+    if load_mode == 'eager':
         print("데이터 로딩 시작")
-        *_, stock_volume_df = stock_data_db()
-        stock_list = searching_stock_db()
-        print(f"로드된 종목 수: {len(stock_list)}")
-        if not stock_volume_df.empty and '종목명' in stock_volume_df.columns and '거래량' in stock_volume_df.columns:
-            max_volume_df = stock_volume_df.groupby('종목명', as_index=False)['거래량'].max()
-            sorted_df = max_volume_df.sort_values(by='거래량', ascending=False)
-            app.config['TOP_VOLUME_DF'] = sorted_df
-        else:
-            app.config['TOP_VOLUME_DF'] = pd.DataFrame(columns=['종목명', '거래량'])
+        if not market_data_store.warm_up():
+            # 실패한 데이터셋은 백그라운드에서 다시 시도
+            market_data_store.start_background_warm_up(app.config.get('MARKET_DATA_RETRY_INTERVAL', 30))
+        print(f"로드된 종목 수: {len(market_data_store.stock_list)}")
+        print_memory_report(market_data_store.stats())
+    elif load_mode == 'background':
+        market_data_store.start_background_warm_up(app.config.get('MARKET_DATA_RETRY_INTERVAL', 30))
+    # 새 stock_data / company_news 행을 주기적으로 반영 (재시작 없이)
+    market_data_store.start_background_refresh(app.config.get('MARKET_DATA_REFRESH_INTERVAL', 0))
 
     def json_load_filter(json_string):
         try:
@@ -37,7 +72,7 @@ def create_app():
     # ⭐ [핵심 수정] 라우트 블루프린트 등록
     # ==============================================================================
     # 불필요한 'index_' import 구문을 완전히 삭제합니다.
-    from .routes.web import ai_report, index, search, autocomplete
+    from .routes.web import ai_report, index, search, autocomplete, health
     from .routes.users import admin, login, logout, modify, prefer_stock, profile, signup, signout
     from .routes.web.stocks_bp import stocks_bp
     #from .routes.volume import top_chart
@@ -63,5 +98,6 @@ def create_app():
     app.register_blueprint(search_api.bp, url_prefix='/api')
     app.register_blueprint(stock_analysis.bp, url_prefix='/api')
     app.register_blueprint(email_verification.bp)
+    app.register_blueprint(health.bp)
 
     return app
\ No newline at end of file
@@ -5,16 +5,73 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev_secret_key_for_prototyping'
     DEBUG = False
     TESTING = False
+
+    # DB 커넥션 풀 설정 (db.py의 configure_pool에서 사용)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_POOL_TIMEOUT = 10            # 풀이 가득 찼을 때 커넥션 대기 시간(초)
+    DB_POOL_IDLE_TIMEOUT = 300      # 유휴 커넥션 폐기 기준(초)
+    DB_POOL_MAX_LIFETIME = 1800     # 커넥션 최대 수명(초), MySQL wait_timeout보다 짧게
+    DB_POOL_PING_ON_BORROW = True   # 대여 시 ping으로 상태 확인
+
+    # 시장 데이터 초기 로드 방식
+    # background: 앱은 바로 뜨고 백그라운드 스레드에서 로드 (준비 여부는 /healthz/ready)
+    # lazy: 처음 사용하는 요청에서 로드, eager: create_app 안에서 로드가 끝날 때까지 대기
+    MARKET_DATA_LOAD_MODE = os.environ.get('MARKET_DATA_LOAD_MODE', 'background')
+    # 백그라운드 로드 실패 시 다시 시도하는 간격(초)
+    MARKET_DATA_RETRY_INTERVAL = 30
+    # 주가/뉴스 프레임 증분 갱신 주기(초), 0이면 갱신하지 않음
+    MARKET_DATA_REFRESH_INTERVAL = int(os.environ.get('MARKET_DATA_REFRESH_INTERVAL', 300))
+    # 프레임이 이 시간(초)보다 오래되면 다음 요청 때 백그라운드에서 증분 갱신 (0이면 사용하지 않음)
+    # gunicorn preload에서 워커 갱신을 끈 경우(WORKER_MARKET_DATA_REFRESH_INTERVAL=0) 요청이 적은 워커의 데이터 나이 상한
+    MARKET_DATA_MAX_STALENESS = int(os.environ.get('MARKET_DATA_MAX_STALENESS', 900))
+    # 뉴스 증분 갱신 때 다시 조회하는 최근 일수, 이전 날짜로 늦게 들어온 company_news 행을 이 기간 안에서 반영
+    MARKET_DATA_NEWS_LOOKBACK_DAYS = int(os.environ.get('MARKET_DATA_NEWS_LOOKBACK_DAYS', 3))
+    # 주가/뉴스 프레임의 로컬 컬럼 스냅샷 위치, 재시작 시 스냅샷 이후 행만 DB에서 조회 (빈 값이면 사용하지 않음)
+    MARKET_DATA_SNAPSHOT_DIR = os.environ.get(
+        'MARKET_DATA_SNAPSHOT_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'var', 'market_snapshot'))
+    # 증분 갱신 후 스냅샷을 다시 쓰는 최소 간격(초)
+    MARKET_DATA_SNAPSHOT_INTERVAL = 3600
+    # 모든 종목의 주가/뉴스를 메모리에 올리는 기간(개월), 더 긴 차트는 종목별로 DB에서 조회
+    MARKET_DATA_WINDOW_MONTHS = int(os.environ.get('MARKET_DATA_WINDOW_MONTHS', 3))
+    # 메모리 기간보다 오래된 종목별 주가 캐시의 최대 크기(바이트), 넘으면 오래 안 쓴 종목부터 버림
+    PRICE_HISTORY_CACHE_MAX_BYTES = int(os.environ.get('PRICE_HISTORY_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    # 주가/뉴스 로드 시 서버 측 커서에서 한 번에 받는 행 수 (클수록 빠르지만 최대 메모리가 늘어남)
+    MARKET_DATA_STREAM_CHUNK_SIZE = int(os.environ.get('MARKET_DATA_STREAM_CHUNK_SIZE', 50000))
+    # 메인 화면 스냅샷의 버전(최신 분석 날짜) 확인 주기(초), 이 시간 안에는 DB를 조회하지 않음
+    MARKET_SNAPSHOT_CHECK_INTERVAL = 30
+    # 종목별 최신 시세(live_data) 증분 조회 주기(초), 이 시간 안에는 메모리의 시세를 그대로 사용
+    LATEST_QUOTE_REFRESH_INTERVAL = 5
+    # 사용자별 관심 종목 코드 캐시 유지 시간(초), 추가/삭제는 세션의 목록 버전으로 모든 워커에 즉시 반영됨
+    FAVORITES_CACHE_TTL = 300
+    # 종목별 감성 지수(stock_sentiment) 증분 조회 주기(초)
+    STOCK_SENTIMENT_INDEX_REFRESH_INTERVAL = 30
+    # 관심 종목 상세 정보 캐시 유지 시간(초), 새 틱이 들어오면 이 시간과 관계없이 다시 만듦
+    STOCK_DETAIL_CACHE_TTL = 10
+    # 관심 종목 상세의 뉴스/체결가 동시 조회 스레드 수, 0이면 요청 스레드(GUNICORN_THREADS) x 2를 DB_POOL_SIZE 안에서 사용
+    STOCK_DETAIL_FETCH_WORKERS = int(os.environ.get('STOCK_DETAIL_FETCH_WORKERS', 0))
+    # 종목별 최신 AI 리포트 날짜 확인 주기(초), 날짜가 같으면 렌더링해 둔 리포트를 그대로 반환
+    AI_REPORT_CHECK_INTERVAL = 60
+    # market_analysis 일별/시간별 집계에 새 행을 반영하는 주기(초)
+    MARKET_SENTIMENT_REFRESH_INTERVAL = 60
+    # 시장 심리 집계에 넣기 전에 기다리는 시간(초), 같은 시각으로 늦게 커밋되는 market_analysis 행을 놓치지 않기 위함
+    MARKET_SENTIMENT_SETTLE_SECONDS = 120
+    # 종목 감성 점수 합계에 새 분석 결과를 반영하는 주기(초), 폴링 요청은 이 사이에 DB를 조회하지 않음
+    STOCK_SENTIMENT_REFRESH_INTERVAL = 30
     # 여기에 다른 전역 설정을 추가
 
 class DevelopmentConfig(Config):
     DEBUG = True
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
     # 여기에 개발 환경별 설정을 추가
 
 class ProductionConfig(Config):
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 20))
+    DB_POOL_TIMEOUT = 5
     # 여기에 프로덕션 환경별 설정을 추가
-    pass
 
-# app/__init__.py에서 다음과 같이 사용할 수 있음
-# app.config.from_object('app.config.DevelopmentConfig')
-# 또는 __init__.py에 직접 값을 넣는다면, 이 파일은 기본적인 설정에는 덜 중요할 수 있음
\ No newline at end of file
+# APP_ENV 환경변수 값으로 사용할 설정 클래스를 고름 (app/__init__.py 참고)
+config_by_name = {
+    'development': DevelopmentConfig,
+    'production': ProductionConfig,
+    'default': Config,
+}
@@ -1,36 +1,88 @@
 from flask import Blueprint, request, jsonify
-from app.services.stock.data_loader import news_data_db
+from app.services.stock.data_loader import build_analyze_frame, iter_json_records, ANALYZE_COLUMNS
+from app.services.stock.market_data_store import market_data_store
+from app.services.stock.news_body import with_article_bodies
+from app.services.pagination import parse_page_args, parse_fields, paginate_by_date, json_list_response
+from app.services.stock.price_history import price_history_cache, PRICE_HISTORY_COLUMNS
+import pandas as pd
 bp = Blueprint('api_stock_analysis', __name__, url_prefix='/api')
 
+ANALYZE_FIELDS = ANALYZE_COLUMNS + ['본문']
+ANALYZE_DEFAULT_LIMIT = 100
+ANALYZE_MAX_LIMIT = 1000
+PRICE_HISTORY_DEFAULT_FIELDS = ['날짜', '종가']
+
 @bp.route('/analyze', methods=['GET'])
 def get_stock_analysis():
     """
     쿼리 파라미터로 받은 종목명에 대해 주가 데이터와 뉴스 기사를 JSON 형태로 반환합니다.
-    예상 URL: /api/analyze?company_name=삼성전자
+    예상 URL: /api/analyze?company_name=삼성전자&limit=100&before_date=2025-07-01&before_key=<링크>&fields=날짜,종가,제목
+
+    - 날짜 내림차순으로 limit개씩 반환하고, 다음 페이지는 응답의 next_before_date / next_before_key를
+      before_date / before_key로 넘겨서 조회
+    - fields로 필요한 컬럼만 요청할 수 있음 (본문을 빼면 기사 본문 조회를 하지 않음)
     """
     company_name = request.args.get('company_name')
 
     if not company_name:
         return jsonify({'error': '종목명(company_name) 파라미터가 필요합니다.'}), 400
 
-    # news_data_db() 함수 호출로 데이터프레임 가져오기
-    news_data_df = news_data_db()
-
-    if news_data_df is None or news_data_df.empty:
-        return jsonify({'error': '뉴스 데이터가 로드되지 않았습니다.'}), 500
+    try:
+        before_date, before_key, limit = parse_page_args(request.args, ANALYZE_DEFAULT_LIMIT, ANALYZE_MAX_LIMIT)
+        fields = parse_fields(request.args, ANALYZE_FIELDS, ANALYZE_FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
     # 종목명 정제 (소문자 + 공백 제거 처리와 일치시켜야 함)
     company_name = company_name.strip().upper()
 
-    # 해당 종목에 대한 데이터 필터링
-    filtered_df = news_data_df[news_data_df['종목명'] == company_name]
+    # 공유 인덱스에서 해당 종목의 주가/뉴스 구간만 꺼냄 (요청마다 뉴스 전체를 다시 로드하지 않음)
+    stock_slice = market_data_store.get_stock_slice(company_name)
+    analyze_df = build_analyze_frame(stock_slice)
 
-    if filtered_df.empty:
+    if analyze_df.empty:
         return jsonify({'error': f"'{company_name}'에 대한 데이터를 찾을 수 없습니다. 정확한 종목명을 확인해주세요."}), 404
 
-    # JSON 변환을 위해 필요한 컬럼만 선택 (예시)
-    json_data = filtered_df[[
-        '날짜', '종가', '전일비', '거래량', '제목', '링크', '본문'
-    ]].sort_values('날짜', ascending=False).to_dict(orient='records')
+    page_df, next_cursor = paginate_by_date(analyze_df, before_date, limit, before_key)
+    json_data = iter_json_records(page_df, [field for field in fields if field != '본문'])
+
+    # 본문은 요청한 경우에만, 이 페이지에 들어가는 기사만 링크로 조회 (LRU 캐시)
+    if '본문' in fields:
+        json_data = with_article_bodies(json_data, page_df['링크'])
+
+    return json_list_response({'company_name': company_name}, 'data', json_data, len(page_df), next_cursor)
+
+
+@bp.route('/price_history', methods=['GET'])
+def get_price_history():
+    """
+    종목의 기간 주가를 날짜 오름차순으로 반환합니다. (검색 화면 1년/3년 차트용)
+    예상 URL: /api/price_history?company_name=삼성전자&range=1y
+              /api/price_history?company_name=005930&start_date=2023-01-01&end_date=2023-12-31&fields=날짜,종가,거래량
+
+    - 메모리 기간 안쪽은 공유 프레임에서, 그보다 오래된 구간만 DB에서 조회 (종목별 LRU 캐시)
+    """
+    company_name = (request.args.get('company_name') or '').strip().upper()
+    if not company_name:
+        return jsonify({'error': '종목명(company_name) 파라미터가 필요합니다.'}), 400
+
+    range_key = request.args.get('range', '1y')
+    start_date, end_date = request.args.get('start_date'), request.args.get('end_date')
+    try:
+        fields = parse_fields(request.args, PRICE_HISTORY_COLUMNS, PRICE_HISTORY_DEFAULT_FIELDS)
+        if start_date:
+            start, end = pd.Timestamp(start_date), pd.Timestamp(end_date) if end_date else None
+            if pd.isna(start) or (end is not None and pd.isna(end)):
+                raise ValueError('날짜 형식이 올바르지 않습니다. (YYYY-MM-DD)')
+            history_df = price_history_cache.get_range(company_name, start, end)
+            range_key = None
+        else:
+            history_df = price_history_cache.get_history(company_name, range_key)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if history_df is None:
+        return jsonify({'error': f"'{company_name}'에 대한 데이터를 찾을 수 없습니다. 정확한 종목명을 확인해주세요."}), 404
 
-    return jsonify({'company_name': company_name, 'data': json_data}), 200
\ No newline at end of file
+    return json_list_response({'company_name': company_name, 'range': range_key}, 'data',
+                              iter_json_records(history_df, fields), len(history_df))
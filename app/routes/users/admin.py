@@ -1,5 +1,6 @@
 from flask import Blueprint, current_app, render_template, session, redirect, url_for, flash, request
 from db import get_connection
+from app.services.favorites import forget_user
 from werkzeug.security import generate_password_hash
 
 bp = Blueprint('users_admin_bp', __name__)
@@ -151,6 +152,7 @@ def delete_user(userid):
         with conn.cursor() as cursor:
             cursor.execute("DELETE FROM users WHERE userid = %s", (userid,))
             conn.commit()
+        forget_user(userid)
         flash(f"{userid} 회원이 완전히 삭제되었습니다.", "success")
     except Exception as e:
         current_app.logger.error(f"회원 삭제 오류: {e}")
@@ -16,7 +16,7 @@ def login():
         conn = get_connection()
         try:
             with conn.cursor() as cursor:
-                sql = "SELECT userid, password, name, is_admin, is_active FROM users WHERE userid = %s"
+                sql = "SELECT id, userid, password, name, is_admin, is_active FROM users WHERE userid = %s"
                 cursor.execute(sql, (userid,))
                 user = cursor.fetchone()
 
@@ -33,6 +33,7 @@ def login():
                 if check_password_hash(db_password_hash, password):
                     session.permanent = False
                     session['user'] = db_userid
+                    session['user_pk'] = user['id']   # 관심 종목 추가/삭제 시 users.id를 다시 조회하지 않도록 보관
                     session['name'] = db_name
                     session['is_admin'] = bool(db_is_admin)
                     flash('로그인 성공!', 'success')
@@ -28,6 +28,7 @@ def signout():
 
         # 세션 해제 후 메인으로 이동
         session.pop('user', None)
+        session.pop('user_pk', None)
         session.pop('name', None)
         session.pop('is_admin', None)
         return redirect(url_for('web_index_bp.index'))
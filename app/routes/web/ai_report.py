@@ -1,30 +1,19 @@
 from flask import Blueprint, request, jsonify, current_app, render_template # ⭐ render_template_string 대신 render_template import
-import time
-from app.services.stock.data_loader import searching_stock_db # 이 부분은 경로가 정확한지 다시 한번 확인해주세요
+from app.services.stock.market_data_store import market_data_store
+from app.services.cache import TTLCache
 from db import get_connection
 import pymysql
 import markdown
 
-# searching_stock_db() 호출은 애플리케이션 컨텍스트 밖에서 일어나면 오류가 발생할 수 있습니다.
-# Flask 앱이 시작될 때 데이터를 로드하여 app.config에 저장하는 것이 일반적입니다.
-# 여기서는 편의상 전역 변수로 두지만, 실제 프로덕션 환경에서는 앱 컨텍스트를 활용하세요.
-try:
-    # app/__init__.py에서 로드된 stock_list를 가져오는 것이 이상적이지만,
-    # 여기서는 임시로 직접 로드 시도
-    stock_list = searching_stock_db()
-except Exception as e:
-    # print 대신 current_app.logger 사용 (앱 컨텍스트 밖에서는 print로 fallback)
-    try:
-        if current_app:
-            current_app.logger.error(f"Error loading stock_list at blueprint init: {e}")
-        else:
-            print(f"Error loading stock_list at blueprint init: {e}")
-    except RuntimeError: # current_app 접근 시 발생
-        print(f"Error loading stock_list at blueprint init: {e}")
-    stock_list = None # 로드 실패 시 None으로 설정
-
 bp = Blueprint('report_ai_report_bp', __name__)
 
+# (종목코드, 리포트 날짜) -> 렌더링이 끝난 응답 데이터
+# 새 stock_keywords 행이 들어오면 날짜가 바뀌어 다른 키가 되므로 따로 무효화할 필요 없음
+report_html_cache = TTLCache(maxsize=1024, ttl=None)
+# 종목코드 -> 최신 리포트 날짜 (AI_REPORT_CHECK_INTERVAL초 동안 재사용)
+report_date_cache = TTLCache(maxsize=4096, ttl=60)
+_NOT_CHECKED = object()
+
 @bp.route('/api/ai_report', methods=['GET'])
 def get_ai_report():
     try:
@@ -34,22 +23,24 @@ def get_ai_report():
         if not stock_code:
             return jsonify({"success": False, "error": "종목코드가 비어있습니다."}), 400
 
-        global stock_list
+        stock_list = market_data_store.stock_list
         if stock_list is None:
-            stock_list = searching_stock_db()
-            if stock_list is None:
-                return jsonify({"success": False, "error": "종목 목록을 불러올 수 없습니다."}), 500
+            return jsonify({"success": False, "error": "종목 목록을 불러올 수 없습니다."}), 500
 
         # stock_code로 종목명 찾기
         Inputstock_df = stock_list[stock_list['주식코드'].str.upper() == stock_code.upper()]
         stock_name = Inputstock_df.iloc[0]['종목명'] if not Inputstock_df.empty else stock_code
 
-        # ⭐⭐⭐ AI 리포트 생성 시간 시뮬레이션 (3초 대기) ⭐⭐⭐
-        # 이 시간 동안 프론트엔드에서는 "리포트 생성 중..." 메시지를 보여주면 됩니다.
-        time.sleep(3)
+        # 리포트는 별도 배치가 stock_keywords에 미리 저장해 두므로 기다리지 않고 바로 조회
+        # 최신 리포트 날짜가 그대로면 마크다운 변환/템플릿 렌더링 없이 캐시된 결과 반환
+        stock_code = stock_code.zfill(6)
+        report_date = get_latest_ai_report_date(stock_code)
+        cached_response = report_html_cache.get((stock_code, report_date)) if report_date else None
+        if cached_response is not None:
+            return jsonify(cached_response), 200
 
-        # ✅ 분석된 리포트 DB에서 불러오기 (원시 마크다운과 position을 반환)
-        report_data = get_latest_ai_report(stock_code)
+        # ✅ 분석된 리포트 DB에서 불러오기 (원시 마크다운과 position을 반환, 리포트가 없는 종목은 조회 생략)
+        report_data = get_latest_ai_report(stock_code) if report_date else None
 
         if not report_data or not report_data.get('report_markdown'):
             # 리포트가 없을 때도 예쁘게 메시지를 보여주도록 HTML을 반환합니다.
@@ -86,12 +77,16 @@ def get_ai_report():
             report_content_html=report_content_html
         )
 
-        return jsonify({
+        response_data = {
             "success": True,
             "ai_report": final_html_report, # ⭐ 구조화된 HTML 반환
             "report_title": main_report_title, # 이 값은 프론트엔드에서 참조용으로 사용 (전체 제목)
             "sentiment_position": sentiment_position # ⭐ 감성 데이터는 별도로 반환 (프론트엔드에서 활용)
-        }), 200
+        }
+        # 조회 사이에 새 리포트가 들어왔을 수 있으므로 실제로 렌더링한 리포트의 날짜로 저장
+        report_html_cache.set((stock_code, report_data.get('date')), response_data)
+        report_date_cache.set(stock_code, report_data.get('date'), ttl=current_app.config.get('AI_REPORT_CHECK_INTERVAL', 60))
+        return jsonify(response_data), 200
 
     except Exception as e:
         error_message = f"서버 내부 오류가 발생했습니다: {str(e)}"
@@ -108,7 +103,7 @@ def get_latest_ai_report(stock_code):
         stock_code = str(stock_code).zfill(6)
 
         cursor.execute("""
-            SELECT report, position -- report는 마크다운 텍스트, position은 감성
+            SELECT report, position, date -- report는 마크다운 텍스트, position은 감성
             FROM stock_keywords
             WHERE stock_code = %s
             ORDER BY date DESC
@@ -118,7 +113,7 @@ def get_latest_ai_report(stock_code):
 
         if row and row.get('report'):
             # ⭐⭐⭐ 여기서는 더 이상 마크다운을 HTML로 변환하지 않고 원시 텍스트 반환 ⭐⭐⭐
-            return {"report_markdown": row['report'], "position": row.get('position')} # ⭐ 마크다운과 position 함께 반환
+            return {"report_markdown": row['report'], "position": row.get('position'), "date": row.get('date')} # ⭐ 마크다운과 position 함께 반환
         else:
             return None
 
@@ -136,4 +131,32 @@ def get_latest_ai_report(stock_code):
         if cursor:
             cursor.close()
         if conn:
-            conn.close()
\ No newline at end of file
+            conn.close()
+
+
+# 종목의 최신 리포트 날짜 (리포트 본문은 가져오지 않음, 없으면 None)
+def get_latest_ai_report_date(stock_code):
+    report_date = report_date_cache.get(stock_code, _NOT_CHECKED)
+    if report_date is not _NOT_CHECKED:
+        return report_date
+
+    conn = None
+    try:
+        conn = get_connection()
+        with conn.cursor(pymysql.cursors.DictCursor) as cursor:
+            cursor.execute("""
+                SELECT MAX(date) AS report_date
+                FROM stock_keywords
+                WHERE stock_code = %s
+            """, (stock_code,))
+            row = cursor.fetchone()
+            report_date = row['report_date'] if row else None
+    except Exception as e:
+        # 조회 실패는 캐시하지 않고 "리포트 없음"으로 처리 (get_latest_ai_report와 같은 동작)
+        current_app.logger.error(f"DB 오류 발생 in get_latest_ai_report_date: {e}")
+        return None
+    finally:
+        if conn:
+            conn.close()
+    report_date_cache.set(stock_code, report_date, ttl=current_app.config.get('AI_REPORT_CHECK_INTERVAL', 60))
+    return report_date
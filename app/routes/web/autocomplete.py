@@ -1,20 +1,13 @@
 from flask import Blueprint, request, jsonify
-from app.services.stock.data_loader import searching_stock_db
+from app.services.stock.market_data_store import market_data_store
 
-stock_list = searching_stock_db()   # DataFrame 혹은 리스트
 bp = Blueprint('autocomplete_bp', __name__)
 
 @bp.route('/autocomplete')
 def autocomplete():
     query = request.args.get('query', '').strip()
-    if stock_list is None or not query:
+    if not query:
         return jsonify([])
-    # DataFrame일 때
-    filtered = stock_list[
-        stock_list['종목명'].str.contains(query, case=False, na=False) |
-        stock_list['주식코드'].str.contains(query, case=False, na=False)
-    ]
-    suggestions = filtered[['종목명', '주식코드']].drop_duplicates()
-    result = suggestions.to_dict(orient='records')
-    print("DEBUG autocomplete result:", result)
-    return jsonify(result[:10])
+    # 미리 만들어 둔 트라이/2-gram 인덱스에서 상위 10개만 조회 (완전 일치 > 접두어 > 부분 일치)
+    result = market_data_store.search_index.search(query, limit=10)
+    return jsonify(result)
@@ -0,0 +1,42 @@
+from flask import Blueprint, jsonify
+from app.services.stock.market_data_store import market_data_store
+from app.services.stock.price_history import price_history_cache
+from app.services.stock.chart_utils import sparkline_cache
+from app.services.memory import process_memory
+from db import get_pool_stats
+
+bp = Blueprint('web_health_bp', __name__)
+
+# 로드밸런서 readiness probe: 시장 데이터가 모두 로드된 워커만 200, 아니면 503
+# 데이터셋별 상태(pending / loading / ready / error), 소요 시간, 행 수, 오류 메시지를 함께 반환
+@bp.route('/healthz/ready')
+def ready():
+    is_ready = market_data_store.is_ready()
+    body = {
+        'ready': is_ready,
+        'datasets': market_data_store.load_status(),
+    }
+    return jsonify(body), 200 if is_ready else 503
+
+# liveness probe: 프로세스가 요청을 받을 수 있으면 항상 200 (데이터 로드 여부와 무관)
+@bp.route('/healthz/live')
+def live():
+    return jsonify({'alive': True}), 200
+
+# 이 워커 프로세스의 메모리 (rss / pss / shared / private), preload 모드에서 공유되는 양 확인용
+# 시장 데이터 프레임별 행 수·컬럼 dtype·메모리 사용량, 주가 이력/미니차트 캐시의 크기와 hit/miss도 함께 반환
+@bp.route('/healthz/memory')
+def memory():
+    market_stats = market_data_store.stats()
+    return jsonify({
+        'process': process_memory(),
+        'market_data_bytes': market_stats['total_memory_bytes'],
+        'market_frames': {name: market_stats[name] for name in ('stock_data', 'stock_volume', 'news_data', 'stock_list')},
+        'price_history_cache': price_history_cache.stats(),
+        'sparkline_cache': sparkline_cache.stats(),
+    }), 200
+
+# 이 워커 프로세스의 DB 커넥션 풀 지표 (size / in_use / idle / waiting, 대여 횟수·대기 시간 평균/최대, 시간 초과 횟수)
+@bp.route('/healthz/pool')
+def pool():
+    return jsonify(get_pool_stats()), 200
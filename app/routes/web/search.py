@@ -1,16 +1,15 @@
 from flask import Blueprint, request, redirect, url_for, render_template, current_app, session, jsonify
-from app.services.stock.data_loader import stock_data_db, searching_stock_db, news_data_db, analyze_stock_data
+from app.services.stock.market_data_store import market_data_store
+from app.services.stock.data_loader import iter_json_records
+from app.services.stock.news_body import with_article_bodies
+from app.services.pagination import parse_page_args, parse_fields, paginate_by_date, json_list_response
 
-import pandas as pd
 import json, math
 
 
 bp = Blueprint('stocks_search_bp', __name__)
 
-# 앱 시작 시 DB 데이터를 메모리에 로드 (캐싱)
-stock_data_df, _ = stock_data_db()
-stock_list = searching_stock_db()
-news_data_df = news_data_db()
+# 주가/뉴스/종목 리스트는 market_data_store가 프로세스당 한 번만 로드해서 공유함
 
 @bp.route('/search', methods=['GET', 'POST'])
 def search():
@@ -19,6 +18,7 @@ def search():
     query = (request.args.get('search') or request.form.get('search') or '').strip()
     if not query: return render_template('search.html', user=session.get('user'), search_query='', price_chart_data_json='[]', stock_name_for_chart='', related_stocks=[], error_message="검색어가 제공되지 않았습니다.", search_result_name=None, search_result_code=None)
     price_chart_data, stock_name_for_chart, related_stocks, error_message, search_result_name, search_result_code, raw_price_data = [], "", [], None, None, None, []
+    stock_list = market_data_store.stock_list
     if query:
         session['last_search'] = query
         search_query_upper = query.upper()
@@ -26,8 +26,8 @@ def search():
         if not exact_match_df_rows.empty:
             found_stock_name, found_stock_code = exact_match_df_rows['종목명'].iloc[0], exact_match_df_rows['주식코드'].iloc[0]
             search_result_name, search_result_code, stock_name_for_chart = found_stock_name, found_stock_code, found_stock_name
-            stock_news_df = pd.merge(stock_data_df, news_data_df, on=['종목명', '날짜'], how='left')
-            analysis_results = analyze_stock_data(stock_news_df, found_stock_name)
+            # 종목별 인덱스에서 해당 종목의 주가/뉴스 구간만 꺼내 분석 (전체 merge 없음)
+            analysis_results = market_data_store.analyze(found_stock_name)
             raw_price_data = analysis_results.get('price_data') if analysis_results else []
             price_chart_data = sanitize_price_data(raw_price_data)
             if not price_chart_data: error_message = f'"{query}" 종목의 유효한 주가 데이터를 찾을 수 없습니다.'
@@ -53,33 +53,41 @@ def sanitize_price_data(data):
     return safe_data
 
 
+NEWS_FIELDS = ['종목명', '주식코드', '날짜', '제목', '링크', '본문']
+NEWS_DEFAULT_FIELDS = ['종목명', '주식코드', '날짜', '제목', '링크']
+
+
 @bp.route('/api/news')
 def api_news():
+    # limit(기본 10개)씩 날짜 내림차순으로 반환, 다음 페이지는 next_before_date / next_before_key를 before_date / before_key로 넘겨서 조회
     NEWS_LIMIT = 10
+    NEWS_MAX_LIMIT = 200
     company_name = request.args.get('company_name', '').strip()
     if not company_name:
         return jsonify({'error': '종목명이 필요합니다.'}), 400
 
-    if news_data_df is None:
-        return jsonify({'error': '뉴스 데이터를 불러올 수 없습니다.'}), 500
-
     try:
-        company_news_df = news_data_df[news_data_df['종목명'].str.upper() == company_name.upper()]
+        before_date, before_key, limit = parse_page_args(request.args, NEWS_LIMIT, NEWS_MAX_LIMIT)
+        fields = parse_fields(request.args, NEWS_FIELDS, NEWS_DEFAULT_FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-        company_news_df_with_title = company_news_df.dropna(subset=['제목'])
+    try:
+        # 종목별 인덱스의 기사 구간 (제목/링크 있는 기사만, 날짜 내림차순, 중복 제거된 상태)
+        stock_slice = market_data_store.get_stock_slice(company_name)
+        company_news_df = stock_slice.news_df if stock_slice is not None else None
 
-        if company_news_df_with_title.empty:
+        if company_news_df is None or company_news_df.empty:
             return jsonify({'news_articles': [], 'message': f"'{company_name}'에 대한 뉴스를 찾을 수 없습니다."})
 
-        # data_loader에서 이미 날짜 타입으로 만들어주므로, pd.to_datetime은 필요 없습니다.
-        sorted_news_df = company_news_df_with_title.sort_values(by='날짜', ascending=False)
-
-        latest_news_df = sorted_news_df.head(NEWS_LIMIT)
+        latest_news_df, next_cursor = paginate_by_date(company_news_df, before_date, limit, before_key)
+        news_articles = iter_json_records(latest_news_df, [field for field in fields if field != '본문'])
 
-        news_articles = latest_news_df.to_dict('records')
+        if '본문' in fields:
+            news_articles = with_article_bodies(news_articles, latest_news_df['링크'])
 
-        return jsonify({'news_articles': news_articles})
+        return json_list_response({}, 'news_articles', news_articles, len(latest_news_df), next_cursor)
 
     except Exception as e:
         current_app.logger.error(f"뉴스 데이터 처리 중 오류: {e}", exc_info=True)
-        return jsonify({'error': '뉴스 데이터를 처리하는 중 오류가 발생했습니다.'}), 500
\ No newline at end of file
+        return jsonify({'error': '뉴스 데이터를 처리하는 중 오류가 발생했습니다.'}), 500
@@ -1,44 +1,34 @@
-from flask import Blueprint, render_template, jsonify
-from db import get_connection
-from datetime import datetime, timedelta
+from flask import Blueprint, render_template, jsonify, request
+from app.services.stock.stock_sentiment_stats import stock_sentiment_stats
 
 # 블루프린트 생성
 stocks_bp = Blueprint('stocks_bp', __name__)
 
-# 특정 날짜(2025년 7월 29일)의 데이터를 가져와서 평균값을 계산하는 함수
-def get_sentiment_for_specific_date():
-    # 7월 29일의 시작과 끝 시간을 설정
-    start_time = datetime(2025, 7, 29, 0, 0, 0)  # 2025년 7월 29일 00:00:00
-    end_time = start_time + timedelta(days=1)  # 2025년 7월 30일 00:00:00 (하루 뒤)
-
-    conn = get_connection()
-    try:
-        with conn.cursor() as cursor:
-            cursor.execute("""
-                SELECT stock_sentiment_score
-                FROM stock_sentiment_analysis_results
-                WHERE analysis_datetime >= %s
-                  AND analysis_datetime < %s
-            """, (start_time, end_time))
-
-            rows = cursor.fetchall()
-
-            if rows:
-                avg_sentiment_score = sum(row['stock_sentiment_score'] for row in rows) / len(rows)
-                return avg_sentiment_score
-            else:
-                return None  # 데이터가 없을 경우 None 반환
-    finally:
-        conn.close()
+# 기간(start_date ~ end_date)과 종목(stock_code)의 평균 감성 점수
+# 날짜를 주지 않으면 분석 결과가 있는 가장 최근 날짜를 사용함
+# 행을 모두 가져와 평균을 내지 않고 stock_sentiment_stats가 누적해 둔 일별 합계·건수로 계산
+def get_sentiment_for_date_range(start_date=None, end_date=None, stock_code=None):
+    if not start_date:
+        start_date = stock_sentiment_stats.latest_day()
+        if start_date is None:
+            return None
+    return stock_sentiment_stats.average(start_date, end_date, stock_code or None)
 
 # 메인 페이지 라우트
 @stocks_bp.route('/')
 def index():
-    avg_sentiment_score = get_sentiment_for_specific_date()  # 수정된 함수 호출
+    avg_sentiment_score = get_sentiment_for_date_range()
     return render_template('index.html', avg_sentiment_score=avg_sentiment_score)
 
 # 실시간으로 평균값을 반환하는 라우트 (AJAX 호출용)
+# 예: /get_average_sentiment?date=2025-07-29, /get_average_sentiment?start_date=2025-07-01&end_date=2025-07-29&stock_code=005930
 @stocks_bp.route('/get_average_sentiment')
 def get_average_sentiment():
-    avg_sentiment_score = get_sentiment_for_specific_date()  # 수정된 함수 호출
+    start_date = request.args.get('start_date') or request.args.get('date')
+    end_date = request.args.get('end_date')
+    stock_code = request.args.get('stock_code', '').strip()
+    try:
+        avg_sentiment_score = get_sentiment_for_date_range(start_date, end_date, stock_code.zfill(6) if stock_code else None)
+    except ValueError:
+        return jsonify({"error": "날짜 형식이 올바르지 않습니다. (YYYY-MM-DD)"}), 400
     return jsonify({"avg_sentiment_score": avg_sentiment_score})
@@ -0,0 +1,93 @@
+# app/services/cache.py
+# 여러 서비스에서 같이 쓰는 프로세스 내 LRU + TTL 캐시
+
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """최대 maxsize개까지 보관하고 ttl초가 지난 항목은 만료시키는 스레드 안전 LRU 캐시
+
+    ttl이 None이면 만료 없이 LRU로만 정리합니다. hit/miss 횟수는 stats()로 확인합니다.
+    max_bytes와 sizeof(값 -> 바이트 수)를 주면 항목 수와 함께 전체 크기도 max_bytes 안으로 유지합니다.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None, max_bytes=None, sizeof=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._data = OrderedDict()   # key -> (만료 시각 또는 None, 값, 바이트 수)
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is not _MISSING:
+                expires_at, value, _ = item
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._remove(key)
+            self.misses += 1
+            return default
+
+    def _remove(self, key):
+        _, value, size = self._data.pop(key)
+        self.bytes -= size
+        return value
+
+    def _over_budget(self):
+        return len(self._data) > self.maxsize or (self.max_bytes is not None and self.bytes > self.max_bytes)
+
+    def set(self, key, value, ttl=_MISSING):
+        ttl = self.ttl if ttl is _MISSING else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        size = self._sizeof(value) if self._sizeof is not None else 0
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            # 혼자서 max_bytes를 넘는 값은 다른 항목을 모두 밀어내지 않도록 저장하지 않음
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._data[key] = (expires_at, value, size)
+            self.bytes += size
+            while self._over_budget():
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            return self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+            }
@@ -0,0 +1,206 @@
+# app/services/favorites.py
+# 관심 종목(prefer_stock) 목록 조회/추가/삭제
+# 종목마다 커넥션을 열지 않고, 사용자 id를 한 번 찾은 뒤 시세·미니차트·감성 점수를 모든 관심 종목에 대해 묶어서 가져옴
+#   - 시세: latest_quote_store (메모리, DB 조회 없음)
+#   - 최근 N개 체결가: get_mini_chart_svgs (관심 종목 전체를 한 번의 쿼리 + SVG 캐시)
+#   - 감성 점수: stock_sentiment_index (종목별 최신 감성 지수, 메모리)
+# 사용자별 관심 종목 코드는 favorite_codes_cache에 두고 추가/삭제 시 바로 고쳐 씀(write-through)
+# 캐시는 워커마다 따로 있으므로 추가/삭제 때마다 새 목록 버전을 세션에 넣고, 버전이 다른 캐시 항목은 쓰지 않음
+# (다른 워커가 편집 전 목록을 보여 주지 않도록, 세션 쿠키가 다음 요청에 새 버전을 실어 보냄)
+
+import uuid
+
+import pymysql
+
+from db import get_connection
+from app.services.cache import TTLCache
+from app.services.stock.latest_quote import latest_quote_store
+from app.services.stock.chart_utils import get_mini_chart_svgs
+from app.services.stock.sentiment_index import stock_sentiment_index
+
+# 관심 종목 미니차트에 쓰는 최근 체결가 개수
+SPARKLINE_POINTS = 7
+
+# userid -> (목록 버전, 관심 종목 코드 tuple)
+favorite_codes_cache = TTLCache(maxsize=10000, ttl=300)
+# userid -> users.id (계정이 삭제 후 같은 아이디로 다시 만들어지는 경우를 위해 TTL을 둠)
+user_pk_cache = TTLCache(maxsize=10000, ttl=3600)
+
+# 한 번의 INSERT, 이미 등록된 종목이면 (user_id, stock_code) 유니크 키의 Duplicate entry 오류로 구분함
+# (migrations/20261018_prefer_stock_unique.sql, IGNORE는 외래 키 오류까지 경고로 바꾸므로 쓰지 않음)
+INSERT_FAVORITE_QUERY = """
+    INSERT INTO prefer_stock (user_id, stock_code)
+    VALUES (%s, %s)
+"""
+# MySQL ER_DUP_ENTRY
+DUPLICATE_ENTRY_ERROR = 1062
+
+
+def _normalize_code(stock_code):
+    return str(stock_code).strip().zfill(6)
+
+
+# 로그인 아이디 -> users.id (없으면 None)
+# 로그인 시 세션에 넣어 둔 user_pk가 없을 때(이전 세션) 쓰며, 한 번 찾은 id는 user_pk_cache에 보관
+def resolve_user_pk(userid):
+    user_pk = user_pk_cache.get(userid)
+    if user_pk is not None:
+        return user_pk
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT id FROM users WHERE userid=%s", (userid,))
+            row = cursor.fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        return None
+    user_pk_cache.set(userid, row['id'])
+    return row['id']
+
+
+# 회원 삭제 시 해당 아이디의 캐시 정리
+def forget_user(userid):
+    user_pk_cache.pop(userid)
+    favorite_codes_cache.pop(userid)
+
+
+def _change_display(price_change):
+    # 등락 부호 (🔺/🔻/🟡) 결정 및 색상 클래스
+    if price_change is None:
+        return '', ''
+    if price_change > 0:
+        return '🔺', 'signal-up'
+    if price_change < 0:
+        return '🔻', 'signal-down'
+    return '🟡', 'signal-neutral'
+
+
+# 종목코드 목록 -> 관심 종목 화면 행 목록 (시세가 없는 종목은 기존 JOIN live_data와 같이 제외)
+def build_favorite_rows(stock_codes):
+    quotes = latest_quote_store.get_many(stock_codes)
+    if not quotes:
+        return []
+    codes = [quote['stock_code'] for quote in quotes]
+    # 최신 시세의 체결 시각이 그대로면 캐시된 미니차트를 쓰고 DB는 조회하지 않음
+    last_ticks = {quote['stock_code']: f"{quote['date']} {quote['time']}" for quote in quotes}
+    mini_chart_svgs = get_mini_chart_svgs(codes, SPARKLINE_POINTS, last_ticks=last_ticks)
+    sentiments = stock_sentiment_index.get_many(codes)
+
+    rows = []
+    for quote in quotes:
+        stock_code = quote['stock_code']
+        price, price_change, volume = quote['close_price'], quote['price_change'], quote['volume']
+        change_icon, change_color = _change_display(price_change)
+        sentiment = sentiments.get(stock_code)
+        sentiment_score = sentiment['score'] if sentiment else None
+        rows.append({
+            'name': quote['stock_name'],
+            'code': stock_code,
+            'price': f"{price:,}" if price is not None else 'N/A',
+            'price_change_amount': f"{change_icon}{abs(price_change):,}" if price_change is not None else 'N/A',
+            'change_color_class': change_color,
+            'volume': f"{volume:,}" if volume is not None else 'N/A',
+            'mini_chart_svg': mini_chart_svgs.get(stock_code, ''),   # 최근 체결가 SVG
+            'sentiment_score': round(sentiment_score, 1) if sentiment_score is not None else None,
+        })
+    return rows
+
+
+# 추가/삭제 후 세션에 넣을 새 관심 종목 목록 버전
+def new_favorites_version():
+    return uuid.uuid4().hex
+
+
+# 사용자의 관심 종목 코드 (순서는 정해져 있지 않음), 세션의 목록 버전과 같은 캐시 항목이 있으면 DB를 조회하지 않음
+def get_favorite_codes(userid, version=None):
+    cached = favorite_codes_cache.get(userid)
+    if cached is not None and cached[0] == version:
+        return list(cached[1])
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                SELECT p.stock_code
+                FROM prefer_stock p
+                JOIN users u ON u.id = p.user_id
+                WHERE u.userid = %s
+            """, (userid,))
+            codes = tuple(row['stock_code'] for row in cursor.fetchall())
+    finally:
+        conn.close()
+    favorite_codes_cache.set(userid, (version, codes))
+    return list(codes)
+
+
+# DB에 반영한 추가/삭제를 캐시된 목록에도 반영하고 새 버전으로 저장
+# 캐시가 없거나 편집 전 버전이 아니면(다른 워커에서 바뀐 목록일 수 있음) 버리고 다음 조회 때 DB에서 읽음
+def _update_cached_codes(userid, version, new_version, added=None, removed=None):
+    cached = favorite_codes_cache.get(userid)
+    if cached is None or cached[0] != version:
+        favorite_codes_cache.pop(userid)
+        return
+    codes = tuple(code for code in cached[1] if code != removed)
+    if added is not None and added not in codes:
+        codes += (added,)
+    favorite_codes_cache.set(userid, (new_version, codes))
+
+
+# 관심 종목 화면 전체 목록 (캐시와 최신 시세가 그대로면 DB 조회 없음, 아니어도 코드 1회 + 체결가 1회)
+def get_favorites_display(userid, version=None):
+    return build_favorite_rows(get_favorite_codes(userid, version))
+
+
+# 관심 종목 추가, 반환값: (추가된 종목의 화면 행 또는 None, 오류 메시지 또는 None)
+# 종목 확인은 메모리의 시세로 하고 user_pk를 알고 있으면 DB 왕복은 INSERT 한 번
+# version은 세션의 현재 목록 버전, new_version은 추가에 성공하면 세션에 넣을 버전
+def add_favorite(userid, stock_code, user_pk=None, version=None, new_version=None):
+    stock_code = _normalize_code(stock_code)
+    # live_data에 체결이 있는 종목만 등록 가능 (latest_quote_store가 live_data 종목별 최신 틱을 갖고 있음)
+    if latest_quote_store.get(stock_code) is None:
+        return None, "해당 종목이 존재하지 않습니다."
+    if user_pk is None:
+        user_pk = resolve_user_pk(userid)
+        if user_pk is None:
+            return None, "사용자 정보를 찾을 수 없습니다."
+
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(INSERT_FAVORITE_QUERY, (user_pk, stock_code))
+        conn.commit()
+    except pymysql.err.IntegrityError as e:
+        # 중복 등록만 안내하고, 외래 키 오류(삭제된 계정의 user_pk 등)는 그대로 올림
+        if e.args and e.args[0] == DUPLICATE_ENTRY_ERROR:
+            return None, "이미 등록된 종목입니다."
+        raise
+    finally:
+        conn.close()
+    _update_cached_codes(userid, version, new_version, added=stock_code)
+
+    rows = build_favorite_rows([stock_code])
+    return (rows[0] if rows else None), None
+
+
+# 관심 종목 삭제, 반환값: 삭제된 종목코드 (등록되어 있지 않았으면 None)
+# 삭제된 종목이 있으면 캐시를 new_version으로 저장하므로 호출하는 쪽에서 세션 버전도 바꿔야 함
+def delete_favorite(userid, stock_code, user_pk=None, version=None, new_version=None):
+    stock_code = _normalize_code(stock_code)
+    if user_pk is None:
+        user_pk = resolve_user_pk(userid)
+        if user_pk is None:
+            return None
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            deleted = cursor.execute("""
+                DELETE FROM prefer_stock
+                WHERE user_id = %s AND stock_code = %s
+            """, (user_pk, stock_code))
+        conn.commit()
+    finally:
+        conn.close()
+    if not deleted:
+        return None
+    _update_cached_codes(userid, version, new_version, removed=stock_code)
+    return stock_code
@@ -0,0 +1,47 @@
+# app/services/memory.py
+# 현재 프로세스의 메모리 사용량 (gunicorn preload 모드에서 워커별 공유/개별 메모리 확인용)
+
+import os
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# /proc/self/smaps_rollup 항목 -> 반환 키
+_SMAPS_FIELDS = {
+    'Rss': 'rss',
+    'Pss': 'pss',
+    'Shared_Clean': 'shared_clean',
+    'Shared_Dirty': 'shared_dirty',
+    'Private_Clean': 'private_clean',
+    'Private_Dirty': 'private_dirty',
+}
+
+
+# {'pid', 'rss', 'pss', 'shared', 'private', ...} (바이트), 리눅스가 아니면 최대 RSS만 반환
+def process_memory():
+    result = {'pid': os.getpid()}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                name, _, value = line.partition(':')
+                if name in _SMAPS_FIELDS:
+                    result[_SMAPS_FIELDS[name]] = int(value.split()[0]) * 1024
+        result['shared'] = result.get('shared_clean', 0) + result.get('shared_dirty', 0)
+        result['private'] = result.get('private_clean', 0) + result.get('private_dirty', 0)
+    except OSError:
+        if resource is not None:
+            # 리눅스 외 환경: ru_maxrss 단위가 OS마다 다르므로(리눅스 KB, macOS 바이트) 참고용으로만 사용
+            result['max_rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return result
+
+
+def format_memory(memory):
+    parts = [f"pid={memory['pid']}"]
+    for key in ('rss', 'pss', 'shared', 'private'):
+        if key in memory:
+            parts.append(f"{key}={memory[key] / 1024 / 1024:.1f}MB")
+    if 'max_rss' in memory:
+        parts.append(f"max_rss={memory['max_rss']}")
+    return ' '.join(parts)
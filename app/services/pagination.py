@@ -0,0 +1,90 @@
+# app/services/pagination.py
+# (날짜, 행 키) 커서(before_date, before_key) 기반 페이지 나누기와 큰 JSON 응답 스트리밍
+# /api/analyze, /api/news처럼 종목별 행을 날짜 내림차순으로 돌려주는 API에서 같이 사용
+
+import numpy as np
+import pandas as pd
+from flask import Response, json, stream_with_context
+
+# 이 행 수보다 큰 페이지는 한 번에 만들지 않고 행 단위로 흘려보냄
+STREAM_MIN_ROWS = 200
+
+
+# before_date / before_key / limit 쿼리 파라미터 해석 (잘못된 값이면 ValueError)
+# before_key 없이 before_date만 주면 그 날짜 미만의 행부터 반환
+def parse_page_args(args, default_limit, max_limit):
+    before_date = args.get('before_date')
+    if before_date:
+        before_date = pd.Timestamp(before_date)
+        if pd.isna(before_date):
+            raise ValueError('before_date 형식이 올바르지 않습니다. (YYYY-MM-DD)')
+    else:
+        before_date = None
+    before_key = args.get('before_key')
+    if before_key is not None and before_date is None:
+        raise ValueError('before_key는 before_date와 함께 넘겨야 합니다.')
+
+    limit = args.get('limit', default_limit)
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError('limit은 숫자여야 합니다.')
+    if limit <= 0:
+        raise ValueError('limit은 1 이상이어야 합니다.')
+    return before_date, before_key, min(limit, max_limit)
+
+
+# fields 쿼리 파라미터 해석 (없으면 default_fields, 허용되지 않은 컬럼이 있으면 ValueError)
+def parse_fields(args, allowed_fields, default_fields):
+    fields = args.get('fields')
+    if not fields:
+        return list(default_fields)
+    fields = [field.strip() for field in fields.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in allowed_fields]
+    if unknown:
+        raise ValueError(f"알 수 없는 필드입니다: {', '.join(unknown)} (가능한 필드: {', '.join(allowed_fields)})")
+    return fields
+
+
+# (날짜 내림차순, 행 키 오름차순)으로 커서 다음 행을 정확히 limit개 자르고, 다음 페이지 커서를 함께 반환
+# 커서는 페이지 마지막 행의 (날짜, 행 키)라서 같은 날짜의 행이 많아도 두 페이지에 나눠 담을 수 있음
+# 행 키(key_column, 기본은 기사 링크)는 같은 날짜 안에서 행마다 달라야 함 (결측은 빈 문자열로 취급)
+def paginate_by_date(sorted_df, before_date, limit, before_key=None, date_column='날짜', key_column='링크'):
+    no_cursor = {'next_before_date': None, 'next_before_key': None}
+    if sorted_df is None or sorted_df.empty:
+        return sorted_df, no_cursor
+    if key_column in sorted_df.columns:
+        keys = sorted_df[key_column].astype(object).where(sorted_df[key_column].notna(), '').astype(str).to_numpy()
+    else:
+        keys = np.full(len(sorted_df), '', dtype=object)
+    order = pd.DataFrame({'date': sorted_df[date_column].to_numpy(), 'key': keys, 'pos': np.arange(len(sorted_df))})
+    if before_date is not None:
+        after_cursor = order['date'] < before_date
+        if before_key is not None:
+            after_cursor |= (order['date'] == before_date) & (order['key'] > before_key)
+        order = order[after_cursor]
+    order = order.sort_values(['date', 'key'], ascending=[False, True], kind='stable')
+    page = order.iloc[:limit]
+    page_df = sorted_df.iloc[page['pos'].to_numpy()]
+    if len(order) <= limit:
+        return page_df, no_cursor
+    last = page.iloc[-1]
+    return page_df, {'next_before_date': last['date'].strftime('%Y-%m-%d'), 'next_before_key': last['key']}
+
+
+# {head..., list_key: [rows...], tail...} 형태의 JSON 응답
+# rows는 dict를 하나씩 만드는 iterator (iter_json_records), row_count가 STREAM_MIN_ROWS 이상이면
+# 전체 목록이나 문자열을 메모리에 만들지 않고 행 단위로 만들면서 스트리밍함
+def json_list_response(head, list_key, rows, row_count, tail=None):
+    tail = tail or {}
+    if row_count < STREAM_MIN_ROWS:
+        return Response(json.dumps({**head, list_key: list(rows), **tail}), mimetype='application/json')
+
+    def generate():
+        prefix = json.dumps(head)[:-1]
+        yield (prefix + ', ' if head else '{') + json.dumps(list_key) + ': ['
+        for i, row in enumerate(rows):
+            yield (', ' if i else '') + json.dumps(row)
+        yield ']' + (', ' + json.dumps(tail)[1:] if tail else '}')
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
@@ -1,6 +1,13 @@
 # app/services/stock/chart_utils.py
 
+import numpy as np
+
 from db import get_connection
+from app.services.cache import TTLCache
+
+# (stock_code, n, width, height, 마지막 체결 시각) -> SVG 문자열
+# 마지막 체결 시각이 키에 들어가므로 새 틱이 들어오면 자동으로 다른 키가 됨, TTL은 오래된 항목 정리용
+sparkline_cache = TTLCache(maxsize=4096, ttl=600)
 
 # 각 종목별 최근 N일치 종가 데이터를 가져오는 공통 헬퍼 함수
 def get_recent_stock_prices(stock_code, n=7):
@@ -20,6 +27,76 @@ def get_recent_stock_prices(stock_code, n=7):
     finally:
         conn.close()
 
+# 여러 종목의 최근 N개 체결가와 마지막 체결 시각을 한 번의 쿼리로 가져오는 함수
+# 반환값: {stock_code: ([오래된 가격, ..., 최신 가격], 'YYYY-MM-DD HH:MM:SS' 또는 None)}
+def get_recent_stock_series_bulk(stock_codes, n=7):
+    codes = list(dict.fromkeys(str(code) for code in stock_codes if code))
+    result = {code: ([], None) for code in codes}
+    if not codes:
+        return result
+
+    placeholders = ', '.join(['%s'] * len(codes))
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"""
+                SELECT stock_code, execution_price, date, time
+                FROM (
+                    SELECT
+                        stock_code,
+                        execution_price,
+                        date,
+                        time,
+                        ROW_NUMBER() OVER (PARTITION BY stock_code ORDER BY date DESC, time DESC) AS rn
+                    FROM live_data
+                    WHERE stock_code IN ({placeholders})
+                ) AS recent
+                WHERE rn <= %s
+                ORDER BY stock_code, rn DESC
+            """, (*codes, n))
+            for row in cursor.fetchall():
+                prices, _ = result.get(row['stock_code'], ([], None))
+                prices.append(row['execution_price'])
+                # rn 내림차순이므로 마지막으로 본 행이 가장 최신 틱
+                result[row['stock_code']] = (prices, f"{row['date']} {row['time']}")
+            return result
+    finally:
+        conn.close()
+
+# 여러 종목의 미니차트 SVG를 한 번에 만드는 함수 (가격 조회 1회 + sparkline_cache 재사용)
+# 반환값: {stock_code: SVG 문자열}
+# last_ticks({stock_code: 마지막 체결 시각})를 주면 모든 종목의 SVG가 캐시에 있을 때 가격 조회를 생략
+def get_mini_chart_svgs(stock_codes, n=7, width=100, height=30, last_ticks=None):
+    if last_ticks:
+        svgs = {}
+        for code in stock_codes:
+            last_tick = last_ticks.get(code)
+            svg = sparkline_cache.get((code, n, width, height, last_tick)) if last_tick else None
+            if svg is None:
+                break
+            svgs[code] = svg
+        else:
+            return svgs
+
+    series = get_recent_stock_series_bulk(stock_codes, n)
+    svgs, missing_codes, missing_keys = {}, [], []
+    for code, (prices, last_tick) in series.items():
+        key = (code, n, width, height, last_tick)
+        svg = sparkline_cache.get(key) if last_tick else None
+        if svg is None:
+            missing_codes.append(code)
+            missing_keys.append(key)
+        else:
+            svgs[code] = svg
+
+    if missing_codes:
+        built = generate_mini_chart_svgs([series[code][0] for code in missing_codes], width, height)
+        for code, key, svg in zip(missing_codes, missing_keys, built):
+            svgs[code] = svg
+            if key[-1]:
+                sparkline_cache.set(key, svg)
+    return svgs
+
 # 주가 데이터 리스트를 바탕으로 SVG 미니 차트 문자열을 생성하는 공통 함수
 def generate_mini_chart_svg(prices, width=100, height=30):
     if not prices or len(prices) < 2:
@@ -60,4 +137,40 @@ def generate_mini_chart_svg(prices, width=100, height=30):
         stroke_color = '#1976d2'
 
     # 최종 SVG 문자열 반환
-    return f"<svg width='100%' height='{height}' viewBox='0 0 {width} {height}' preserveAspectRatio='none'><path d='{' '.join(path_data)}' fill='none' stroke='{stroke_color}' stroke-width='1.5'></path></svg>"
\ No newline at end of file
+    return f"<svg width='100%' height='{height}' viewBox='0 0 {width} {height}' preserveAspectRatio='none'><path d='{' '.join(path_data)}' fill='none' stroke='{stroke_color}' stroke-width='1.5'></path></svg>"
+
+# generate_mini_chart_svg의 벡터화 버전: 같은 길이의 시계열을 묶어서 NumPy로 한 번에 정규화
+# 결과 문자열은 generate_mini_chart_svg와 동일함
+def generate_mini_chart_svgs(price_series, width=100, height=30):
+    padding_y = 5
+    results = [None] * len(price_series)
+    groups = {}
+    for i, prices in enumerate(price_series):
+        # 2개 미만이거나 int/float가 아닌 값(Decimal 등)이 섞이면 기존 함수로 처리
+        if prices and len(prices) >= 2 and all(type(p) in (int, float) for p in prices):
+            groups.setdefault(len(prices), []).append(i)
+        else:
+            results[i] = generate_mini_chart_svg(prices, width, height)
+
+    for num_points, indexes in groups.items():
+        arr = np.array([price_series[i] for i in indexes], dtype=np.float64)
+        min_prices = arr.min(axis=1, keepdims=True)
+        max_prices = arr.max(axis=1, keepdims=True)
+        flat = (min_prices == max_prices)[:, 0]
+        range_prices = np.where(max_prices - min_prices != 0, max_prices - min_prices, 0.01)
+        ys = height - padding_y - ((arr - min_prices) / range_prices) * (height - 2 * padding_y)
+        ys[flat] = height / 2
+        xs = (np.arange(num_points) / (num_points - 1) * width).tolist()
+
+        for row, i in zip(ys.tolist(), indexes):
+            prices = price_series[i]
+            path_data = ' '.join(
+                f"{'M' if j == 0 else 'L'}{x},{y}" for j, (x, y) in enumerate(zip(xs, row))
+            )
+            stroke_color = '#888888'
+            if prices[-1] > prices[0]:
+                stroke_color = '#e53a3a'
+            elif prices[-1] < prices[0]:
+                stroke_color = '#1976d2'
+            results[i] = f"<svg width='100%' height='{height}' viewBox='0 0 {width} {height}' preserveAspectRatio='none'><path d='{path_data}' fill='none' stroke='{stroke_color}' stroke-width='1.5'></path></svg>"
+    return results
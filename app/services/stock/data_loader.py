@@ -1,7 +1,12 @@
 from db import get_connection
 # stock_news DB 연결함수
 
+import time
+
+import numpy as np
 import pandas as pd
+import pymysql
+from pandas.api.types import union_categoricals
 
 # 이 파일이 Flask 앱 컨텍스트 내에서 실행될 때는 current_app.logger를 사용하고,
 # 단독으로 실행될 때는 기본 print 함수를 사용하도록 합니다.
@@ -20,64 +25,180 @@ def get_logger_or_print():
         return print
 
 
-# 주식 데이터 로딩 함수
-# def load_stock_data_from_db():
-def stock_data_db():
+STOCK_DATA_COLUMNS = ['종목명', '주식코드', '날짜', '시가', '종가', '전일비', '거래량']
+STOCK_VOLUME_COLUMNS = ['종목명', '거래량', '날짜']
+# 기사 본문은 메모리에 올리지 않고 필요할 때 링크로 조회함 (news_body.get_article_bodies)
+NEWS_DATA_COLUMNS = ['종목명', '주식코드', '날짜', '제목', '링크']
+# /api/analyze 응답 행의 컬럼 (본문은 요청 시점에 채움)
+ANALYZE_COLUMNS = ['날짜', '종가', '전일비', '거래량', '제목', '링크']
+
+
+# 로더가 만드는 프레임의 dtype (메모리를 줄여 같은 RAM에 더 긴 기간을 담기 위함)
+# 반복되는 종목명/주식코드는 정수 코드 배열 + 작은 카테고리 목록, 가격은 int32, 거래량은 uint32
+# 범위를 벗어나거나 결측이 있는 컬럼은 값이 바뀌지 않도록 int64/float64로 둠
+# (fork 후 워커들이 공유하는 프레임의 파이썬 문자열 객체도 줄어 참조 카운트 변경으로 페이지가 복사되는 것을 막음)
+CATEGORY_COLUMNS = ('종목명', '주식코드')
+INTEGER_COLUMN_DTYPES = {'시가': np.int32, '종가': np.int32, '전일비': np.int32, '거래량': np.uint32}
+
+
+def _compact_integer(series, dtype):
+    numeric = pd.to_numeric(series, errors='coerce')
+    if numeric.isna().any():
+        return numeric
+    info = np.iinfo(dtype)
+    if len(numeric) and (numeric.min() < info.min or numeric.max() > info.max):
+        return numeric.astype(np.int64)
+    return numeric.astype(dtype)
+
+
+# 이미 원하는 dtype인 컬럼은 건드리지 않으므로 여러 번 호출해도 됨 (증분 병합 뒤에도 다시 호출)
+def compact_frame(df):
+    if df is None or df.empty:
+        return df
+    updates = {}
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            updates[column] = df[column].astype('category')
+    for column, dtype in INTEGER_COLUMN_DTYPES.items():
+        if column in df.columns and df[column].dtype != dtype:
+            updates[column] = _compact_integer(df[column], dtype)
+    if '날짜' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['날짜']):
+        updates['날짜'] = pd.to_datetime(df['날짜'], errors='coerce')
+    return df.assign(**updates) if updates else df
+
+
+# 프레임의 컬럼별 dtype과 메모리 사용량(바이트, 문자열 객체 포함)
+def frame_memory_report(df):
+    if df is None:
+        return {'rows': 0, 'memory_bytes': 0, 'columns': {}}
+    usage = df.memory_usage(index=True, deep=True)
+    return {
+        'rows': int(len(df)),
+        'memory_bytes': int(usage.sum()),
+        'columns': {column: {'dtype': str(df[column].dtype), 'bytes': int(usage[column])} for column in df.columns},
+    }
 
-    conn = get_connection()
-    try:
-        with conn.cursor() as cursor:
-            sql = """
-            SELECT
-                stock_name AS 종목명,
-                stock_code AS 주식코드,
-                date AS 날짜,
-                open_price AS 시가,
-                close_price AS 종가,
-                price_change AS 전일비,
-                volume AS 거래량
-            FROM stock_data
-            WHERE date >= DATE_SUB(CURDATE(), INTERVAL 3 MONTH)
-            """
-            cursor.execute(sql)
-            rows = cursor.fetchall()
-            # print(f"[DEBUG] rows 개수: {len(rows)}")
 
-            if not rows:
-                print("[WARNING]DB에서 로드할 데이터가 없습니다.")
-                # return [], pd.DataFrame(columns=['종목명', '주식코드', '날짜', '종가', '전일비', '거래량', '제목', '링크'])
-                return [], pd.DataFrame(columns=['종목명', '주식코드', '날짜','시가', '종가', '전일비', '거래량'])
+# 로드 실패/데이터 없음일 때도 정상 경로와 같은 (stock_data_df, stock_volume_df) 형태를 반환
+def _empty_stock_data():
+    return pd.DataFrame(columns=STOCK_DATA_COLUMNS), pd.DataFrame(columns=STOCK_VOLUME_COLUMNS)
 
-            stock_data_df = pd.DataFrame(rows)
-            stock_data_df['날짜'] = pd.to_datetime(stock_data_df['날짜'], errors='coerce')
-            stock_data_df.dropna(subset=['날짜'], inplace=True)
-            stock_data_df['종목명'] = stock_data_df['종목명'].astype(str).str.strip().str.upper()
 
-            # 종목명, 거래량, 날짜만 담은 별도의 DataFrame 생성
-            stock_volume_df = stock_data_df.loc[:, ['종목명', '거래량', '날짜']].copy()
+# 모든 종목을 메모리에 올리는 기간(개월), Config.MARKET_DATA_WINDOW_MONTHS로 바꿈
+# 이보다 오래된 주가는 price_history에서 종목별로 필요할 때만 조회함
+DEFAULT_WINDOW_MONTHS = 3
 
-            # Stock_Data_Df = stock_data_df['종목명'].unique().tolist()
 
-            # print(f"[DEBUG] change 개수: {len(Stock_Data_Df)}")  # ✅ 추가
-            # _logger.info(f"총 {len(stock_data_df)}개의 데이터 포인트 로드. 고유 종목 수: {len(Stock_Data_Df)}")
+# 메모리 기간의 시작일 (쿼리의 DATE_SUB(CURDATE(), INTERVAL n MONTH)와 같은 날짜)
+def window_cutoff(window_months=DEFAULT_WINDOW_MONTHS):
+    return pd.Timestamp.today().normalize() - pd.DateOffset(months=window_months)
 
 
-            return stock_data_df, stock_volume_df
+# 스트리밍 로더가 한 번에 받는 행 수 (Config.MARKET_DATA_STREAM_CHUNK_SIZE)
+STREAM_CHUNK_SIZE = 50_000
+# 스트리밍 중 진행 상황 로그 간격(초), 청크마다 찍지 않고 이 간격마다 한 줄 + 끝날 때 요약 한 줄
+STREAM_LOG_INTERVAL = 10
+
+
+# 청크 하나를 로더 결과와 같은 형태로 정리 (날짜 변환, 종목명 정규화, compact dtype)
+def _prepare_chunk(rows, columns):
+    chunk_df = pd.DataFrame.from_records(rows, columns=columns)
+    chunk_df['날짜'] = pd.to_datetime(chunk_df['날짜'], errors='coerce')
+    chunk_df = chunk_df.dropna(subset=['날짜'])
+    chunk_df['종목명'] = chunk_df['종목명'].astype(str).str.strip().str.upper()
+    return compact_frame(chunk_df)
+
+
+# 청크별 프레임을 하나로 합침 (카테고리 컬럼은 object로 풀리지 않도록 카테고리끼리 합침)
+def _concat_chunks(chunks, columns):
+    chunks = [chunk for chunk in chunks if not chunk.empty]
+    if not chunks:
+        return pd.DataFrame(columns=columns)
+    data = {}
+    for column in columns:
+        parts = [chunk[column] for chunk in chunks]
+        if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            data[column] = union_categoricals(parts, sort_categories=True)
+        else:
+            data[column] = pd.concat(parts, ignore_index=True)
+    return compact_frame(pd.DataFrame(data, columns=columns))
+
+
+# 서버 측(unbuffered) 커서로 chunk_size행씩 받아 청크마다 dtype을 줄인 뒤 합침
+# fetchall()처럼 전체 결과를 dict 목록으로 클라이언트에 쌓지 않으므로 최대 메모리가 기간 길이에 거의 비례하지 않음
+# SELECT 컬럼 순서는 columns와 같아야 함
+def stream_query_frame(conn, sql, params, columns, chunk_size=None, label='query'):
+    chunk_size = chunk_size or STREAM_CHUNK_SIZE
+    started_at = time.time()
+    logged_at = started_at
+    chunks, total = [], 0
+    with conn.cursor(pymysql.cursors.SSCursor) as cursor:
+        cursor.execute(sql, params or None)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            chunks.append(_prepare_chunk(rows, columns))
+            total += len(rows)
+            now = time.time()
+            if now - logged_at >= STREAM_LOG_INTERVAL:
+                logged_at = now
+                elapsed = now - started_at
+                print(f"[INFO] {label}: {total}행 수신 ({elapsed:.1f}초, {total / max(elapsed, 1e-6):.0f}행/초)")
+    df = _concat_chunks(chunks, columns)
+    elapsed = time.time() - started_at
+    print(f"[INFO] {label} 로드 완료: {len(df)}행, {df.memory_usage(index=True, deep=True).sum() / 1024 / 1024:.1f}MB, {elapsed:.2f}초")
+    return df
+
+
+# 주식 데이터 로딩 함수
+# since를 주면 그 날짜 이후(해당 날짜 포함) 행만 가져옴 (증분 갱신용)
+# raise_errors=True면 DB 오류를 빈 프레임으로 바꾸지 않고 그대로 올림 (로드 상태를 기록하는 쪽에서 사용)
+# chunk_size행씩 스트리밍으로 받음 (stream_query_frame), window_months개월 전까지의 행만 조회
+# def load_stock_data_from_db():
+def stock_data_db(since=None, raise_errors=False, chunk_size=None, window_months=DEFAULT_WINDOW_MONTHS):
+
+    conn = get_connection()
+    try:
+        sql = """
+        SELECT
+            stock_name AS 종목명,
+            stock_code AS 주식코드,
+            date AS 날짜,
+            open_price AS 시가,
+            close_price AS 종가,
+            price_change AS 전일비,
+            volume AS 거래량
+        FROM stock_data
+        WHERE date >= DATE_SUB(CURDATE(), INTERVAL %s MONTH)
+        """
+        params = (int(window_months),)
+        if since is not None:
+            sql += " AND date >= %s"
+            params += (since,)
+        stock_data_df = stream_query_frame(conn, sql, params, STOCK_DATA_COLUMNS, chunk_size, label='stock_data')
+
+        if stock_data_df.empty:
+            print("[WARNING]DB에서 로드할 데이터가 없습니다.")
+            return _empty_stock_data()
+
+        # 종목명, 거래량, 날짜만 담은 프레임 (복사하지 않고 stock_data_df의 컬럼을 공유)
+        stock_volume_df = stock_data_df.loc[:, STOCK_VOLUME_COLUMNS]
+        return stock_data_df, stock_volume_df
 
     except Exception as e:
         print(f"[ERROR] DB 데이터 로드 중 오류: {e}")
-        # return [], pd.DataFrame(columns=['종목명', '주식코드', '날짜', '종가', '전일비', '거래량', '제목', '링크'])
-        return [], pd.DataFrame(columns=['종목명', '주식코드', '날짜','시가', '종가', '전일비', '거래량'])
+        if raise_errors:
+            raise
+        return _empty_stock_data()
 
     finally:
         print("[INFO] stock_data_db의 데이터 로딩 시작")
-        # print(f"stock_data_df : 총 {len(stock_data_df)}개의 데이터 포인트 로드")
-        # print(f"stock_volume_df : 총 {len(stock_volume_df)}개의 데이터 포인트 로드")
         conn.close()
 
 
 # 주식 검색 데이터 로딩
-def searching_stock_db():
+def searching_stock_db(window_months=DEFAULT_WINDOW_MONTHS):
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -86,9 +207,9 @@ def searching_stock_db():
                     stock_name AS 종목명,
                     stock_code AS 주식코드
                 FROM stock_data
-                WHERE date >= DATE_SUB(CURDATE(), INTERVAL 3 MONTH)
+                WHERE date >= DATE_SUB(CURDATE(), INTERVAL %s MONTH)
                 """
-            cursor.execute(sql)
+            cursor.execute(sql, (int(window_months),))
             rows = cursor.fetchall()
             # print(f"[DEBUG] rows 개수: {len(rows)}")
 
@@ -118,47 +239,43 @@ def searching_stock_db():
 
 
 # 뉴스 관련 데이터 로딩
-def news_data_db():
+# since를 주면 그 날짜 이후(해당 날짜 포함) 행만 가져옴 (증분 갱신용)
+# raise_errors, chunk_size, window_months는 stock_data_db와 같음
+def news_data_db(since=None, raise_errors=False, chunk_size=None, window_months=DEFAULT_WINDOW_MONTHS):
     conn = get_connection()
     try:
-        with conn.cursor() as cursor:
-           # 상황에 따라서 옵티마이저 힌트가 필요할 수 있음
-            sql = """
-            SELECT
-                sd.stock_name AS 종목명,
-                sd.stock_code AS 주식코드,
-                sd.date AS 날짜,
-                cn.title AS 제목,
-                cn.link AS 링크,
-                cn.content AS 본문
-            FROM stock_data sd
-            LEFT JOIN company_news cn
-            ON sd.stock_name = cn.stock_name AND sd.date = cn.date
-            WHERE sd.date >= DATE_SUB(CURDATE(), INTERVAL 3 MONTH)
-            """
-            cursor.execute(sql)
-            rows = cursor.fetchall()
-            # print(f"[DEBUG] rows 개수: {len(rows)}")
-
-            if not rows:
-                print("[WARNING]DB에서 로드할 데이터가 없습니다.")
-                # return [], pd.DataFrame(columns=['종목명', '주식코드', '날짜', '제목', '링크'])
-                return [], pd.DataFrame(columns=['종목명', '주식코드', '날짜', '제목', '링크', '본문'])
-
-            news_data_df = pd.DataFrame(rows)
-            news_data_df['날짜'] = pd.to_datetime(news_data_df['날짜'], errors='coerce')
-            news_data_df.dropna(subset=['날짜'], inplace=True)
-            news_data_df['종목명'] = news_data_df['종목명'].astype(str).str.strip().str.upper()
-            return news_data_df
+        # 상황에 따라서 옵티마이저 힌트가 필요할 수 있음
+        sql = """
+        SELECT
+            sd.stock_name AS 종목명,
+            sd.stock_code AS 주식코드,
+            sd.date AS 날짜,
+            cn.title AS 제목,
+            cn.link AS 링크
+        FROM stock_data sd
+        LEFT JOIN company_news cn
+        ON sd.stock_name = cn.stock_name AND sd.date = cn.date
+        WHERE sd.date >= DATE_SUB(CURDATE(), INTERVAL %s MONTH)
+        """
+        params = (int(window_months),)
+        if since is not None:
+            sql += " AND sd.date >= %s"
+            params += (since,)
+        news_data_df = stream_query_frame(conn, sql, params, NEWS_DATA_COLUMNS, chunk_size, label='news_data')
+
+        if news_data_df.empty:
+            print("[WARNING]DB에서 로드할 데이터가 없습니다.")
+            return pd.DataFrame(columns=NEWS_DATA_COLUMNS)
+        return news_data_df
 
     except Exception as e:
         print(f"[ERROR] DB 데이터 로드 중 오류: {e}")
-        # return [], pd.DataFrame(columns=['종목명', '주식코드', '날짜', '제목', '링크'])
-        return [], pd.DataFrame(columns=['종목명', '주식코드', '날짜', '제목', '링크', '본문'])
+        if raise_errors:
+            raise
+        return pd.DataFrame(columns=NEWS_DATA_COLUMNS)
 
     finally:
         print("[INFO] news_data_db의 데이터 로딩 시작")
-        # print(f"news_data_df : 총 {len(news_data_df)}개의 데이터 포인트 로드")
         conn.close()
 
 
@@ -179,39 +296,85 @@ def analyze_stock_data(data_df, company_name):
     stock_data = stock_data.sort_values(by='날짜')
     print(f"[INFO] '{company_name}' 종목의 데이터 ({len(stock_data)}개)를 찾았습니다.")
 
-    # 주가 데이터 추출 (기존과 동일)
-    stock_data['종가'] = pd.to_numeric(stock_data['종가'], errors='coerce')
-    price_data = stock_data[['날짜', '종가']].dropna().to_dict(orient='records')
+    # 주의: LEFT JOIN으로 인해 뉴스가 없는 날짜도 포함될 수 있으므로, 제목이 있는 행만 선택
+    filtered_news_articles = stock_data[['날짜', '제목', '링크']].dropna(subset=['제목', '링크']) \
+                               .drop_duplicates(subset=['제목', '링크']) \
+                               .sort_values(by='날짜', ascending=False)
+
+    return _build_analysis(stock_data, filtered_news_articles, company_name)
+
+
+# StockIndex에서 꺼낸 종목 구간으로 분석 결과 생성 (전체 프레임 스캔/merge 없음)
+# stock_slice.price_df는 날짜 오름차순, news_df는 날짜 내림차순·중복 제거된 상태
+def analyze_stock_slice(stock_slice):
+    if stock_slice is None or stock_slice.price_df.empty:
+        name = stock_slice.name if stock_slice is not None else ''
+        print(f"[WARNING] '{name}'에 대한 데이터를 찾을 수 없습니다.")
+        return {}
+    return _build_analysis(stock_slice.price_df, stock_slice.news_df, stock_slice.name)
+
+
+# 종목 구간의 날짜별 주가에 그날 기사를 붙인 프레임 (날짜 내림차순, 기사 없는 날짜는 제목/링크 NaN)
+# stock_data LEFT JOIN company_news와 같은 형태를 전체 프레임이 아니라 종목 구간만으로 만듦
+def build_analyze_frame(stock_slice):
+    if stock_slice is None or stock_slice.price_df.empty:
+        return pd.DataFrame(columns=ANALYZE_COLUMNS)
+    price_df = stock_slice.price_df.loc[:, ['날짜', '종가', '전일비', '거래량']]
+    news_df = stock_slice.news_df
+    if news_df is None or news_df.empty:
+        news_df = pd.DataFrame(columns=['날짜', '제목', '링크'])
+    merged = pd.merge(price_df, news_df.loc[:, ['날짜', '제목', '링크']], on='날짜', how='left')
+    return merged.sort_values('날짜', ascending=False, kind='stable').reset_index(drop=True)
+
+
+# 프레임 -> JSON 응답용 dict 목록 (날짜는 YYYY-MM-DD, NaN은 None)
+def to_json_records(df, columns):
+    return list(iter_json_records(df, columns))
+
+
+def _json_value(column, value):
+    # NaN/NaT는 JSON으로 직렬화할 수 없으므로 None으로 바꿈
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if column == '날짜':
+        return value.strftime('%Y-%m-%d')
+    return value.item() if isinstance(value, np.generic) else value
+
+
+# to_json_records와 같은 dict를 한 행씩 만들어 돌려줌 (큰 응답을 스트리밍할 때 전체 목록을 만들지 않기 위함)
+def iter_json_records(df, columns):
+    if df is None or df.empty:
+        return
+    for values in df.loc[:, columns].itertuples(index=False, name=None):
+        yield {column: _json_value(column, value) for column, value in zip(columns, values)}
+
+
+def _build_analysis(stock_data, filtered_news_articles, company_name):
+    # 주가 데이터 추출 (공유 프레임을 수정하지 않도록 새 Series로 변환)
+    price_df = pd.DataFrame({
+        '날짜': stock_data['날짜'],
+        '종가': pd.to_numeric(stock_data['종가'], errors='coerce'),
+    })
+    price_data = price_df.dropna().to_dict(orient='records')
     for item in price_data:
         item['날짜'] = item['날짜'].strftime('%Y-%m-%d')
 
     if not price_data:
         print(f"[WARNING] '{company_name}' 종목의 유효한 주가 데이터가 없습니다.")
 
-    # ⭐⭐⭐ 뉴스 데이터 추출 부분 수정 ⭐⭐⭐
-    # 필터링된 stock_data에서 뉴스 관련 컬럼을 선택
-    # 주의: LEFT JOIN으로 인해 뉴스가 없는 날짜도 포함될 수 있으므로, 제목이 있는 행만 선택
-    filtered_news_articles = stock_data[['날짜', '제목', '링크']].dropna(subset=['제목', '링크']) \
-                               .drop_duplicates(subset=['제목', '링크']) \
-                               .sort_values(by='날짜', ascending=False)
-
     news_list = []
-    if not filtered_news_articles.empty:
-        for _, row in filtered_news_articles.head(10).iterrows(): # 상위 10개 기사만
+    if filtered_news_articles is not None and not filtered_news_articles.empty:
+        for row in filtered_news_articles.head(10).itertuples(index=False): # 상위 10개 기사만
             news_list.append({
-                'date': row['날짜'].strftime('%Y-%m-%d'),
-                'title': row['제목'],
-                'link': row['링크']
+                'date': row.날짜.strftime('%Y-%m-%d'),
+                'title': row.제목,
+                'link': row.링크
             })
         print(f"[INFO] '{company_name}' 종목에 대한 총 {len(filtered_news_articles)}개의 기사 중 상위 10개 데이터 준비.")
     else:
         print(f"[WARNING] '{company_name}' 종목에 대한 뉴스 기사를 찾을 수 없습니다.")
 
-
     return {
         'price_data': price_data,
         'news_articles': news_list
     }
-
-
-
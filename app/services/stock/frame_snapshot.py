@@ -0,0 +1,170 @@
+# app/services/stock/frame_snapshot.py
+# 3개월치 주가/뉴스 프레임을 로컬 디스크에 컬럼 단위(.npy)로 저장하고, 시작할 때 다시 읽음
+# 재시작할 때마다 MySQL에서 3개월치를 모두 가져오지 않고, 스냅샷의 high-water mark 이후 행만 조회하기 위해 사용
+#
+# 디렉터리 구조: <root>/<name>/CURRENT (현재 버전 이름), <root>/<name>/<version>/manifest.json + 컬럼별 .npy
+# - 숫자/날짜 컬럼: 배열 그대로 저장 (행 dict를 만들지 않고 배열 단위로 읽으므로 DB 전체 조회보다 빠름)
+# - 카테고리 컬럼: 정수 코드 배열 + manifest의 카테고리 목록
+# - 문자열 컬럼: NUL로 이어 붙인 UTF-8 바이트 배열 + 결측 mask
+
+import datetime
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+# 저장 형식이 바뀌면 올림 (버전이 다른 스냅샷은 읽지 않고 DB에서 전체 로드)
+FORMAT_VERSION = 1
+# 새 스냅샷을 쓴 뒤 남겨 두는 이전 버전 수 (다른 프로세스가 아직 읽고 있을 수 있음)
+KEEP_VERSIONS = 2
+# 문자열 컬럼의 행 구분 문자 (제목/링크에는 나오지 않음)
+STRING_SEPARATOR = '\x00'
+
+
+def _save_strings(directory, prefix, values):
+    mask = pd.isna(values)
+    texts = ['' if missing else str(value) for value, missing in zip(values, mask)]
+    joined = STRING_SEPARATOR.join(texts)
+    if joined.count(STRING_SEPARATOR) != max(len(texts) - 1, 0):
+        raise ValueError(f'{prefix} 컬럼에 구분 문자(NUL)가 들어 있어 스냅샷으로 저장할 수 없습니다.')
+    np.save(os.path.join(directory, f'{prefix}.data.npy'), np.frombuffer(joined.encode('utf-8'), dtype=np.uint8))
+    np.save(os.path.join(directory, f'{prefix}.mask.npy'), np.asarray(mask, dtype=bool))
+
+
+# 전체 버퍼를 한 번만 디코딩하고 구분 문자로 나눔 (행마다 파이썬 루프를 돌지 않음)
+def _load_strings(directory, prefix):
+    data = np.load(os.path.join(directory, f'{prefix}.data.npy'), mmap_mode='r')
+    mask = np.load(os.path.join(directory, f'{prefix}.mask.npy'))
+    values = np.empty(len(mask), dtype=object)
+    if len(mask):
+        values[:] = bytes(data).decode('utf-8').split(STRING_SEPARATOR)
+        values[mask] = None
+    return values
+
+
+def _column_kind(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return 'category'
+    if series.dtype != object and series.dtype.kind in 'biufM':
+        return 'array'
+    if pd.api.types.infer_dtype(series, skipna=True) in ('string', 'empty'):
+        return 'string'
+    # DECIMAL 등 문자열이 아닌 object 컬럼은 숫자 배열로 저장
+    return 'numeric'
+
+
+def _version_dir(root_dir, name):
+    try:
+        with open(os.path.join(root_dir, name, 'CURRENT'), encoding='utf-8') as f:
+            version = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return os.path.join(root_dir, name, version) if version else None
+
+
+# 이전 버전 정리 (CURRENT가 가리키는 버전과 최근 KEEP_VERSIONS개는 남김)
+def _remove_old_versions(base_dir, current):
+    versions = sorted(entry for entry in os.listdir(base_dir)
+                      if not entry.startswith('.') and entry != 'CURRENT' and entry != current)
+    for version in versions[:max(len(versions) - (KEEP_VERSIONS - 1), 0)]:
+        shutil.rmtree(os.path.join(base_dir, version), ignore_errors=True)
+
+
+# 프레임을 새 버전 디렉터리에 쓴 뒤 CURRENT를 원자적으로 교체 (쓰는 도중에 읽는 프로세스는 이전 버전을 봄)
+# metadata는 manifest에 그대로 기록됨 (로드하는 쪽에서 스냅샷을 쓸 수 있는지 확인하는 용도)
+def save_frame_snapshot(df, root_dir, name, high_water_mark, metadata=None):
+    base_dir = os.path.join(root_dir, name)
+    os.makedirs(base_dir, exist_ok=True)
+    version = datetime.datetime.now().strftime('%Y%m%d%H%M%S%f') + f'-{os.getpid()}'
+    tmp_dir = os.path.join(base_dir, f'.tmp-{version}')
+    os.makedirs(tmp_dir)
+    try:
+        columns = []
+        for i, column in enumerate(df.columns):
+            series = df[column]
+            kind = _column_kind(series)
+            item = {'name': column, 'kind': kind, 'file': f'c{i}'}
+            if kind == 'category':
+                item['categories'] = [str(category) for category in series.cat.categories]
+                np.save(os.path.join(tmp_dir, f'c{i}.npy'), series.cat.codes.to_numpy())
+            elif kind in ('array', 'numeric'):
+                if kind == 'numeric':
+                    series = pd.to_numeric(series, errors='coerce')
+                    item['kind'] = 'array'
+                item['dtype'] = str(series.dtype)
+                np.save(os.path.join(tmp_dir, f'c{i}.npy'), series.to_numpy())
+            else:
+                _save_strings(tmp_dir, f'c{i}', series.to_numpy(dtype=object))
+            columns.append(item)
+
+        manifest = {
+            'format_version': FORMAT_VERSION,
+            'name': name,
+            'version': version,
+            'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'rows': int(len(df)),
+            'high_water_mark': pd.Timestamp(high_water_mark).isoformat() if high_water_mark is not None else None,
+            'columns': columns,
+            'metadata': metadata or {},
+        }
+        with open(os.path.join(tmp_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.rename(tmp_dir, os.path.join(base_dir, version))
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    current_tmp = os.path.join(base_dir, f'.CURRENT-{version}')
+    with open(current_tmp, 'w', encoding='utf-8') as f:
+        f.write(version)
+    os.replace(current_tmp, os.path.join(base_dir, 'CURRENT'))
+    _remove_old_versions(base_dir, version)
+    return manifest
+
+
+# 현재 버전의 스냅샷을 (df, manifest)로 반환, 없거나 형식이 맞지 않으면 (None, None)
+# 숫자/날짜/카테고리 코드 컬럼은 읽기 전용 memory-map 배열을 감싸서 반환함
+# (MarketDataStore는 merge_delta의 필터/concat에서 바로 복사하므로 메모리 절약 효과는 없고, 파일을 한 번 더 읽어 두지 않는 정도)
+def load_frame_snapshot(root_dir, name, expected_columns=None):
+    version_dir = _version_dir(root_dir, name)
+    if version_dir is None:
+        return None, None
+    try:
+        with open(os.path.join(version_dir, 'manifest.json'), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[WARNING] '{name}' 스냅샷 manifest를 읽을 수 없습니다: {e}")
+        return None, None
+    if manifest.get('format_version') != FORMAT_VERSION:
+        print(f"[WARNING] '{name}' 스냅샷 형식 버전이 다릅니다: {manifest.get('format_version')}")
+        return None, None
+    column_names = [item['name'] for item in manifest['columns']]
+    if expected_columns is not None and column_names != list(expected_columns):
+        print(f"[WARNING] '{name}' 스냅샷 컬럼이 현재 스키마와 다릅니다: {column_names}")
+        return None, None
+
+    data = {}
+    for item in manifest['columns']:
+        if item['kind'] == 'string':
+            data[item['name']] = _load_strings(version_dir, item['file'])
+            continue
+        array = np.load(os.path.join(version_dir, f"{item['file']}.npy"), mmap_mode='r')
+        if item['kind'] == 'category':
+            data[item['name']] = pd.Categorical.from_codes(array, categories=item['categories'])
+        else:
+            data[item['name']] = array
+    df = pd.DataFrame(data, columns=column_names, copy=False)
+    if len(df) != manifest['rows']:
+        print(f"[WARNING] '{name}' 스냅샷 행 수가 manifest와 다릅니다: {len(df)} != {manifest['rows']}")
+        return None, None
+    return df, manifest
+
+
+# manifest의 high-water mark (없으면 None)
+def snapshot_high_water_mark(manifest):
+    if not manifest or not manifest.get('high_water_mark'):
+        return None
+    return pd.Timestamp(manifest['high_water_mark'])
@@ -0,0 +1,130 @@
+# app/services/stock/latest_quote.py
+# 종목별 최신 체결 시세(live_data 마지막 틱)를 메모리에 유지하는 저장소
+# 요청마다 live_data 전체에 ROW_NUMBER() / MAX(date) GROUP BY를 돌리지 않고
+# 마지막으로 본 (date, time) 이후 틱만 가져와 종목코드별 dict를 갱신함
+
+import threading
+import time
+
+from db import get_connection
+
+# 처음 한 번만 종목별 마지막 틱을 가져옴
+INITIAL_QUERY = """
+    SELECT stock_code, stock_name, execution_price, price_change, volume, date, time
+    FROM (
+        SELECT
+            stock_code, stock_name, execution_price, price_change, volume, date, time,
+            ROW_NUMBER() OVER (PARTITION BY stock_code ORDER BY date DESC, time DESC) AS rn
+        FROM live_data
+    ) AS latest
+    WHERE rn = 1
+"""
+
+# high-water mark 이후(같은 시각 포함) 틱만 가져옴
+DELTA_QUERY = """
+    SELECT stock_code, stock_name, execution_price, price_change, volume, date, time
+    FROM live_data
+    WHERE date > %s OR (date = %s AND time >= %s)
+    ORDER BY date, time
+"""
+
+
+# live_data 행 -> 화면에서 쓰는 시세 dict (execution_price는 기존 코드처럼 close_price로 노출)
+def _to_quote(row):
+    return {
+        'stock_code': row['stock_code'],
+        'stock_name': row['stock_name'],
+        'close_price': row['execution_price'],
+        'price_change': row['price_change'],
+        'volume': row['volume'],
+        'date': row['date'],
+        'time': row['time'],
+    }
+
+
+class LatestQuoteStore:
+    """종목코드 -> 최신 시세를 O(1)로 돌려줍니다.
+
+    refresh_interval초가 지난 뒤 처음 읽을 때만 증분 조회를 하고, 그 사이에는 DB를 조회하지 않습니다.
+    반환되는 dict는 공유 객체이므로 호출하는 쪽에서 수정하면 안 됩니다.
+    """
+
+    def __init__(self, refresh_interval=5):
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._quotes = {}
+        self._high_water_mark = None   # 지금까지 본 가장 마지막 (date, time)
+        self._checked_at = None
+        self.refreshes = 0
+
+    # 수집 쪽에서 새 틱을 직접 넣을 때도 사용 (더 이전 시각의 틱은 무시)
+    def apply(self, rows):
+        quotes = dict(self._quotes)
+        high_water_mark = self._high_water_mark
+        for row in rows:
+            tick = (row['date'], row['time'])
+            current = quotes.get(row['stock_code'])
+            if current is None or tick >= (current['date'], current['time']):
+                quotes[row['stock_code']] = _to_quote(row)
+            if high_water_mark is None or tick > high_water_mark:
+                high_water_mark = tick
+        # 완성된 dict로 한 번에 교체 (읽는 쪽은 항상 이전 또는 새 dict 전체만 보게 됨)
+        self._quotes = quotes
+        self._high_water_mark = high_water_mark
+
+    def refresh(self):
+        with self._lock:
+            conn = get_connection()
+            try:
+                with conn.cursor() as cursor:
+                    if self._high_water_mark is None:
+                        cursor.execute(INITIAL_QUERY)
+                    else:
+                        last_date, last_time = self._high_water_mark
+                        cursor.execute(DELTA_QUERY, (last_date, last_date, last_time))
+                    self.apply(cursor.fetchall())
+            finally:
+                conn.close()
+            self._checked_at = time.monotonic()
+            self.refreshes += 1
+
+    def refresh_if_stale(self):
+        checked_at = self._checked_at
+        if checked_at is not None and time.monotonic() - checked_at < self.refresh_interval:
+            return
+        try:
+            self.refresh()
+        except Exception as e:
+            # 조회 실패 시 마지막으로 갖고 있던 시세를 그대로 사용
+            print(f"[ERROR] 최신 시세 갱신 중 오류: {e}")
+            self._checked_at = time.monotonic()
+
+    def get(self, stock_code):
+        self.refresh_if_stale()
+        return self._quotes.get(str(stock_code).zfill(6))
+
+    # 요청한 순서대로 시세가 있는 종목만 반환
+    def get_many(self, stock_codes):
+        self.refresh_if_stale()
+        quotes = self._quotes
+        return [quotes[code] for code in (str(code).zfill(6) for code in stock_codes) if code in quotes]
+
+    # 가장 최근 거래일에 체결이 있었던 종목들의 시세 (메인 화면 상승/하락 종목용)
+    def latest_day_quotes(self):
+        self.refresh_if_stale()
+        if self._high_water_mark is None:
+            return []
+        latest_date = self._high_water_mark[0]
+        return [quote for quote in self._quotes.values() if quote['date'] == latest_date]
+
+    def stats(self):
+        high_water_mark = self._high_water_mark
+        return {
+            'stocks': len(self._quotes),
+            'high_water_mark': ' '.join(str(value) for value in high_water_mark) if high_water_mark else None,
+            'refreshes': self.refreshes,
+            'refresh_interval': self.refresh_interval,
+        }
+
+
+latest_quote_store = LatestQuoteStore()
@@ -0,0 +1,494 @@
+# app/services/stock/market_data_store.py
+# 주가/뉴스/종목 리스트 DataFrame을 프로세스당 한 번만 로드해서 모든 블루프린트가 공유하는 저장소
+
+import os
+import threading
+import time
+
+import pandas as pd
+
+from app.services.stock.data_loader import (
+    stock_data_db, news_data_db, analyze_stock_slice, compact_frame, frame_memory_report, window_cutoff,
+    DEFAULT_WINDOW_MONTHS, STOCK_DATA_COLUMNS, STOCK_VOLUME_COLUMNS, NEWS_DATA_COLUMNS,
+)
+from app.services.stock.frame_snapshot import save_frame_snapshot, load_frame_snapshot, snapshot_high_water_mark
+from app.services.stock.stock_index import StockIndex
+from app.services.stock.search_index import StockSearchIndex
+
+
+# stock_data 프레임에서 종목명/주식코드 목록을 뽑아냄 (searching_stock_db와 같은 정규화)
+# 같은 3개월치 stock_data를 한 번 더 조회하지 않기 위해 사용
+def build_stock_list(stock_data_df):
+    if stock_data_df is None or stock_data_df.empty:
+        return pd.DataFrame(columns=['종목명', '주식코드'])
+    stock_list = stock_data_df.loc[:, ['종목명', '주식코드']].copy()
+    stock_list['종목명'] = stock_list['종목명'].astype(str).str.strip().str.upper()
+    stock_list['주식코드'] = stock_list['주식코드'].astype(str).str.strip().str.upper()
+    return stock_list.drop_duplicates(subset=['종목명', '주식코드']).reset_index(drop=True)
+
+
+# 기존 프레임에 증분(delta)을 붙이고 보관 기간 밖의 행을 버린 새 프레임을 만듦
+# high_water_mark(증분 조회 시작일) 이후 행은 뒤늦게 추가된 행이 있을 수 있으므로 delta의 것으로 교체함
+def merge_delta(base_df, delta_df, high_water_mark, window_months=DEFAULT_WINDOW_MONTHS):
+    if delta_df is None or delta_df.empty:
+        # 조회 실패와 "새 행 없음"을 구분할 수 없으므로 기존 행은 그대로 두고 만료된 행만 제거
+        merged = base_df
+    else:
+        kept = base_df[base_df['날짜'] < high_water_mark]
+        merged = pd.concat([kept, delta_df], ignore_index=True)
+    return merged[merged['날짜'] >= window_cutoff(window_months)].reset_index(drop=True)
+
+
+def _frame_stats(df):
+    if df is None:
+        return {'loaded': False, 'rows': 0, 'memory_bytes': 0}
+    return {'loaded': True, **frame_memory_report(df)}
+
+
+# 프레임별 메모리 사용량 로그 (컬럼별 dtype/크기 포함)
+def print_memory_report(stats):
+    for name in ('stock_data', 'stock_volume', 'news_data', 'stock_list'):
+        item = stats[name]
+        if not item['loaded']:
+            continue
+        shared = f" ({item['shared_with']}와 공유)" if item.get('shared_with') else ''
+        columns = ', '.join(f"{column}={info['dtype']}:{info['bytes'] / 1024 / 1024:.1f}MB"
+                            for column, info in item['columns'].items())
+        print(f"[INFO] {name}: {item['rows']}행, {item['memory_bytes'] / 1024 / 1024:.1f}MB{shared} [{columns}]")
+    print(f"[INFO] 시장 데이터 메모리 사용량: {stats['total_memory_bytes'] / 1024 / 1024:.1f}MB")
+
+
+class MarketDataStore:
+    """stock_data / news / stock_list 프레임을 처음 사용할 때 한 번만 로드하고 읽기 전용으로 공유합니다.
+
+    반환되는 DataFrame은 여러 요청이 함께 쓰므로 호출하는 쪽에서 수정하면 안 됩니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._stock_data_df = None
+        self._stock_volume_df = None
+        self._news_data_df = None
+        self._stock_list = None
+        self._stock_index = StockIndex()
+        self._search_index = StockSearchIndex()
+
+        self._refresh_thread = None
+        self._refresh_stop = threading.Event()
+        self._last_refresh = None
+        # 마지막으로 전체 로드/증분 갱신을 마친 시각(time.monotonic, fork 후 자식에서도 같은 기준)
+        self._refreshed_at = None
+        # 프레임이 이 시간(초)보다 오래되면 다음 접근 때 백그라운드에서 한 번 갱신 (0이면 사용하지 않음)
+        # preload 워커처럼 갱신 스레드가 없는 프로세스의 프레임이 무기한 오래된 채로 남지 않게 함
+        self.max_staleness = 0
+        self._stale_refresh_thread = None
+
+        self._warm_up_thread = None
+        # 지금 로드 중인 데이터셋 이름 (같은 데이터셋을 동시에 두 번 로드하지 않기 위함, _lock으로 보호)
+        self._loading = set()
+        # 데이터셋별 로드 상태 (pending / loading / ready / error), /healthz/ready에서 사용
+        self._load_status = {name: {'state': 'pending'} for name in ('stock_data', 'news_data')}
+
+        # 로컬 컬럼 스냅샷 디렉터리 (None이면 사용하지 않음)와 증분 갱신 후 다시 저장하는 최소 간격(초)
+        self.snapshot_dir = None
+        self.snapshot_interval = 3600
+        self._snapshot_saved_at = {}
+        # DB에서 스트리밍으로 받을 때 한 번에 가져오는 행 수 (None이면 data_loader.STREAM_CHUNK_SIZE)
+        self.stream_chunk_size = None
+        # 모든 종목을 메모리에 올리는 기간(개월), 더 긴 기간은 price_history가 종목별로 조회
+        self.window_months = DEFAULT_WINDOW_MONTHS
+        # 뉴스 증분 갱신 때 high-water mark 이전 며칠을 다시 조회 (이전 날짜로 늦게 들어온 company_news 행을 반영하기 위함)
+        self.news_lookback_days = 3
+
+    def _set_load_status(self, name, state, started_at=None, **extra):
+        status = {'state': state}
+        if started_at is not None:
+            status['seconds'] = round(time.time() - started_at, 3)
+        status['at'] = time.strftime('%Y-%m-%d %H:%M:%S')
+        status.update(extra)
+        self._load_status[name] = status
+
+    # 같은 데이터셋을 이미 다른 스레드가 로드 중이면 False (DB 조회/스냅샷 읽기는 잠금 밖에서 한 번만 실행)
+    def _begin_load(self, name):
+        with self._lock:
+            if name in self._loading:
+                return False
+            self._loading.add(name)
+            return True
+
+    def _end_load(self, name):
+        with self._lock:
+            self._loading.discard(name)
+
+    # 전체 로드 후 상태 기록, 실패하면 (아직 프레임이 없을 때만) 빈 프레임을 넣어 요청은 계속 처리되게 함
+    # 다른 스레드가 로드 중이면 기다리지 않고 False를 반환 (잠금은 _swap_*에서 프레임을 교체할 때만 잡음)
+    def _load_stock_data(self):
+        if not self._begin_load('stock_data'):
+            return False
+        try:
+            started_at = time.time()
+            self._set_load_status('stock_data', 'loading')
+            try:
+                stock_data_df, source = self._fetch_full(
+                    'stock_data', STOCK_DATA_COLUMNS,
+                    lambda since: self._fetch_stock_data(since, raise_errors=True))
+            except Exception as e:
+                self._set_load_status('stock_data', 'error', started_at, error=str(e))
+                if self._stock_data_df is None:
+                    self._swap_stock_data(pd.DataFrame(columns=STOCK_DATA_COLUMNS))
+                return False
+            self._swap_stock_data(stock_data_df)
+            self._refreshed_at = time.monotonic()
+            self._set_load_status('stock_data', 'ready', started_at, rows=len(stock_data_df), source=source)
+            self._save_snapshot('stock_data', self._stock_data_df, force=(source == 'db'))
+            return True
+        finally:
+            self._end_load('stock_data')
+
+    def _load_news_data(self):
+        if not self._begin_load('news_data'):
+            return False
+        try:
+            started_at = time.time()
+            self._set_load_status('news_data', 'loading')
+            try:
+                news_data_df, source = self._fetch_full(
+                    'news_data', NEWS_DATA_COLUMNS,
+                    lambda since: self._fetch_news_data(since, raise_errors=True))
+            except Exception as e:
+                self._set_load_status('news_data', 'error', started_at, error=str(e))
+                if self._news_data_df is None:
+                    self._swap_news_data(pd.DataFrame(columns=NEWS_DATA_COLUMNS))
+                return False
+            self._swap_news_data(news_data_df)
+            self._set_load_status('news_data', 'ready', started_at, rows=len(news_data_df), source=source)
+            self._save_snapshot('news_data', self._news_data_df, force=(source == 'db'))
+            return True
+        finally:
+            self._end_load('news_data')
+
+    def _fetch_stock_data(self, since=None, raise_errors=False):
+        stock_data_df, _ = stock_data_db(since=since, raise_errors=raise_errors,
+                                         chunk_size=self.stream_chunk_size, window_months=self.window_months)
+        return stock_data_df
+
+    def _fetch_news_data(self, since=None, raise_errors=False):
+        return news_data_db(since=since, raise_errors=raise_errors,
+                            chunk_size=self.stream_chunk_size, window_months=self.window_months)
+
+    # 증분 조회 시작일: 주가는 high-water mark 당일부터, 뉴스는 news_lookback_days일 전부터
+    # company_news는 stock_data와 날짜로 조인되고 자체 증가 컬럼이 없으므로 최근 며칠을 통째로 다시 받아 교체함
+    def _delta_since(self, name, high_water_mark):
+        since = high_water_mark.normalize()
+        if name == 'news_data' and self.news_lookback_days:
+            since -= pd.Timedelta(days=self.news_lookback_days)
+        return since
+
+    # 메모리에 있는 기간의 시작일 (이 날짜 이후 주가는 모든 종목이 메모리에 있음)
+    def window_start(self):
+        return window_cutoff(self.window_months)
+
+    # 전체 프레임 로드: 로컬 스냅샷이 있으면 스냅샷을 읽고 high-water mark 이후 행만 DB에서 가져와 붙임 (붙이면서 메모리로 복사됨)
+    # 스냅샷이 없거나 읽을 수 없거나 기간(window_months)이 다르면 DB에서 전체를 조회 (반환값의 두 번째 항목은 'snapshot' / 'db')
+    def _fetch_full(self, name, columns, fetch):
+        if self.snapshot_dir:
+            try:
+                snapshot_df, manifest = load_frame_snapshot(self.snapshot_dir, name, expected_columns=columns)
+            except Exception as e:
+                print(f"[WARNING] '{name}' 스냅샷을 읽지 못해 DB에서 전체 로드합니다: {e}")
+                snapshot_df, manifest = None, None
+            high_water_mark = snapshot_high_water_mark(manifest)
+            if manifest is not None and manifest.get('metadata', {}).get('window_months') != self.window_months:
+                print(f"[INFO] '{name}' 스냅샷의 기간이 설정({self.window_months}개월)과 달라 DB에서 전체 로드합니다.")
+                snapshot_df = None
+            if snapshot_df is not None and not snapshot_df.empty and high_water_mark is not None:
+                since = self._delta_since(name, high_water_mark)
+                delta_df = fetch(since.date())
+                print(f"[INFO] '{name}' 스냅샷 {manifest['version']} 사용: {len(snapshot_df)}행 + 증분 {len(delta_df)}행")
+                # 이번에 읽은 스냅샷이 최신에 가까우므로 다음 저장은 snapshot_interval 뒤에 함
+                self._snapshot_saved_at[name] = time.monotonic()
+                return merge_delta(snapshot_df, delta_df, since, self.window_months), 'snapshot'
+        return fetch(None), 'db'
+
+    # 공유 프레임을 로컬 스냅샷으로 저장 (force가 아니면 snapshot_interval초에 한 번만, 실패해도 서비스에는 영향 없음)
+    def _save_snapshot(self, name, df, force=False):
+        if not self.snapshot_dir or df is None or df.empty:
+            return
+        saved_at = self._snapshot_saved_at.get(name)
+        if not force and saved_at is not None and time.monotonic() - saved_at < self.snapshot_interval:
+            return
+        self._snapshot_saved_at[name] = time.monotonic()
+        start = time.time()
+        try:
+            manifest = save_frame_snapshot(df, self.snapshot_dir, name, df['날짜'].max(),
+                                           metadata={'window_months': self.window_months})
+        except Exception as e:
+            print(f"[WARNING] '{name}' 스냅샷 저장 중 오류: {e}")
+            return
+        print(f"[INFO] '{name}' 스냅샷 저장 완료: {manifest['version']}, {manifest['rows']}행, {time.time() - start:.2f}초")
+
+    def _warming_up(self):
+        return self._warm_up_thread is not None and self._warm_up_thread.is_alive()
+
+    # 아직 로드되지 않았으면 이 스레드에서 로드 (lazy 모드의 첫 요청)
+    # 백그라운드 warm-up이 돌고 있거나 다른 스레드가 로드 중이면 기다리지 않고 바로 돌아가서, 접근자는 빈 프레임을 반환함
+    def _ensure_stock_data(self):
+        if self._stock_data_df is None and not self._warming_up():
+            self._load_stock_data()
+        self._refresh_if_stale()
+
+    def _ensure_news_data(self):
+        if self._news_data_df is None and not self._warming_up():
+            self._load_news_data()
+        self._refresh_if_stale()
+
+    def _refresh_once(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"[ERROR] 시장 데이터 증분 갱신 중 오류: {e}")
+
+    # 프레임이 max_staleness초보다 오래됐으면 백그라운드 스레드에서 refresh() 한 번 실행 (요청은 기다리지 않고 현재 프레임 사용)
+    def _refresh_if_stale(self):
+        refreshed_at = self._refreshed_at
+        if not self.max_staleness or refreshed_at is None or time.monotonic() - refreshed_at < self.max_staleness:
+            return
+        with self._lock:
+            if self._stale_refresh_thread is not None and self._stale_refresh_thread.is_alive():
+                return
+            self._stale_refresh_thread = threading.Thread(
+                target=self._refresh_once, name='market-data-stale-refresh', daemon=True)
+            self._stale_refresh_thread.start()
+
+    @property
+    def stock_data_df(self):
+        self._ensure_stock_data()
+        stock_data_df = self._stock_data_df
+        return stock_data_df if stock_data_df is not None else pd.DataFrame(columns=STOCK_DATA_COLUMNS)
+
+    @property
+    def stock_volume_df(self):
+        self._ensure_stock_data()
+        stock_volume_df = self._stock_volume_df
+        return stock_volume_df if stock_volume_df is not None else pd.DataFrame(columns=STOCK_VOLUME_COLUMNS)
+
+    @property
+    def stock_list(self):
+        self._ensure_stock_data()
+        stock_list = self._stock_list
+        return stock_list if stock_list is not None else build_stock_list(None)
+
+    # 로드 전에는 빈 인덱스 (검색 결과 없음)
+    @property
+    def search_index(self):
+        self._ensure_stock_data()
+        return self._search_index
+
+    @property
+    def news_data_df(self):
+        self._ensure_news_data()
+        news_data_df = self._news_data_df
+        return news_data_df if news_data_df is not None else pd.DataFrame(columns=NEWS_DATA_COLUMNS)
+
+    def load_all(self):
+        self._ensure_stock_data()
+        self._ensure_news_data()
+        return self
+
+    # 완성된 프레임들을 한 번에 교체 (읽는 쪽은 항상 이전 또는 새 프레임 전체만 보게 됨)
+    # 종목별 인덱스도 새 프레임 기준으로 같이 만들어 교체함
+    def _swap_stock_data(self, stock_data_df):
+        stock_data_df = compact_frame(stock_data_df)
+        stock_list = build_stock_list(stock_data_df)
+        # 종목 리스트가 바뀌었을 때만 자동완성 인덱스를 다시 만듦
+        search_index = self._search_index
+        if self._stock_list is None or not stock_list.equals(self._stock_list):
+            search_index = StockSearchIndex(stock_list)
+        with self._lock:
+            stock_index = self._stock_index.with_prices(stock_data_df)
+            # 인덱스가 종목명·날짜로 정렬한 프레임을 그대로 공유 프레임으로 사용
+            if stock_index.price_df is not None:
+                stock_data_df = stock_index.price_df
+            # 거래량 프레임은 복사하지 않고 같은 컬럼 배열을 공유 (copy-on-write라 원본 변경 영향 없음)
+            self._stock_volume_df = stock_data_df.loc[:, STOCK_VOLUME_COLUMNS]
+            self._stock_list = stock_list
+            self._stock_data_df = stock_data_df
+            self._stock_index = stock_index
+            self._search_index = search_index
+
+    def _swap_news_data(self, news_data_df):
+        news_data_df = compact_frame(news_data_df)
+        with self._lock:
+            self._stock_index = self._stock_index.with_news(news_data_df)
+            self._news_data_df = news_data_df
+
+    # 마지막 날짜(high-water mark) 이후 행만 DB에서 가져와 붙이고, 3개월이 지난 행은 버림 (뉴스는 최근 며칠을 다시 받음)
+    def refresh(self):
+        with self._refresh_lock:
+            start = time.time()
+            appended = {}
+
+            # 아직 로드되지 않았거나 비어 있으면(이전 로드 실패 포함) 전체 로드
+            stock_data_df = self._stock_data_df
+            if stock_data_df is None or stock_data_df.empty:
+                self._load_stock_data()
+                appended['stock_data'] = len(self.stock_data_df)
+            else:
+                high_water_mark = stock_data_df['날짜'].max()
+                delta_df = self._fetch_stock_data(since=high_water_mark.date())
+                appended['stock_data'] = len(delta_df)
+                self._swap_stock_data(merge_delta(stock_data_df, delta_df, high_water_mark, self.window_months))
+                self._save_snapshot('stock_data', self._stock_data_df)
+
+            news_data_df = self._news_data_df
+            if news_data_df is not None:
+                if news_data_df.empty:
+                    self._load_news_data()
+                    appended['news_data'] = len(self.news_data_df)
+                else:
+                    since = self._delta_since('news_data', news_data_df['날짜'].max())
+                    delta_df = self._fetch_news_data(since=since.date())
+                    appended['news_data'] = len(delta_df)
+                    self._swap_news_data(merge_delta(news_data_df, delta_df, since, self.window_months))
+                    self._save_snapshot('news_data', self._news_data_df)
+
+            self._refreshed_at = time.monotonic()
+            self._last_refresh = {
+                'at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'seconds': round(time.time() - start, 3),
+                'fetched_rows': appended,
+            }
+            print(f"[INFO] 시장 데이터 증분 갱신 완료: {self._last_refresh}")
+            return self._last_refresh
+
+    def _refresh_loop(self, interval):
+        while not self._refresh_stop.wait(interval):
+            self._refresh_once()
+
+    # interval초마다 refresh()를 실행하는 데몬 스레드 시작 (이미 실행 중이면 무시)
+    def start_background_refresh(self, interval):
+        if not interval or interval <= 0:
+            return
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        self._refresh_stop.clear()
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop, args=(interval,),
+            name='market-data-refresher', daemon=True)
+        self._refresh_thread.start()
+
+    def stop_background_refresh(self):
+        self._refresh_stop.set()
+
+    # 로드되지 않았거나 실패한 데이터셋을 모두 로드 (모두 준비되면 True)
+    def warm_up(self):
+        ready = True
+        for name, load in (('stock_data', self._load_stock_data), ('news_data', self._load_news_data)):
+            if self._load_status[name]['state'] != 'ready':
+                ready = load() and ready
+        return ready
+
+    def _warm_up_loop(self, retry_interval):
+        while not self.warm_up():
+            print(f"[WARNING] 시장 데이터 로드 실패, {retry_interval}초 후 다시 시도: {self._load_status}")
+            if self._refresh_stop.wait(retry_interval):
+                return
+        print(f"[INFO] 시장 데이터 로드 완료: {self._load_status}")
+
+    # 앱 시작을 막지 않도록 데몬 스레드에서 데이터를 미리 로드 (실패하면 retry_interval초마다 다시 시도)
+    # 로드가 끝나기 전에 들어온 요청은 기다리지 않고 빈 프레임으로 처리됨 (준비 여부는 is_ready / /healthz/ready)
+    def start_background_warm_up(self, retry_interval=30):
+        if self._warm_up_thread is not None and self._warm_up_thread.is_alive():
+            return
+        self._warm_up_thread = threading.Thread(
+            target=self._warm_up_loop, args=(retry_interval,),
+            name='market-data-warm-up', daemon=True)
+        self._warm_up_thread.start()
+
+    def is_ready(self):
+        return all(status['state'] == 'ready' for status in self._load_status.values())
+
+    # 데이터셋별 로드 상태 + 행 수 (readiness probe용)
+    def load_status(self):
+        return {name: dict(status) for name, status in self._load_status.items()}
+
+    # 종목명/종목코드에 해당하는 주가·뉴스 구간 (없으면 None)
+    def get_stock_slice(self, name_or_code):
+        self._ensure_stock_data()
+        self._ensure_news_data()
+        return self._stock_index.get(name_or_code)
+
+    # 종목의 가장 최근 stock_data 행 (종목별 구간이 날짜 오름차순이므로 마지막 행, 없으면 None)
+    def latest_daily_quote(self, name_or_code):
+        self._ensure_stock_data()
+        stock_slice = self._stock_index.get(name_or_code)
+        if stock_slice is None or stock_slice.price_df.empty:
+            return None
+        row = stock_slice.price_df.iloc[-1]
+        return {
+            'stock_name': stock_slice.name,
+            'stock_code': stock_slice.code,
+            'date': row['날짜'],
+            'close_price': int(row['종가']),
+            'price_change': int(row['전일비']),
+            'volume': int(row['거래량']),
+        }
+
+    # search 화면용 분석 결과 (analyze_stock_data와 같은 형태, 해당 종목 구간만 사용)
+    def analyze(self, name_or_code):
+        return analyze_stock_slice(self.get_stock_slice(name_or_code))
+
+    # 종목별 최대 거래량 순으로 정렬한 프레임 (메인 화면 거래량 순위용)
+    def top_volume_df(self):
+        stock_volume_df = self.stock_volume_df
+        if stock_volume_df.empty or not set(STOCK_VOLUME_COLUMNS) <= set(stock_volume_df.columns):
+            return pd.DataFrame(columns=['종목명', '거래량'])
+        max_volume_df = stock_volume_df.groupby('종목명', as_index=False, observed=True)['거래량'].max()
+        return max_volume_df.sort_values(by='거래량', ascending=False)
+
+    # 로드된 행 수와 프레임별·컬럼별 메모리 사용량 (아직 로드 안 된 프레임은 로드하지 않음)
+    def stats(self):
+        frames = {
+            'stock_data': self._stock_data_df,
+            'stock_volume': self._stock_volume_df,
+            'news_data': self._news_data_df,
+            'stock_list': self._stock_list,
+        }
+        result = {name: _frame_stats(df) for name, df in frames.items()}
+        # stock_volume은 stock_data의 컬럼을 공유하므로 합계에서 제외
+        result['stock_volume']['shared_with'] = 'stock_data'
+        result['total_memory_bytes'] = sum(
+            item['memory_bytes'] for name, item in result.items() if name != 'stock_volume')
+        result['last_refresh'] = self._last_refresh
+        refreshed_at = self._refreshed_at
+        result['age_seconds'] = round(time.monotonic() - refreshed_at, 1) if refreshed_at is not None else None
+        result['max_staleness'] = self.max_staleness
+        return result
+
+
+    # fork 시점에 프레임 교체가 진행 중이지 않도록 잠금을 잡고 fork하고, 자식에서는 새 잠금으로 시작
+    # (부모의 갱신 스레드는 자식에 복사되지 않으므로 자식에서 잡힌 채로 남은 잠금을 쓰면 안 됨)
+    def _before_fork(self):
+        self._lock.acquire()
+
+    def _after_fork_in_parent(self):
+        self._lock.release()
+
+    def _after_fork_in_child(self):
+        self._lock = threading.RLock()
+        # 부모에서 로드 중이던 스레드는 자식에 없으므로 로드 중 표시도 지움 (상태가 ready가 아니면 워커에서 다시 로드)
+        self._loading = set()
+        self._refresh_lock = threading.Lock()
+        self._refresh_stop = threading.Event()
+
+
+# 프로세스 전체에서 공유하는 인스턴스
+market_data_store = MarketDataStore()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(
+        before=market_data_store._before_fork,
+        after_in_parent=market_data_store._after_fork_in_parent,
+        after_in_child=market_data_store._after_fork_in_child,
+    )
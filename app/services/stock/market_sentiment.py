@@ -0,0 +1,191 @@
+# app/services/stock/market_sentiment.py
+# market_analysis 일별/시간별 집계(rollup)
+# 요청마다 DATE(date)로 GROUP BY 하지 않고, 마지막으로 본 시각 이후 행만 가져와 메모리의 집계에 더함
+
+import datetime
+import threading
+import time
+
+from db import get_connection
+
+# 메인 화면 미니 그래프 기간 (일 수 / 시간 수)
+TREND_RANGES = {'7d': 7, '30d': 30, '1y': 365}
+HOURLY_TREND_RANGES = {'24h': 24, '72h': 72}
+RETENTION_DAYS = max(TREND_RANGES.values()) + 1
+
+# 같은 시각으로 기록된 행이 조회 뒤에 커밋되면 "date > 마지막 시각" 조건으로는 다시 보이지 않으므로
+# 현재보다 settle_seconds 이상 지난 행만 집계하고 high-water mark도 그 시각까지만 올림
+# (집계에 최소/최대가 있어 같은 시각을 다시 읽어 교체할 수 없음)
+ROWS_QUERY = """
+    SELECT date, score, positive, negative, neutral
+    FROM market_analysis
+    WHERE date > %s AND date <= %s
+    ORDER BY date
+"""
+
+
+class SentimentAggregate:
+    """점수 평균/최소/최대/건수와 긍정·부정·중립 합계 (새 행이 오면 add로 누적)"""
+
+    __slots__ = ('count', 'score_sum', 'score_min', 'score_max', 'positive', 'negative', 'neutral')
+
+    def __init__(self):
+        self.count = 0
+        self.score_sum = 0.0
+        self.score_min = None
+        self.score_max = None
+        self.positive = 0
+        self.negative = 0
+        self.neutral = 0
+
+    def add(self, score, positive=0, negative=0, neutral=0):
+        if score is not None:
+            score = float(score)
+            self.count += 1
+            self.score_sum += score
+            self.score_min = score if self.score_min is None else min(self.score_min, score)
+            self.score_max = score if self.score_max is None else max(self.score_max, score)
+        self.positive += positive or 0
+        self.negative += negative or 0
+        self.neutral += neutral or 0
+
+    def copy(self):
+        other = SentimentAggregate()
+        for name in self.__slots__:
+            setattr(other, name, getattr(self, name))
+        return other
+
+    @property
+    def average(self):
+        return self.score_sum / self.count if self.count else None
+
+    def to_dict(self):
+        return {
+            'score': round(self.average, 1) if self.count else None,
+            'min': self.score_min,
+            'max': self.score_max,
+            'count': self.count,
+            'positive': self.positive,
+            'negative': self.negative,
+            'neutral': self.neutral,
+        }
+
+
+class MarketSentimentRollup:
+    """market_analysis의 일별/시간별 집계를 유지합니다.
+
+    refresh_interval초가 지난 뒤 처음 읽을 때만 새 행을 조회하고, 그 사이에는 메모리의 집계만 사용합니다.
+    """
+
+    def __init__(self, refresh_interval=60, settle_seconds=120):
+        self.refresh_interval = refresh_interval
+        self.settle_seconds = settle_seconds
+        self._lock = threading.Lock()
+        self._daily = {}    # date -> SentimentAggregate
+        self._hourly = {}   # 정시 datetime -> SentimentAggregate
+        self._high_water_mark = None   # 지금까지 반영한 가장 마지막 market_analysis.date
+        self._checked_at = None
+        self.refreshes = 0
+
+    # 새 행을 집계에 더함 (바뀌는 항목만 복사해서 새 dict로 교체하므로 읽는 쪽은 잠금이 필요 없음)
+    def apply(self, rows):
+        daily, hourly = dict(self._daily), dict(self._hourly)
+        touched = set()
+        high_water_mark = self._high_water_mark
+        for row in rows:
+            row_time = row['date']
+            if not isinstance(row_time, datetime.datetime):
+                row_time = datetime.datetime.combine(row_time, datetime.time())
+            for buckets, key in ((daily, row_time.date()), (hourly, row_time.replace(minute=0, second=0, microsecond=0))):
+                if (id(buckets), key) not in touched:
+                    buckets[key] = buckets[key].copy() if key in buckets else SentimentAggregate()
+                    touched.add((id(buckets), key))
+                buckets[key].add(row.get('score'), row.get('positive'), row.get('negative'), row.get('neutral'))
+            if high_water_mark is None or row_time > high_water_mark:
+                high_water_mark = row_time
+
+        # 보관 기간이 지난 집계는 버림
+        cutoff = datetime.date.today() - datetime.timedelta(days=RETENTION_DAYS)
+        self._daily = {day: agg for day, agg in daily.items() if day >= cutoff}
+        self._hourly = {hour: agg for hour, agg in hourly.items() if hour.date() >= cutoff}
+        self._high_water_mark = high_water_mark
+
+    def refresh(self):
+        with self._lock:
+            since = self._high_water_mark
+            if since is None:
+                since = datetime.datetime.combine(datetime.date.today() - datetime.timedelta(days=RETENTION_DAYS), datetime.time())
+            until = datetime.datetime.now().replace(microsecond=0) - datetime.timedelta(seconds=self.settle_seconds)
+            rows = []
+            if since < until:
+                conn = get_connection()
+                try:
+                    with conn.cursor() as cursor:
+                        cursor.execute(ROWS_QUERY, (since, until))
+                        rows = cursor.fetchall()
+                finally:
+                    conn.close()
+            if rows or self._high_water_mark is None:
+                self.apply(rows)
+            # until까지의 행은 모두 커밋되었다고 보고 다음 조회는 그 이후부터
+            if self._high_water_mark is None or self._high_water_mark < until:
+                self._high_water_mark = until
+            self._checked_at = time.monotonic()
+            self.refreshes += 1
+
+    def refresh_if_stale(self):
+        checked_at = self._checked_at
+        if checked_at is not None and time.monotonic() - checked_at < self.refresh_interval:
+            return
+        try:
+            self.refresh()
+        except Exception as e:
+            # 조회 실패 시 지금까지의 집계를 그대로 사용
+            print(f"[ERROR] 시장 심리 집계 갱신 중 오류: {e}")
+            self._checked_at = time.monotonic()
+
+    # 최근 days일(오늘 포함 days+1일)의 일별 집계, 데이터가 없는 날은 건너뜀
+    def daily_trend(self, days):
+        self.refresh_if_stale()
+        daily = self._daily
+        today = datetime.date.today()
+        result = []
+        for offset in range(days, -1, -1):
+            day = today - datetime.timedelta(days=offset)
+            agg = daily.get(day)
+            if agg is not None and agg.count:
+                result.append({'date': day.strftime('%m-%d'), **agg.to_dict()})
+        return result
+
+    # 최근 hours시간의 시간별 집계, 데이터가 없는 시간은 건너뜀
+    def hourly_trend(self, hours):
+        self.refresh_if_stale()
+        hourly = self._hourly
+        now = datetime.datetime.now().replace(minute=0, second=0, microsecond=0)
+        result = []
+        for offset in range(hours, -1, -1):
+            hour = now - datetime.timedelta(hours=offset)
+            agg = hourly.get(hour)
+            if agg is not None and agg.count:
+                result.append({'date': hour.strftime('%m-%d %H:00'), **agg.to_dict()})
+        return result
+
+    # '7d' / '30d' / '1y'는 일별, '24h' / '72h'는 시간별 집계 (알 수 없는 값이면 None)
+    def trend(self, range_key='7d'):
+        if range_key in TREND_RANGES:
+            return self.daily_trend(TREND_RANGES[range_key])
+        if range_key in HOURLY_TREND_RANGES:
+            return self.hourly_trend(HOURLY_TREND_RANGES[range_key])
+        return None
+
+    def stats(self):
+        return {
+            'days': len(self._daily),
+            'hours': len(self._hourly),
+            'high_water_mark': str(self._high_water_mark) if self._high_water_mark else None,
+            'refreshes': self.refreshes,
+            'refresh_interval': self.refresh_interval,
+        }
+
+
+market_sentiment_rollup = MarketSentimentRollup()
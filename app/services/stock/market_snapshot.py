@@ -0,0 +1,157 @@
+# app/services/stock/market_snapshot.py
+# 로그인 메인 화면의 시장 심리 요약 + 유망/부진 종목 스냅샷
+# 모든 사용자에게 같은 결과이므로 새 분석 배치(stock_sentiment / market_analysis 최신 날짜)가
+# 들어올 때만 다시 만들고, 그 사이 요청은 메모리의 스냅샷을 그대로 사용함
+
+import threading
+import time
+
+from db import get_connection
+from app.services.stock.market_data_store import market_data_store
+from app.services.stock.sentiment_index import stock_sentiment_index, POSITIVE_SCORE, NEGATIVE_SCORE
+
+VERSION_QUERY = """
+    SELECT
+        (SELECT MAX(date) FROM stock_sentiment) AS sentiment_date,
+        (SELECT MAX(date) FROM market_analysis) AS market_date
+"""
+
+# 종목별 감성 점수는 stock_sentiment_index, 최신 종가는 market_data_store의 stock_data 프레임에서 찾음
+# (주가가 없는 종목은 빠지므로 점수 순으로 정렬한 뒤 앞에서부터 3개만 사용)
+SENTIMENT_STOCKS_LIMIT = 3
+
+
+# 감성 분석 행에 최신 stock_data 종목명/종가/전일비를 붙임 (주가가 없는 종목은 제외)
+def _with_latest_price(stock_rows):
+    result = []
+    for stock in stock_rows:
+        quote = market_data_store.latest_daily_quote(stock['stock_code'])
+        if quote is None:
+            continue
+        result.append(dict(stock, stock_name=quote['stock_name'],
+                           close_price=quote['close_price'], price_change=quote['price_change']))
+        if len(result) >= SENTIMENT_STOCKS_LIMIT:
+            break
+    return result
+
+
+def _market_data_with_ratios(market_data):
+    positive_count = market_data.get('positive', 0)
+    negative_count = market_data.get('negative', 0)
+    neutral_count = market_data.get('neutral', 0)
+    total_comments = market_data.get('total_comments', 0)
+    ratios = {'positive': 0, 'negative': 0, 'neutral': 0}
+    if total_comments > 0:
+        ratios['positive'] = round((positive_count / total_comments) * 100)
+        ratios['negative'] = round((negative_count / total_comments) * 100)
+        ratios['neutral'] = round((neutral_count / total_comments) * 100)
+    market_data['ratios'] = ratios
+    return market_data
+
+
+# 유망(positive)/부진(negative) 종목 카드 데이터
+def _to_sentiment_stock(stock, sentiment_class):
+    change = stock['price_change']
+    previous_close = stock['close_price'] - change
+    change_rate_val = (change / previous_close * 100) if previous_close != 0 else 0
+    score = stock['score']
+    if sentiment_class == 'positive':
+        sentiment_text = "매우 긍정" if score >= 75 else "긍정"
+    else:
+        sentiment_text = "매우 부정" if score <= 35 else "부정적"
+    reason_text = stock.get('reason') or ''
+    keywords = [word for word in reason_text.replace(",", " ").split() if word.startswith('#')]
+    return {
+        'name': stock['stock_name'], 'currentPrice': f"{stock['close_price']:,}원",
+        'changeRate': f"{change_rate_val:+.2f}%", 'aiSentiment': sentiment_class,
+        'aiSentimentText': sentiment_text, 'reason': stock['reason'],
+        'sentiment_details': {'score': stock['score'], 'ratios': {'positive': stock.get('positive', 0), 'negative': stock.get('negative', 0), 'neutral': stock.get('neutral', 0)}, 'keywords': keywords}
+    }
+
+
+def build_market_snapshot(cursor, sentiment_date):
+    market_data = {}
+    market_summary = {'positive': '긍정적인 분석 결과가 없습니다.'}
+    promising_stocks, failing_stocks = [], []
+    reference_time = None
+
+    # 시장 심리 지수와 최신 요약 이유는 같은 최신 행에서 가져옴
+    cursor.execute("SELECT * FROM market_analysis ORDER BY date DESC LIMIT 1")
+    db_market_data = cursor.fetchone()
+    if db_market_data:
+        market_data = _market_data_with_ratios(db_market_data)
+        if db_market_data.get('reason'):
+            market_summary['positive'] = db_market_data['reason']
+
+    if sentiment_date:
+        reference_time = sentiment_date.strftime('%Y-%m-%d %H:%M') + " 기준"
+        # 새 배치가 인덱스에 아직 반영되지 않았으면 바로 반영한 뒤 해당 배치의 행만 사용
+        stock_sentiment_index.refresh_until(sentiment_date)
+        batch_rows = [row for row in stock_sentiment_index.batch_rows(sentiment_date) if row.get('score') is not None]
+        promising_rows = sorted((row for row in batch_rows if row['score'] >= POSITIVE_SCORE), key=lambda row: row['score'], reverse=True)
+        failing_rows = sorted((row for row in batch_rows if row['score'] <= NEGATIVE_SCORE), key=lambda row: row['score'])
+        promising_stocks = [_to_sentiment_stock(stock, 'positive') for stock in _with_latest_price(promising_rows)]
+        failing_stocks = [_to_sentiment_stock(stock, 'negative') for stock in _with_latest_price(failing_rows)]
+
+    return {
+        'market_data': market_data,
+        'market_summary': market_summary,
+        'promising_stocks': promising_stocks,
+        'failing_stocks': failing_stocks,
+        'reference_time': reference_time,
+    }
+
+
+class MarketSnapshotCache:
+    """최신 분석 배치 날짜를 버전으로 하는 메인 화면 스냅샷
+
+    check_interval초 안에는 DB를 전혀 조회하지 않고, 그 이후에는 버전(최신 날짜)만 확인해서
+    바뀌었을 때만 스냅샷을 다시 만듭니다.
+    """
+
+    def __init__(self, check_interval=30):
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._version = None
+        self._checked_at = 0.0
+        self.rebuilds = 0
+
+    def get(self):
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return snapshot
+
+        with self._lock:
+            # 다른 스레드가 방금 확인했으면 그 결과를 사용
+            if self._snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+                return self._snapshot
+            conn = get_connection()
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(VERSION_QUERY)
+                    version_row = cursor.fetchone() or {}
+                    version = (version_row.get('sentiment_date'), version_row.get('market_date'))
+                    if self._snapshot is None or version != self._version:
+                        self._snapshot = build_market_snapshot(cursor, version[0])
+                        self._version = version
+                        self.rebuilds += 1
+                    self._checked_at = time.monotonic()
+                    return self._snapshot
+            finally:
+                conn.close()
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+            self._version = None
+
+    def stats(self):
+        return {
+            'version': [str(value) if value is not None else None for value in self._version] if self._version else None,
+            'rebuilds': self.rebuilds,
+            'check_interval': self.check_interval,
+        }
+
+
+market_snapshot_cache = MarketSnapshotCache()
@@ -0,0 +1,57 @@
+# app/services/stock/news_body.py
+# 기사 본문 조회 (링크 -> 본문)
+# 3개월치 본문 전체를 뉴스 프레임에 들고 있지 않고, 응답에 필요한 기사만 DB에서 가져와 LRU로 보관함
+
+from db import get_connection
+from app.services.cache import TTLCache
+
+# 링크 -> 본문 (본문이 없는 기사는 None도 그대로 저장해서 다시 조회하지 않음)
+article_body_cache = TTLCache(maxsize=2048, ttl=3600)
+_MISSING = object()
+
+
+def get_article_bodies(links):
+    links = list(dict.fromkeys(link for link in links if link))
+    bodies, missing_links = {}, []
+    for link in links:
+        body = article_body_cache.get(link, _MISSING)
+        if body is _MISSING:
+            missing_links.append(link)
+        else:
+            bodies[link] = body
+    if not missing_links:
+        return bodies
+
+    placeholders = ', '.join(['%s'] * len(missing_links))
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"""
+                SELECT link, content
+                FROM company_news
+                WHERE link IN ({placeholders})
+            """, missing_links)
+            fetched = {}
+            for row in cursor.fetchall():
+                fetched.setdefault(row['link'], row['content'])
+    except Exception as e:
+        # 본문 조회 실패 시 캐시하지 않고 본문 없이 응답
+        print(f"[ERROR] 기사 본문 조회 중 오류: {e}")
+        return bodies
+    finally:
+        conn.close()
+
+    for link in missing_links:
+        body = fetched.get(link)
+        article_body_cache.set(link, body)
+        bodies[link] = body
+    return bodies
+
+
+# 행 dict마다 같은 위치의 링크로 찾은 본문('본문')을 붙여 하나씩 돌려줌 (본문은 처음에 한 번에 조회)
+def with_article_bodies(rows, links):
+    links = list(links)
+    bodies = get_article_bodies([link for link in links if isinstance(link, str)])
+    for row, link in zip(rows, links):
+        row['본문'] = bodies.get(link) if isinstance(link, str) else None
+        yield row
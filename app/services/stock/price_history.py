@@ -0,0 +1,126 @@
+# app/services/stock/price_history.py
+# 메모리 기간(MARKET_DATA_WINDOW_MONTHS)보다 긴 종목별 주가 조회 (1년/3년 차트용)
+# 모든 종목의 긴 기간을 워커마다 올리지 않고, 메모리 기간 안쪽은 market_data_store의 종목 구간을 쓰고
+# 그보다 오래된 부분만 종목코드 + 날짜 범위로 DB에서 조회해 크기 제한이 있는 LRU 캐시에 보관함
+
+import datetime
+
+import pandas as pd
+
+from db import get_connection
+from app.services.cache import TTLCache
+from app.services.stock.data_loader import compact_frame
+from app.services.stock.market_data_store import market_data_store
+
+PRICE_HISTORY_COLUMNS = ['날짜', '시가', '종가', '전일비', '거래량']
+
+# 차트 기간 (range 파라미터)
+HISTORY_RANGES = {
+    '1m': pd.DateOffset(months=1),
+    '3m': pd.DateOffset(months=3),
+    '6m': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '3y': pd.DateOffset(years=3),
+    '5y': pd.DateOffset(years=5),
+}
+
+RANGE_QUERY = """
+    SELECT
+        date AS 날짜,
+        open_price AS 시가,
+        close_price AS 종가,
+        price_change AS 전일비,
+        volume AS 거래량
+    FROM stock_data
+    WHERE stock_code = %s
+      AND date >= %s
+      AND date < %s
+    ORDER BY date
+"""
+
+
+def _frame_bytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def _empty_history():
+    return pd.DataFrame(columns=PRICE_HISTORY_COLUMNS)
+
+
+class PriceHistoryCache:
+    """종목별 기간 주가를 돌려줍니다.
+
+    메모리 기간 밖의(지난) 구간은 바뀌지 않으므로 만료 없이 max_bytes 안에서 LRU로만 정리합니다.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self._cache = TTLCache(maxsize=4096, ttl=None, max_bytes=max_bytes, sizeof=_frame_bytes)
+        self.db_queries = 0
+
+    @property
+    def max_bytes(self):
+        return self._cache.max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value):
+        self._cache.max_bytes = value
+
+    # [start, stop) 구간을 DB에서 조회 (stop은 메모리 기간의 시작일이라 캐시 키가 하루에 한 번만 바뀜)
+    def _cold_range(self, stock_code, start, stop):
+        key = (stock_code, start.date(), stop.date())
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        conn = get_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(RANGE_QUERY, (stock_code, start.date(), stop.date()))
+                rows = cursor.fetchall()
+        finally:
+            conn.close()
+        self.db_queries += 1
+        if rows:
+            history_df = pd.DataFrame(rows, columns=PRICE_HISTORY_COLUMNS)
+            history_df['날짜'] = pd.to_datetime(history_df['날짜'], errors='coerce')
+            history_df = compact_frame(history_df.dropna(subset=['날짜']).reset_index(drop=True))
+        else:
+            history_df = _empty_history()
+        self._cache.set(key, history_df)
+        return history_df
+
+    # 종목명/종목코드의 start ~ end(포함) 주가, 날짜 오름차순 (모르는 종목이면 None)
+    def get_range(self, name_or_code, start, end=None):
+        stock_slice = market_data_store.get_stock_slice(name_or_code)
+        if stock_slice is None:
+            return None
+        start = pd.Timestamp(start).normalize()
+        end = pd.Timestamp(end).normalize() if end is not None else pd.Timestamp.today().normalize()
+        if end < start:
+            start, end = end, start
+
+        window_start = market_data_store.window_start()
+        parts = []
+        if start < window_start:
+            cold_df = self._cold_range(stock_slice.code, start, min(end + pd.Timedelta(days=1), window_start))
+            parts.append(cold_df)
+        if end >= window_start:
+            hot_df = stock_slice.price_df
+            hot_df = hot_df[(hot_df['날짜'] >= max(start, window_start)) & (hot_df['날짜'] <= end)]
+            parts.append(hot_df.loc[:, PRICE_HISTORY_COLUMNS])
+        parts = [part for part in parts if not part.empty]
+        if not parts:
+            return _empty_history()
+        return pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0].reset_index(drop=True)
+
+    # '1y' 같은 기간 키로 조회 (오늘까지), 알 수 없는 키면 ValueError
+    def get_history(self, name_or_code, range_key):
+        if range_key not in HISTORY_RANGES:
+            raise ValueError(f"range는 {', '.join(HISTORY_RANGES)} 중 하나여야 합니다.")
+        end = pd.Timestamp(datetime.date.today())
+        return self.get_range(name_or_code, end - HISTORY_RANGES[range_key], end)
+
+    def stats(self):
+        return {'db_queries': self.db_queries, **self._cache.stats()}
+
+
+price_history_cache = PriceHistoryCache()
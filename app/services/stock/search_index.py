@@ -0,0 +1,160 @@
+# app/services/stock/search_index.py
+# 자동완성/종목 검색용 인덱스
+# - 접두어 트라이(prefix trie)와 2-gram 역색인으로 전체 종목 리스트를 훑지 않고 후보를 찾음
+# - 전각/반각 문자 통일(NFKC), 대소문자 무시, 한글 초성 검색(예: 'ㅅㅅㅈㅈ' -> 삼성전자) 지원
+# - 정렬 순서: 완전 일치 > 접두어 일치 > 부분 일치 (같은 등급이면 짧은 이름, 가나다 순)
+
+import unicodedata
+
+CHOSUNG = ['ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+CHOSUNG_SET = set(CHOSUNG)
+HANGUL_BASE, HANGUL_LAST = 0xAC00, 0xD7A3
+
+# NFKC는 호환 자모(ㅅ, U+3145)를 조합형 초성(U+1109)으로 바꾸므로 다시 호환 자모로 되돌림
+_JAMO_TO_CHOSUNG = {0x1100 + i: ch for i, ch in enumerate(CHOSUNG)}
+
+
+# 전각 -> 반각, 자모 정리, 공백 제거, 대문자 통일
+def normalize(text):
+    text = unicodedata.normalize('NFKC', str(text or '')).translate(_JAMO_TO_CHOSUNG)
+    return ''.join(text.split()).upper()
+
+
+# 완성형 한글은 초성으로 바꾸고 나머지 문자는 그대로 둠
+def to_chosung(text):
+    result = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            result.append(CHOSUNG[(code - HANGUL_BASE) // 588])
+        else:
+            result.append(ch)
+    return ''.join(result)
+
+
+def is_chosung_query(text):
+    return any(ch in CHOSUNG_SET for ch in text)
+
+
+def _ngrams(text, n=2):
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class _TrieNode:
+    __slots__ = ('children', 'ids')
+
+    def __init__(self):
+        self.children = {}
+        self.ids = []   # 이 노드를 접두어로 갖는 항목 id (정렬 순서 유지)
+
+
+class _KeyIndex:
+    """한 종류의 키(이름/코드/초성)에 대한 트라이 + 2-gram 역색인"""
+
+    def __init__(self, keys, order):
+        self.keys = keys
+        self.exact = {}
+        self.root = _TrieNode()
+        self.chars = {}
+        self.grams = {}
+        # order 순서(짧은 이름, 가나다 순)로 넣어서 트라이/역색인 목록이 미리 정렬되도록 함
+        for item_id in order:
+            key = keys[item_id]
+            if not key:
+                continue
+            self.exact.setdefault(key, []).append(item_id)
+            node = self.root
+            for ch in key:
+                node = node.children.setdefault(ch, _TrieNode())
+                node.ids.append(item_id)
+            for ch in set(key):
+                self.chars.setdefault(ch, []).append(item_id)
+            for gram in _ngrams(key):
+                self.grams.setdefault(gram, []).append(item_id)
+
+    def prefix(self, query):
+        node = self.root
+        for ch in query:
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return node.ids
+
+    def substring(self, query, limit, skip):
+        if len(query) == 1:
+            candidates = self.chars.get(query, [])
+        else:
+            # 가장 짧은 2-gram 역색인 목록을 후보로 잡고 실제 포함 여부만 확인
+            candidates = min((self.grams.get(gram, []) for gram in _ngrams(query)), key=len)
+        result = []
+        for item_id in candidates:
+            if item_id in skip:
+                continue
+            if query in self.keys[item_id]:
+                result.append(item_id)
+                if len(result) >= limit:
+                    break
+        return result
+
+
+class StockSearchIndex:
+    """종목명/종목코드 자동완성 인덱스. 종목 리스트가 갱신되면 새로 만들어 교체합니다."""
+
+    def __init__(self, stock_list=None):
+        self.names = []
+        self.codes = []
+        if stock_list is not None and not stock_list.empty:
+            pairs = stock_list[['종목명', '주식코드']].drop_duplicates()
+            self.names = [str(name) for name in pairs['종목명']]
+            self.codes = [str(code) for code in pairs['주식코드']]
+
+        name_keys = [normalize(name) for name in self.names]
+        code_keys = [normalize(code) for code in self.codes]
+        chosung_keys = [to_chosung(key) for key in name_keys]
+        order = sorted(range(len(self.names)), key=lambda i: (len(name_keys[i]), name_keys[i], code_keys[i]))
+
+        self._indexes = [
+            _KeyIndex(name_keys, order),
+            _KeyIndex(code_keys, order),
+        ]
+        self._chosung_index = _KeyIndex(chosung_keys, order)
+
+    def __len__(self):
+        return len(self.names)
+
+    def search_ids(self, query, limit=10):
+        key = normalize(query)
+        if not key or limit <= 0:
+            return []
+        if is_chosung_query(key):
+            # 'ㅅㅅ전자'처럼 섞여 있어도 모두 초성으로 바꿔서 초성 인덱스에서 찾음
+            key = to_chosung(key)
+            indexes = [self._chosung_index]
+        else:
+            indexes = self._indexes
+
+        result, seen = [], set()
+
+        def add(ids):
+            for item_id in ids:
+                if len(result) >= limit:
+                    return
+                if item_id not in seen:
+                    seen.add(item_id)
+                    result.append(item_id)
+
+        for index in indexes:
+            add(index.exact.get(key, []))
+        for index in indexes:
+            add(index.prefix(key))
+        for index in indexes:
+            if len(result) >= limit:
+                break
+            add(index.substring(key, limit - len(result), seen))
+        return result
+
+    # [{'종목명': ..., '주식코드': ...}, ...] 형태로 반환
+    def search(self, query, limit=10):
+        return [{'종목명': self.names[i], '주식코드': self.codes[i]} for i in self.search_ids(query, limit)]
@@ -0,0 +1,208 @@
+# app/services/stock/sentiment_index.py
+# 종목별 감성 지수 (stock_sentiment): 최신 점수·이유·긍정/부정/중립 비율과 7일/30일 점수 변화
+# 상세 팝업, 메인 화면 유망/부진 종목, 관심 종목 목록이 각자 stock_sentiment를 조회하지 않고
+# 이 인덱스에서 종목코드로 바로 꺼내 씀 (새 분석 행이 들어오면 바뀐 종목의 항목만 다시 계산)
+
+import datetime
+import threading
+import time
+
+from db import get_connection
+
+# 점수 변화(trend)를 계산하는 기간(일), 가장 긴 기간만큼 분석 이력을 메모리에 유지
+TREND_DAYS = (7, 30)
+HISTORY_DAYS = max(TREND_DAYS)
+
+# 이력 기간보다 오래전에 마지막으로 분석된 종목의 최신 행 (처음 한 번만)
+INITIAL_QUERY = """
+    SELECT stock_code, score, reason, positive, negative, neutral, date
+    FROM (
+        SELECT
+            stock_code, score, reason, positive, negative, neutral, date,
+            ROW_NUMBER() OVER (PARTITION BY stock_code ORDER BY date DESC) AS rn
+        FROM stock_sentiment
+        WHERE date < %s
+    ) AS latest
+    WHERE rn = 1
+"""
+
+# high-water mark 이후(같은 시각 포함) 분석 행, 같은 행을 다시 받아도 결과가 같도록 (종목, 시각)으로 덮어씀
+DELTA_QUERY = """
+    SELECT stock_code, score, reason, positive, negative, neutral, date
+    FROM stock_sentiment
+    WHERE date >= %s
+    ORDER BY date
+"""
+
+# 메인 화면의 유망/부진 종목 기준 점수
+POSITIVE_SCORE = 75
+NEGATIVE_SCORE = 35
+
+
+def sentiment_label(score):
+    if score is None:
+        return '데이터 없음'
+    if score >= POSITIVE_SCORE:
+        return '긍정'
+    if score <= NEGATIVE_SCORE:
+        return '부정'
+    return '중립'
+
+
+def _ratios(row):
+    counts = {key: int(row.get(key) or 0) for key in ('positive', 'negative', 'neutral')}
+    total = sum(counts.values())
+    if not total:
+        return {key: 0 for key in counts}
+    return {key: round(count / total * 100) for key, count in counts.items()}
+
+
+# 최신 행 + (시각 -> 점수) 이력 -> 화면에서 쓰는 감성 지수 dict
+def _build_entry(latest_row, history):
+    daily = {}
+    for analyzed_at, score in history.items():
+        day_sum, day_count = daily.get(analyzed_at.date(), (0.0, 0))
+        daily[analyzed_at.date()] = (day_sum + score, day_count + 1)
+    daily_scores = sorted((day, day_sum / day_count) for day, (day_sum, day_count) in daily.items())
+
+    trends = {}
+    for days in TREND_DAYS:
+        trend = None
+        if len(daily_scores) > 1:
+            last_day, last_score = daily_scores[-1]
+            window_start = last_day - datetime.timedelta(days=days)
+            # 기간 안에서 가장 오래된 날의 평균 점수 대비 최근 날의 평균 점수 변화
+            first_day, first_score = next((day, score) for day, score in daily_scores if day >= window_start)
+            if first_day < last_day:
+                trend = round(last_score - first_score, 1)
+        trends[f'trend_{days}d'] = trend
+
+    score = float(latest_row['score']) if latest_row.get('score') is not None else None
+    return {
+        'stock_code': latest_row['stock_code'],
+        'score': score,
+        'label': sentiment_label(score),
+        'reason': latest_row.get('reason') or '',
+        'ratios': _ratios(latest_row),
+        'date': latest_row['date'].strftime('%Y-%m-%d %H:%M'),
+        **trends,
+    }
+
+
+class StockSentimentIndex:
+    """종목코드 -> 감성 지수를 O(1)로 돌려줍니다.
+
+    refresh_interval초가 지난 뒤 처음 읽을 때만 새 분석 행을 조회합니다.
+    반환되는 dict는 공유 객체이므로 호출하는 쪽에서 수정하면 안 됩니다.
+    """
+
+    def __init__(self, refresh_interval=30):
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._latest = {}    # stock_code -> 최신 stock_sentiment 행
+        self._history = {}   # stock_code -> {분석 시각: 점수}, HISTORY_DAYS 안쪽만
+        self._entries = {}   # stock_code -> 감성 지수 dict
+        self._high_water_mark = None   # 지금까지 본 가장 마지막 date
+        self._checked_at = None
+        self.refreshes = 0
+
+    @staticmethod
+    def _history_start():
+        return datetime.datetime.combine(datetime.date.today() - datetime.timedelta(days=HISTORY_DAYS), datetime.time())
+
+    # 새 분석 행 반영, 바뀐 종목의 항목만 다시 만들어 새 dict로 한 번에 교체 (읽는 쪽은 잠금이 필요 없음)
+    def apply(self, rows, track_history=True):
+        latest, history, entries = dict(self._latest), dict(self._history), dict(self._entries)
+        history_start = self._history_start()
+        high_water_mark = self._high_water_mark
+        touched, copied = set(), set()
+        for row in rows:
+            stock_code, analyzed_at = row['stock_code'], row['date']
+            current = latest.get(stock_code)
+            if current is None or analyzed_at >= current['date']:
+                latest[stock_code] = row
+            if track_history and analyzed_at >= history_start and row.get('score') is not None:
+                if stock_code not in copied:
+                    history[stock_code] = dict(history.get(stock_code, {}))
+                    copied.add(stock_code)
+                history[stock_code][analyzed_at] = float(row['score'])
+            touched.add(stock_code)
+            if high_water_mark is None or analyzed_at > high_water_mark:
+                high_water_mark = analyzed_at
+
+        for stock_code in touched:
+            stock_history = {analyzed_at: score for analyzed_at, score in history.get(stock_code, {}).items()
+                             if analyzed_at >= history_start}
+            history[stock_code] = stock_history
+            entries[stock_code] = _build_entry(latest[stock_code], stock_history)
+
+        self._latest, self._history, self._entries = latest, history, entries
+        self._high_water_mark = high_water_mark
+
+    def refresh(self):
+        with self._lock:
+            conn = get_connection()
+            try:
+                with conn.cursor() as cursor:
+                    if self._high_water_mark is None:
+                        history_start = self._history_start()
+                        cursor.execute(INITIAL_QUERY, (history_start,))
+                        self.apply(cursor.fetchall(), track_history=False)
+                        since = history_start
+                    else:
+                        since = self._high_water_mark
+                    cursor.execute(DELTA_QUERY, (since,))
+                    self.apply(cursor.fetchall())
+            finally:
+                conn.close()
+            self._checked_at = time.monotonic()
+            self.refreshes += 1
+
+    def refresh_if_stale(self):
+        checked_at = self._checked_at
+        if checked_at is not None and time.monotonic() - checked_at < self.refresh_interval:
+            return
+        try:
+            self.refresh()
+        except Exception as e:
+            # 조회 실패 시 마지막으로 갖고 있던 지수를 그대로 사용
+            print(f"[ERROR] 종목 감성 지수 갱신 중 오류: {e}")
+            self._checked_at = time.monotonic()
+
+    # 주어진 분석 시각까지 반영되어 있지 않으면 refresh_interval과 관계없이 바로 조회 (새 배치를 알고 있는 쪽에서 사용)
+    def refresh_until(self, analyzed_at):
+        if analyzed_at is not None and (self._high_water_mark is None or self._high_water_mark < analyzed_at):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"[ERROR] 종목 감성 지수 갱신 중 오류: {e}")
+
+    def get(self, stock_code):
+        self.refresh_if_stale()
+        return self._entries.get(str(stock_code).zfill(6))
+
+    # {stock_code: 감성 지수}, 분석 결과가 없는 종목은 빠짐
+    def get_many(self, stock_codes):
+        self.refresh_if_stale()
+        entries = self._entries
+        return {code: entries[code] for code in (str(code).zfill(6) for code in stock_codes) if code in entries}
+
+    # analyzed_at 배치에서 분석된 종목들의 최신 stock_sentiment 행 (메인 화면 유망/부진 종목용)
+    def batch_rows(self, analyzed_at):
+        return [row for row in self._latest.values() if row['date'] == analyzed_at]
+
+    @property
+    def version(self):
+        return self._high_water_mark
+
+    def stats(self):
+        high_water_mark = self._high_water_mark
+        return {
+            'stocks': len(self._entries),
+            'high_water_mark': str(high_water_mark) if high_water_mark else None,
+            'refreshes': self.refreshes,
+            'refresh_interval': self.refresh_interval,
+        }
+
+
+stock_sentiment_index = StockSentimentIndex()
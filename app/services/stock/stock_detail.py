@@ -0,0 +1,165 @@
+# app/services/stock/stock_detail.py
+# 관심 종목 상세 팝업(/api/stock_detail/<code>) 데이터
+# 최신 시세는 latest_quote_store(메모리)에서 읽고, DB가 필요한 최근 뉴스와 최근 체결가는 동시에 조회함
+# 감성 점수는 stock_sentiment_index에서 읽음
+# 완성된 결과는 (종목코드, 마지막 체결 시각, 감성 지수 버전) 키로 잠깐 캐시해서 새 틱/분석이 들어오면 자동으로 다시 만듦
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from db import get_connection
+from app.services.cache import TTLCache
+from app.services.stock.latest_quote import latest_quote_store
+from app.services.stock.chart_utils import get_recent_stock_prices
+from app.services.stock.sentiment_index import stock_sentiment_index
+
+# 상세 차트에 쓰는 최근 체결가 개수
+DETAIL_CHART_POINTS = 30
+# 상세 팝업에 보여 주는 최근 뉴스 개수
+DETAIL_NEWS_LIMIT = 5
+
+# (stock_code, 마지막 체결 시각, 감성 지수 버전) -> 상세 dict, TTL은 같은 틱에서 뉴스가 새로 들어오는 경우를 위한 상한
+stock_detail_cache = TTLCache(maxsize=1024, ttl=10)
+
+# 뉴스/체결가 동시 조회용 스레드 풀 (fork된 자식에서는 부모의 스레드가 없으므로 처음 쓸 때 다시 만듦)
+# 캐시 미스 한 건이 2개를 쓰므로 요청 스레드 수 x 2 정도가 필요함 (configure_detail_executor로 설정)
+_max_workers = 8
+_executor = None
+_executor_lock = threading.Lock()
+
+# 만드는 중인 상세 정보 키 -> Future (같은 키의 동시 미스는 먼저 온 요청의 결과를 기다림)
+_building = {}
+_building_lock = threading.Lock()
+
+
+# 스레드 풀 크기 설정 (create_app에서 GUNICORN_THREADS, DB_POOL_SIZE 기준으로 호출), 이미 만든 풀은 다음에 다시 만듦
+def configure_detail_executor(max_workers):
+    global _max_workers, _executor
+    with _executor_lock:
+        _max_workers = max(int(max_workers), 2)
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=_max_workers, thread_name_prefix='stock-detail')
+        return _executor
+
+
+def _reset_executor_in_child():
+    global _executor, _executor_lock, _building, _building_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+    _building = {}
+    _building_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_executor_in_child)
+
+
+# 종목명 기준 최신 뉴스 (company_news 테이블 활용) - 이 부분은 stock_data나 live_data에 종속되지 않음
+def get_recent_news(stock_name, limit=DETAIL_NEWS_LIMIT):
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                SELECT title, link
+                FROM company_news
+                WHERE stock_name = %s
+                ORDER BY date DESC
+                LIMIT %s
+            """, (stock_name, limit))
+            return [{'title': row['title'], 'link': row['link']} for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+
+def _change_display(price_change):
+    # 등락 부호 (🔺/🔻/🟡) 결정 및 색상 클래스
+    if price_change is None:
+        return '', ''
+    if price_change > 0:
+        return '🔺', 'signal-up'
+    if price_change < 0:
+        return '<span style="color: blue;">🔻</span>', 'signal-down'
+    return '🟡', 'signal-neutral'
+
+
+def build_stock_detail(quote):
+    stock_code, stock_name = quote['stock_code'], quote['stock_name']
+    # 뉴스와 최근 체결가는 서로 다른 커넥션으로 동시에 조회 (응답 시간이 두 왕복의 합이 아니라 긴 쪽 하나)
+    executor = _get_executor()
+    news_future = executor.submit(get_recent_news, stock_name)
+    prices_future = executor.submit(get_recent_stock_prices, stock_code, DETAIL_CHART_POINTS)
+
+    current_price = quote['close_price'] # close_price 별칭으로 기존 코드 유지
+    price_change = quote['price_change']
+    percentage_change = None
+    if price_change is not None and current_price is not None:
+        previous_close = current_price - price_change
+        if previous_close != 0: # 0으로 나누는 것 방지
+            percentage_change = (price_change / previous_close) * 100
+    change_icon, change_color = _change_display(price_change)
+
+    sentiment = stock_sentiment_index.get(stock_code)
+
+    return {
+        'code': stock_code,
+        'name': stock_name,
+        'price': current_price,
+        'price_change': price_change,
+        'percentage_change': percentage_change,
+        'volume': quote['volume'],
+        'signal': f"{sentiment['label']} ({sentiment['score']:.0f}점)" if sentiment and sentiment['score'] is not None else '데이터 없음',
+        'change_icon': change_icon,
+        'change_color_class': change_color,
+        'chart_data': prices_future.result(),
+        'news': news_future.result(),
+        'sentiment': sentiment,   # 점수·비율·이유·7일/30일 변화 (분석 결과가 없으면 None)
+    }
+
+
+# 특정 종목의 상세 정보 (시세가 없는 종목이면 None), 반환되는 dict는 캐시와 공유하므로 수정하면 안 됨
+def get_stock_detail(stock_code):
+    stock_code = str(stock_code).zfill(6) # 코드 형식 맞추기
+    quote = latest_quote_store.get(stock_code)
+    if not quote:
+        return None
+    stock_sentiment_index.refresh_if_stale()   # 키의 버전과 만들 때 읽는 감성 지수가 같도록 먼저 갱신
+    key = (stock_code, quote['date'], quote['time'], stock_sentiment_index.version)
+    detail = stock_detail_cache.get(key)
+    if detail is not None:
+        return detail
+
+    # 같은 키를 동시에 여러 요청이 놓치면 한 요청만 DB를 조회하고 나머지는 그 결과를 기다림
+    with _building_lock:
+        future = _building.get(key)
+        if future is None:
+            # 앞선 요청이 방금 만들어 캐시에 넣고 끝났을 수 있음
+            detail = stock_detail_cache.get(key)
+            if detail is not None:
+                return detail
+            future = _building[key] = Future()
+            is_builder = True
+        else:
+            is_builder = False
+    if not is_builder:
+        return future.result()
+
+    try:
+        detail = build_stock_detail(quote)
+        stock_detail_cache.set(key, detail)
+        future.set_result(detail)
+        return detail
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _building_lock:
+            _building.pop(key, None)
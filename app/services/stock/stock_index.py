@@ -0,0 +1,96 @@
+# app/services/stock/stock_index.py
+# 종목명/종목코드 -> 미리 정렬된 주가·뉴스 구간(slice)을 찾아주는 인덱스
+# 요청마다 전체 프레임을 merge/필터링하지 않고 해당 종목 구간만 잘라서 사용함
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+StockSlice = namedtuple('StockSlice', ['name', 'code', 'price_df', 'news_df'])
+
+
+# 이미 key_column 기준으로 정렬된 프레임에서 값별 [start, stop) 위치를 계산
+def _group_bounds(sorted_df, key_column):
+    if sorted_df.empty:
+        return {}
+    keys = sorted_df[key_column].to_numpy()
+    change_points = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+    starts = np.concatenate(([0], change_points))
+    stops = np.concatenate((change_points, [len(keys)]))
+    return {keys[start]: (int(start), int(stop)) for start, stop in zip(starts, stops)}
+
+
+# 종목명, 날짜 오름차순으로 정렬한 주가 프레임과 종목별 위치 정보
+def build_price_index(stock_data_df):
+    if stock_data_df is None or stock_data_df.empty:
+        return stock_data_df, {}
+    sorted_df = stock_data_df.sort_values(['종목명', '날짜'], kind='stable').reset_index(drop=True)
+    return sorted_df, _group_bounds(sorted_df, '종목명')
+
+
+# 제목/링크가 있는 기사만 남기고 종목명 오름차순, 날짜 내림차순으로 정렬한 뉴스 프레임과 위치 정보
+# (LEFT JOIN 때문에 생기는 뉴스 없는 날짜 행과 중복 기사는 여기서 한 번만 제거)
+def build_news_index(news_data_df):
+    if news_data_df is None or news_data_df.empty:
+        return news_data_df, {}
+    articles_df = news_data_df.dropna(subset=['제목', '링크'])
+    articles_df = articles_df.sort_values(['종목명', '날짜'], ascending=[True, False], kind='stable')
+    articles_df = articles_df.drop_duplicates(subset=['종목명', '제목', '링크']).reset_index(drop=True)
+    return articles_df, _group_bounds(articles_df, '종목명')
+
+
+class StockIndex:
+    """종목명 또는 종목코드로 StockSlice를 O(1)로 찾습니다.
+
+    price_df / news_df는 공유 프레임의 iloc 구간이므로 호출하는 쪽에서 수정하면 안 됩니다.
+    """
+
+    def __init__(self, price_df=None, price_bounds=None, news_df=None, news_bounds=None, code_to_name=None):
+        self.price_df = price_df
+        self.price_bounds = price_bounds or {}
+        self.news_df = news_df
+        self.news_bounds = news_bounds or {}
+        self.code_to_name = code_to_name or {}
+        self.name_to_code = {name: code for code, name in self.code_to_name.items()}
+        # 대문자로 정규화한 종목명 -> 프레임에 저장된 원래 종목명
+        self.folded_names = {str(name).strip().upper(): name for name in list(self.price_bounds) + list(self.news_bounds)}
+
+    # 주식코드 -> 프레임에 저장된 원래 종목명 (구간 키와 같은 값)
+    @staticmethod
+    def code_map(stock_data_df):
+        if stock_data_df is None or stock_data_df.empty:
+            return {}
+        pairs = stock_data_df.loc[:, ['주식코드', '종목명']].drop_duplicates()
+        return dict(zip(pairs['주식코드'].astype(str).str.strip().str.upper(), pairs['종목명']))
+
+    def with_prices(self, stock_data_df):
+        price_df, price_bounds = build_price_index(stock_data_df)
+        return StockIndex(price_df, price_bounds, self.news_df, self.news_bounds, self.code_map(price_df))
+
+    def with_news(self, news_data_df):
+        news_df, news_bounds = build_news_index(news_data_df)
+        return StockIndex(self.price_df, self.price_bounds, news_df, news_bounds, self.code_to_name)
+
+    def resolve_name(self, name_or_code):
+        key = str(name_or_code).strip().upper()
+        if key in self.folded_names:
+            return self.folded_names[key]
+        return self.code_to_name.get(key) or self.code_to_name.get(key.zfill(6))
+
+    def _slice(self, df, bounds, name):
+        if df is None:
+            return pd.DataFrame()
+        start, stop = bounds.get(name, (0, 0))
+        return df.iloc[start:stop]
+
+    def get(self, name_or_code):
+        name = self.resolve_name(name_or_code)
+        if name is None:
+            return None
+        return StockSlice(
+            name=name,
+            code=self.name_to_code.get(name),
+            price_df=self._slice(self.price_df, self.price_bounds, name),
+            news_df=self._slice(self.news_df, self.news_bounds, name),
+        )
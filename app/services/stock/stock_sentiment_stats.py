@@ -0,0 +1,221 @@
+# app/services/stock/stock_sentiment_stats.py
+# stock_sentiment_analysis_results 점수 평균 집계
+# 하루치 행을 모두 가져와 파이썬에서 sum()/len() 하지 않고, (날짜, 종목코드)별 합계·건수를 메모리에 누적해 두고
+# 마지막으로 본 analysis_datetime 이후 행만 DB에서 GROUP BY로 합쳐서 더함
+
+import datetime
+import threading
+import time
+
+from db import get_connection
+from app.services.cache import TTLCache
+
+# 메모리에 합계를 유지하는 기간, 이보다 오래된 구간만 DB에서 집계하고 결과를 캐시함
+RETENTION_DAYS = 90
+
+# 한 분석 배치는 같은 analysis_datetime을 쓰므로, 배치가 들어가는 도중에 조회하면 마지막 시각의 행이 일부만 보일 수 있음
+# 그래서 마지막으로 본 시각(high-water mark)부터 다시 읽고(>=), 그 시각의 합계는 더하지 않고 새 값으로 바꿈
+DELTA_QUERY = """
+    SELECT
+        DATE(analysis_datetime) AS day,
+        stock_code,
+        SUM(stock_sentiment_score) AS score_sum,
+        COUNT(stock_sentiment_score) AS score_count,
+        analysis_datetime AS last_analyzed_at
+    FROM stock_sentiment_analysis_results
+    WHERE analysis_datetime >= %s
+    GROUP BY DATE(analysis_datetime), analysis_datetime, stock_code
+"""
+
+RANGE_QUERY = """
+    SELECT
+        SUM(stock_sentiment_score) AS score_sum,
+        COUNT(stock_sentiment_score) AS score_count
+    FROM stock_sentiment_analysis_results
+    WHERE analysis_datetime >= %s
+      AND analysis_datetime < %s
+      {stock_condition}
+"""
+
+
+def _as_date(value):
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(str(value))
+
+
+class StockSentimentStats:
+    """날짜(범위)와 종목별 평균 감성 점수를 돌려줍니다.
+
+    refresh_interval초가 지난 뒤 처음 읽을 때만 새 분석 행을 조회하므로, 폴링 요청은 대부분 메모리 합계만 읽습니다.
+    """
+
+    def __init__(self, refresh_interval=30):
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._by_stock = {}   # date -> {stock_code: (합계, 건수)}
+        self._by_day = {}     # date -> (합계, 건수), 전체 종목
+        self._high_water_mark = None   # 지금까지 반영한 가장 마지막 analysis_datetime
+        self._boundary = {}   # (date, stock_code) -> high-water mark 시각 행들의 (합계, 건수), 다시 읽을 때 교체용
+        self._checked_at = None
+        self._range_cache = TTLCache(maxsize=512, ttl=3600)   # 보관 기간 시작 전 구간의 조회 결과
+        self.refreshes = 0
+
+    # (day, stock_code, score_sum, score_count, last_analyzed_at) 행을 합계에 더함
+    # high-water mark와 같은 시각의 행은 이전에 더한 값과의 차이만 더하므로 같은 행을 다시 받아도 두 번 세지 않음
+    # 바뀌는 날짜만 복사해서 새 dict로 교체하므로 읽는 쪽은 잠금이 필요 없음
+    def apply(self, rows):
+        by_stock, by_day = dict(self._by_stock), dict(self._by_day)
+        copied_days = set()
+        previous_mark, previous_boundary = self._high_water_mark, self._boundary
+        high_water_mark = previous_mark
+        at_mark = {}   # (date, stock_code, 시각) -> (합계, 건수), 새 high-water mark의 경계 합계 계산용
+        for row in rows:
+            day = _as_date(row['day'])
+            if day not in copied_days:
+                by_stock[day] = dict(by_stock.get(day, {}))
+                copied_days.add(day)
+            score_sum, score_count = float(row['score_sum'] or 0), int(row['score_count'] or 0)
+            last_analyzed_at = row.get('last_analyzed_at')
+            key = (day, row['stock_code'])
+            if last_analyzed_at is not None and last_analyzed_at == previous_mark:
+                # 이미 더한 경계 시각의 합계를 새로 읽은 값으로 교체
+                known_sum, known_count = previous_boundary.get(key, (0.0, 0))
+                added_sum, added_count = score_sum - known_sum, score_count - known_count
+            else:
+                added_sum, added_count = score_sum, score_count
+            stock_sum, stock_count = by_stock[day].get(row['stock_code'], (0.0, 0))
+            by_stock[day][row['stock_code']] = (stock_sum + added_sum, stock_count + added_count)
+            day_sum, day_count = by_day.get(day, (0.0, 0))
+            by_day[day] = (day_sum + added_sum, day_count + added_count)
+            if last_analyzed_at is not None:
+                at_mark[(day, row['stock_code'], last_analyzed_at)] = (score_sum, score_count)
+                if high_water_mark is None or last_analyzed_at > high_water_mark:
+                    high_water_mark = last_analyzed_at
+
+        boundary = dict(previous_boundary) if high_water_mark == previous_mark else {}
+        boundary.update({(day, stock_code): totals for (day, stock_code, analyzed_at), totals in at_mark.items()
+                         if analyzed_at == high_water_mark})
+
+        cutoff = self._retention_start()
+        self._by_stock = {day: stocks for day, stocks in by_stock.items() if day >= cutoff}
+        self._by_day = {day: totals for day, totals in by_day.items() if day >= cutoff}
+        self._high_water_mark = high_water_mark
+        self._boundary = boundary
+        self._checked_at = time.monotonic()
+
+    @staticmethod
+    def _retention_start():
+        return datetime.date.today() - datetime.timedelta(days=RETENTION_DAYS)
+
+    def refresh(self):
+        with self._lock:
+            since = self._high_water_mark
+            if since is None:
+                since = datetime.datetime.combine(self._retention_start(), datetime.time())
+            conn = get_connection()
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(DELTA_QUERY, (since,))
+                    rows = cursor.fetchall()
+            finally:
+                conn.close()
+            self.apply(rows)
+            self.refreshes += 1
+
+    def refresh_if_stale(self):
+        checked_at = self._checked_at
+        if checked_at is not None and time.monotonic() - checked_at < self.refresh_interval:
+            return
+        try:
+            self.refresh()
+        except Exception as e:
+            # 조회 실패 시 지금까지의 합계를 그대로 사용
+            print(f"[ERROR] 종목 감성 점수 집계 갱신 중 오류: {e}")
+            self._checked_at = time.monotonic()
+
+    # 보관 기간 밖의 범위는 DB에서 한 번 집계하고 캐시 (end_date가 보관 기간 시작 전이므로 새 분석 행으로 바뀌지 않음)
+    def _query_range(self, start_date, end_date, stock_code):
+        key = (start_date, end_date, stock_code)
+        cached = self._range_cache.get(key)
+        if cached is not None:
+            return cached
+        sql = RANGE_QUERY.format(stock_condition='AND stock_code = %s' if stock_code else '')
+        params = [datetime.datetime.combine(start_date, datetime.time()),
+                  datetime.datetime.combine(end_date + datetime.timedelta(days=1), datetime.time())]
+        if stock_code:
+            params.append(stock_code)
+        conn = get_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(sql, params)
+                row = cursor.fetchone() or {}
+        finally:
+            conn.close()
+        totals = (float(row.get('score_sum') or 0), int(row.get('score_count') or 0))
+        self._range_cache.set(key, totals)
+        return totals
+
+    # 메모리에 있는 날짜별 합계를 start_date ~ end_date(포함) 동안 더함
+    def _memory_totals(self, start_date, end_date, stock_code):
+        by_stock, by_day = self._by_stock, self._by_day
+        score_sum, score_count = 0.0, 0
+        day = start_date
+        while day <= end_date:
+            if stock_code:
+                day_sum, day_count = by_stock.get(day, {}).get(stock_code, (0.0, 0))
+            else:
+                day_sum, day_count = by_day.get(day, (0.0, 0))
+            score_sum += day_sum
+            score_count += day_count
+            day += datetime.timedelta(days=1)
+        return score_sum, score_count
+
+    # start_date ~ end_date(포함)의 (합계, 건수), stock_code가 없으면 전체 종목
+    # 보관 기간 시작 전 구간은 DB 집계(캐시), 그 이후 구간은 메모리 합계를 더함
+    def totals(self, start_date, end_date=None, stock_code=None):
+        start_date = _as_date(start_date)
+        end_date = _as_date(end_date) if end_date else start_date
+        if end_date < start_date:
+            start_date, end_date = end_date, start_date
+        # 미래 날짜에는 분석 결과가 없으므로 오늘까지만 더함
+        end_date = min(end_date, datetime.date.today())
+        if end_date < start_date:
+            return 0.0, 0
+
+        self.refresh_if_stale()
+        retention_start = self._retention_start()
+        score_sum, score_count = 0.0, 0
+        if start_date < retention_start:
+            db_end = min(end_date, retention_start - datetime.timedelta(days=1))
+            score_sum, score_count = self._query_range(start_date, db_end, stock_code)
+            start_date = retention_start
+        if start_date <= end_date:
+            memory_sum, memory_count = self._memory_totals(start_date, end_date, stock_code)
+            score_sum += memory_sum
+            score_count += memory_count
+        return score_sum, score_count
+
+    # 평균 점수 (해당 기간에 분석 결과가 없으면 None)
+    def average(self, start_date, end_date=None, stock_code=None):
+        score_sum, score_count = self.totals(start_date, end_date, stock_code)
+        return score_sum / score_count if score_count else None
+
+    # 분석 결과가 있는 가장 최근 날짜 (메모리 보관 기간 안에서, 없으면 None)
+    def latest_day(self):
+        self.refresh_if_stale()
+        return max(self._by_day) if self._by_day else None
+
+    def stats(self):
+        return {
+            'days': len(self._by_day),
+            'high_water_mark': str(self._high_water_mark) if self._high_water_mark else None,
+            'refreshes': self.refreshes,
+            'refresh_interval': self.refresh_interval,
+            'range_cache': self._range_cache.stats(),
+        }
+
+
+stock_sentiment_stats = StockSentimentStats()
@@ -2,8 +2,57 @@
 // Global Functions (setupAutocomplete 외부에 정의하여 전역적으로 사용 가능)
 // ----------------------------------------------------------------------
 
+// 현재 화면에 그려진 관심주 목록 (추가/삭제 응답의 delta를 여기에 반영해서 다시 그림)
+let favoriteStocks = [];
+// 서버에서 전체 목록을 한 번이라도 받았는지 (받기 전에는 delta를 반영할 기준 목록이 없음)
+let favoriteStocksLoaded = false;
+
+// 관심주 전체 목록을 서버에서 받아 다시 그림
+function loadFavoriteStocks() {
+    return fetch('/prefer_stock', {
+        method: 'GET',
+        headers: { 'X-Requested-With': 'XMLHttpRequest' }
+    })
+    .then(response => {
+        if (!response.ok) {
+            return response.json().then(errorData => {
+                throw new Error(errorData.error || '관심주를 불러오지 못했습니다.');
+            });
+        }
+        return response.json();
+    })
+    .then(data => {
+        if (data.success && data.stock_display) {
+            favoriteStocksLoaded = true;
+            renderStockList(data.stock_display);
+        } else {
+            console.error("관심주 로드 실패:", data.error || "알 수 없는 오류");
+        }
+    })
+    .catch(error => {
+        console.error("관심주를 불러오는 중 네트워크 오류:", error);
+    });
+}
+
+// 추가/삭제 응답의 변경분만 기존 목록에 반영 (서버는 전체 목록을 다시 보내지 않음)
+function applyFavoriteDelta(added, removedCode) {
+    // 전체 목록을 아직 받지 못했으면(요청 중이거나 실패) delta 대신 전체 목록을 다시 받음
+    if (!favoriteStocksLoaded) {
+        loadFavoriteStocks();
+        return;
+    }
+    if (removedCode) {
+        favoriteStocks = favoriteStocks.filter(stock => stock.code !== removedCode);
+    }
+    if (added && !favoriteStocks.some(stock => stock.code === added.code)) {
+        favoriteStocks = favoriteStocks.concat([added]);
+    }
+    renderStockList(favoriteStocks);
+}
+
 // 관심주 목록 갱신 함수 (초기 렌더링 및 AJAX 업데이트 시 사용)
 function renderStockList(stockArr) {
+    favoriteStocks = stockArr || [];
     const tableBody = document.querySelector(".fav-table tbody");
     if (!tableBody) {
         console.warn("renderStockList: 테이블 body 요소를 찾을 수 없습니다.");
@@ -66,7 +115,7 @@ function deleteStock(stockCode) {
     .then(data => {
         if (data.success) {
             alert("선호 주식이 삭제되었습니다.");
-            renderStockList(data.stock_display);
+            applyFavoriteDelta(null, data.removed || String(stockCode).padStart(6, '0'));
             // 삭제 후 상세 패널이 해당 종목을 보여주고 있었다면 숨김
             const detailPanel = document.getElementById('stockDetailPanel');
             // detailStockName이 존재하고, 그 안에 삭제된 종목 코드가 포함되어 있다면 숨김
@@ -128,7 +177,7 @@ function setupAutocomplete(inputId, listId, apiUrl) {
 
             if (data.success) {
                 alert("관심주가 성공적으로 추가되었습니다.");
-                renderStockList(data.stock_display);
+                applyFavoriteDelta(data.added, null);
                 searchInput.value = "";
                 codeInput.value = "";
             } else {
@@ -6,6 +6,11 @@ document.addEventListener("DOMContentLoaded", () => {
     const listUL = document.getElementById("prefer-stock-list");
 
     let selectedIndex = -1;
+    // 현재 화면의 선호주식 목록 (추가/삭제 응답의 delta를 반영)
+    let currentStocks = Array.from(listUL.querySelectorAll("li[data-stock-code]")).map(li => ({
+        name: li.getAttribute("data-stock-name"),
+        code: li.getAttribute("data-stock-code")
+    }));
 
     // 자동완성 기능
     input.addEventListener("input", () => {
@@ -74,7 +79,10 @@ document.addEventListener("DOMContentLoaded", () => {
             if(data.success){
                 input.value = "";
                 codeInput.value = "";
-                renderStockList(data.stock_display);
+                if (data.added && !currentStocks.some(stock => stock.code === data.added.code)) {
+                    currentStocks = currentStocks.concat([data.added]);
+                }
+                renderStockList(currentStocks);
             } else {
                 alert(data.error || "등록에 실패했습니다.");
             }
@@ -93,7 +101,9 @@ document.addEventListener("DOMContentLoaded", () => {
             .then(res => res.json())
             .then(data => {
                 if(data.success){
-                    renderStockList(data.stock_display);
+                    const removedCode = data.removed || stockcode;
+                    currentStocks = currentStocks.filter(stock => stock.code !== removedCode);
+                    renderStockList(currentStocks);
                 } else {
                     alert("삭제에 실패했습니다.");
                 }
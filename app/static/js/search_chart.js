@@ -42,14 +42,61 @@ document.addEventListener('DOMContentLoaded', function () {
         return date >= thirtyDaysAgo && date <= today;
     });
 
+    renderPriceChart(filteredData, stockNameForChart, '1m');
+    setupChartRangeButtons(stockNameForChart, filteredData);
+});
+
+// 기간 버튼: 1개월은 페이지에 들어 있는 데이터, 그 이상은 /api/price_history에서 받아서 다시 그림
+// (메모리 기간보다 오래된 구간은 서버에서 종목별로 조회·캐시함)
+function setupChartRangeButtons(stockNameForChart, initialData) {
+    const buttons = document.querySelectorAll('#chartRangeButtons .chart-range-button');
+    const loaded = { '1m': initialData };
+
+    buttons.forEach(button => {
+        button.addEventListener('click', function () {
+            const range = button.dataset.range;
+            buttons.forEach(other => other.classList.toggle('active', other === button));
+            if (loaded[range]) {
+                renderPriceChart(loaded[range], stockNameForChart, range);
+                return;
+            }
+            fetch(`/api/price_history?company_name=${encodeURIComponent(stockNameForChart)}&range=${range}`)
+                .then(response => response.json())
+                .then(result => {
+                    if (result.error) {
+                        console.error("기간 주가 조회 오류:", result.error);
+                        return;
+                    }
+                    loaded[range] = result.data || [];
+                    renderPriceChart(loaded[range], stockNameForChart, range);
+                })
+                .catch(error => console.error("기간 주가 조회 오류:", error));
+        });
+    });
+}
+
+let priceChart = null;
+
+function renderPriceChart(filteredData, stockNameForChart, range) {
+    const chartContainer = document.getElementById('chart-container');
+
     if (!Array.isArray(filteredData) || filteredData.length < 2) {
         console.log("Too few price data points to render chart.");
+        if (priceChart) {
+            priceChart.destroy();
+            priceChart = null;
+        }
         if (chartContainer) {
             chartContainer.innerHTML = '<p>해당 종목의 주가 데이터가 너무 적습니다.</p>';
         }
         return;
     }
 
+    // 데이터 부족 메시지로 바뀌었던 경우 캔버스를 다시 만듦
+    if (chartContainer && !document.getElementById('stockChart')) {
+        chartContainer.innerHTML = '<canvas id="stockChart"></canvas>';
+    }
+
     // 📌 빠진 날짜 보간 (forward fill)
     const filledData = forwardFillMissingDates(filteredData);
 
@@ -59,7 +106,10 @@ document.addEventListener('DOMContentLoaded', function () {
 
     const ctx = document.getElementById('stockChart').getContext('2d');
 
-    new Chart(ctx, {
+    if (priceChart) {
+        priceChart.destroy();
+    }
+    priceChart = new Chart(ctx, {
         type: 'line',
         data: {
             labels: labels,
@@ -78,7 +128,7 @@ document.addEventListener('DOMContentLoaded', function () {
                 x: {
                     type: 'time',
                     time: {
-                        unit: 'day',
+                        unit: (range === '1y' || range === '3y') ? 'month' : 'day',
                         tooltipFormat: 'yyyy-MM-dd',
                         displayFormats: {
                             month: 'yyyy년 MM월'
@@ -115,7 +165,7 @@ document.addEventListener('DOMContentLoaded', function () {
             }
         }
     });
-});
+}
 
 /**
  * 📌 누락된 날짜를 이전 값으로 보간해주는 함수
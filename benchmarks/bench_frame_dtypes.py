@@ -0,0 +1,46 @@
+# 시장 데이터 프레임 메모리 벤치마크: 드라이버가 돌려준 dtype 그대로(기존) vs compact_frame (category / int32 / uint32)
+# 실행: python -m benchmarks.bench_frame_dtypes  (DB 없이 합성 행 사용, 3개월과 1년 기간 비교)
+
+import pandas as pd
+
+from app.services.stock.data_loader import compact_frame, frame_memory_report, STOCK_VOLUME_COLUMNS
+from benchmarks.bench_frame_snapshot import make_rows
+
+
+# 기존 로더와 같은 처리 (compact_frame 없이, 거래량 프레임은 복사)
+def legacy_frames(stock_rows, news_rows):
+    stock_data_df = pd.DataFrame(stock_rows)
+    stock_data_df['날짜'] = pd.to_datetime(stock_data_df['날짜'])
+    stock_volume_df = stock_data_df.loc[:, STOCK_VOLUME_COLUMNS].copy()
+    news_data_df = pd.DataFrame(news_rows)
+    news_data_df['날짜'] = pd.to_datetime(news_data_df['날짜'])
+    return stock_data_df, stock_volume_df, news_data_df
+
+
+def compact_frames(stock_rows, news_rows):
+    stock_data_df, _, news_data_df = legacy_frames(stock_rows, news_rows)
+    stock_data_df = compact_frame(stock_data_df)
+    return stock_data_df, stock_data_df.loc[:, STOCK_VOLUME_COLUMNS], compact_frame(news_data_df)
+
+
+def mb(df):
+    return frame_memory_report(df)['memory_bytes'] / 1024 / 1024
+
+
+def main():
+    print(f"{'window':>7} {'rows':>8} {'frame':>13} {'legacy(MB)':>11} {'compact(MB)':>12}")
+    for label, n_days in (('3m', 92), ('1y', 366)):
+        stock_rows, news_rows = make_rows(2500, n_days)
+        legacy = legacy_frames(stock_rows, news_rows)
+        compact = compact_frames(stock_rows, news_rows)
+        for name, legacy_df, compact_df in zip(('stock_data', 'stock_volume', 'news_data'), legacy, compact):
+            # 거래량 프레임은 compact 쪽에서 stock_data의 컬럼을 공유하므로 추가 메모리가 없음
+            compact_mb = 0.0 if name == 'stock_volume' else mb(compact_df)
+            print(f"{label:>7} {len(stock_rows):>8} {name:>13} {mb(legacy_df):>11.1f} {compact_mb:>12.1f}")
+        legacy_total = sum(mb(df) for df in legacy)
+        compact_total = mb(compact[0]) + mb(compact[2])
+        print(f"{label:>7} {len(stock_rows):>8} {'total':>13} {legacy_total:>11.1f} {compact_total:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# 시작 시 시장 데이터 로드 벤치마크: DB에서 3개월치 전체 조회(기존) vs 로컬 컬럼 스냅샷 + 하루치 증분
+# 실행: python -m benchmarks.bench_frame_snapshot  (DB 없이 합성 행 사용)
+# 기존 방식의 "조회"는 드라이버가 행마다 dict를 만드는 비용만 흉내 내므로 실제 DB에서는 네트워크/서버 비용이 더해짐
+# 최대 메모리는 tracemalloc 기준, 스냅샷 배열은 merge_delta에서 복사되므로 그 복사본까지 포함됨
+# (줄어드는 양은 행 dict를 만들지 않기 때문이며 memory-map 때문이 아님)
+
+import datetime
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from app.services.stock.frame_snapshot import save_frame_snapshot, load_frame_snapshot, snapshot_high_water_mark
+from app.services.stock.data_loader import compact_frame
+from app.services.stock.market_data_store import merge_delta
+
+
+def make_rows(n_stocks, n_days, seed=0):
+    rng = np.random.default_rng(seed)
+    today = datetime.date.today()
+    days = [today - datetime.timedelta(days=offset) for offset in range(n_days - 1, -1, -1)]
+    closes = rng.integers(1_000, 500_000, (n_stocks, n_days))
+    volumes = rng.integers(1_000, 10_000_000, (n_stocks, n_days))
+    stock_rows, news_rows = [], []
+    for i in range(n_stocks):
+        name, code = f'종목{i:04d}', f'{i:06d}'
+        for j, day in enumerate(days):
+            close = int(closes[i, j])
+            stock_rows.append({'종목명': name, '주식코드': code, '날짜': day, '시가': close, '종가': close,
+                               '전일비': int(closes[i, j] - closes[i, j - 1]) if j else 0, '거래량': int(volumes[i, j])})
+            has_news = (i + j) % 3 == 0
+            news_rows.append({'종목명': name, '주식코드': code, '날짜': day,
+                              '제목': f'{name} {day} 주요 공시와 실적 전망 기사 제목' if has_news else None,
+                              '링크': f'https://news.example.com/{code}/{day:%Y%m%d}' if has_news else None})
+    return stock_rows, news_rows
+
+
+# stock_data_db / news_data_db가 fetchall() 결과로 하는 것과 같은 처리
+def frame_from_rows(rows):
+    df = pd.DataFrame(rows)
+    df['날짜'] = pd.to_datetime(df['날짜'], errors='coerce')
+    df.dropna(subset=['날짜'], inplace=True)
+    df['종목명'] = df['종목명'].astype(str).str.strip().str.upper()
+    return compact_frame(df)
+
+
+# 시간은 tracemalloc 없이 재고(추적 비용이 할당 수에 비례해서 붙음), 최대 메모리는 따로 한 번 더 실행해서 잼
+def measure(fn):
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds * 1000, peak / 1024 / 1024
+
+
+def main():
+    print(f"{'dataset':>10} {'rows':>8} {'db(ms)':>8} {'db peak(MB)':>12} {'snap(ms)':>9} {'snap peak(MB)':>14} {'save(ms)':>9}")
+    for n_stocks in (500, 2500):
+        stock_rows, news_rows = make_rows(n_stocks, n_days=92)
+        today = datetime.date.today()
+        for name, rows in (('stock_data', stock_rows), ('news_data', news_rows)):
+            # 기존: 3개월치 행 dict 전체를 받아 프레임 생성 (dict 생성 비용도 포함하기 위해 복사본을 만듦)
+            full_df, db_ms, db_peak = measure(lambda: frame_from_rows([dict(row) for row in rows]))
+            delta_rows = [row for row in rows if row['날짜'] >= today]
+
+            with tempfile.TemporaryDirectory() as root_dir:
+                save_start = time.perf_counter()
+                save_frame_snapshot(full_df, root_dir, name, full_df['날짜'].max())
+                save_ms = (time.perf_counter() - save_start) * 1000
+
+                def from_snapshot():
+                    snapshot_df, manifest = load_frame_snapshot(root_dir, name, expected_columns=list(full_df.columns))
+                    delta_df = frame_from_rows([dict(row) for row in delta_rows])
+                    return compact_frame(merge_delta(snapshot_df, delta_df, snapshot_high_water_mark(manifest)))
+
+                snap_df, snap_ms, snap_peak = measure(from_snapshot)
+            assert len(snap_df) == len(merge_delta(full_df, None, full_df['날짜'].max()))
+            print(f"{name:>10} {len(rows):>8} {db_ms:>8.0f} {db_peak:>12.1f} {snap_ms:>9.0f} {snap_peak:>14.1f} {save_ms:>9.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+# 자동완성 벤치마크: DataFrame str.contains 전체 스캔(기존) vs StockSearchIndex
+# 실행: python -m benchmarks.bench_search_index  (DB 없이 합성 종목 리스트 사용)
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.services.stock.search_index import StockSearchIndex
+
+SYLLABLES = list('삼성전자현대차기아카카오네이버엘지화학에스케이하이닉스포스코셀트리온한화롯데신한금융바이오')
+
+
+def make_stock_list(n_stocks, seed=0):
+    rng = np.random.default_rng(seed)
+    names = set()
+    while len(names) < n_stocks:
+        names.add(''.join(rng.choice(SYLLABLES, rng.integers(2, 7))))
+    return pd.DataFrame({'종목명': sorted(names), '주식코드': [f'{i:06d}' for i in range(n_stocks)]})
+
+
+def contains_scan(stock_list, query):
+    filtered = stock_list[
+        stock_list['종목명'].str.contains(query, case=False, na=False) |
+        stock_list['주식코드'].str.contains(query, case=False, na=False)
+    ]
+    return filtered[['종목명', '주식코드']].drop_duplicates().to_dict(orient='records')[:10]
+
+
+def percentiles(fn, queries, rounds=20):
+    samples = []
+    for _ in range(rounds):
+        for query in queries:
+            start = time.perf_counter()
+            fn(query)
+            samples.append((time.perf_counter() - start) * 1000)
+    return np.percentile(samples, 50), np.percentile(samples, 99)
+
+
+def main():
+    queries = ['삼', '삼성', '전자', '00593', 'ㅅㅅ', '하이닉', '바이오', 'ＳＫ', '없는종목']
+    print(f"{'stocks':>7} {'scan p50':>9} {'scan p99':>9} {'index p50':>10} {'index p99':>10}  (ms)")
+    for n_stocks in (500, 2500, 10000):
+        stock_list = make_stock_list(n_stocks)
+        build_start = time.perf_counter()
+        index = StockSearchIndex(stock_list)
+        build_ms = (time.perf_counter() - build_start) * 1000
+        scan_p50, scan_p99 = percentiles(lambda q: contains_scan(stock_list, q), queries, rounds=3)
+        index_p50, index_p99 = percentiles(lambda q: index.search(q, 10), queries)
+        print(f"{n_stocks:>7} {scan_p50:>9.3f} {scan_p99:>9.3f} {index_p50:>10.4f} {index_p99:>10.4f}  (build {build_ms:.0f}ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+# 평균 감성 점수 폴링 벤치마크: 하루치 행 전체 전송 + sum()/len()(기존) vs StockSentimentStats 누적 합계
+# 실행: python -m benchmarks.bench_sentiment_stats  (DB 없이 합성 분석 결과 사용)
+# 기존 방식의 "전송"은 드라이버가 행마다 dict를 만드는 비용만 흉내 내므로 실제 DB에서는 네트워크 비용이 더해짐
+
+import datetime
+import time
+
+import numpy as np
+
+from app.services.stock.stock_sentiment_stats import StockSentimentStats
+
+
+def make_scores(n_rows, n_stocks, seed=0):
+    rng = np.random.default_rng(seed)
+    codes = np.array([f'{i:06d}' for i in range(n_stocks)])
+    return codes[rng.integers(0, n_stocks, n_rows)], rng.uniform(0, 100, n_rows)
+
+
+def row_transfer_average(codes, scores):
+    # fetchall()이 돌려주는 것과 같은 행 dict 목록을 매번 만든 뒤 평균
+    rows = [{'stock_code': code, 'stock_sentiment_score': score} for code, score in zip(codes.tolist(), scores.tolist())]
+    return sum(row['stock_sentiment_score'] for row in rows) / len(rows) if rows else None
+
+
+def grouped_rows(day, codes, scores):
+    # DELTA_QUERY(GROUP BY 날짜, 종목코드) 결과와 같은 형태
+    order = np.argsort(codes, kind='stable')
+    sorted_codes, sorted_scores = codes[order], scores[order]
+    unique_codes, starts = np.unique(sorted_codes, return_index=True)
+    sums = np.add.reduceat(sorted_scores, starts)
+    counts = np.diff(np.append(starts, len(sorted_codes)))
+    last_analyzed_at = datetime.datetime.combine(day, datetime.time(15, 30))
+    return [
+        {'day': day, 'stock_code': code, 'score_sum': float(score_sum), 'score_count': int(count), 'last_analyzed_at': last_analyzed_at}
+        for code, score_sum, count in zip(unique_codes.tolist(), sums, counts)
+    ]
+
+
+def percentiles(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return np.percentile(samples, 50), np.percentile(samples, 99)
+
+
+def main():
+    today = datetime.date.today()
+    print(f"{'rows/day':>9} {'transfer p50':>13} {'transfer p99':>13} {'stats p50':>10} {'stats p99':>10} {'apply(ms)':>10}")
+    for n_rows in (10_000, 100_000, 500_000):
+        codes, scores = make_scores(n_rows, 2500)
+        stats = StockSentimentStats(refresh_interval=3600)
+        delta_rows = grouped_rows(today, codes, scores)
+        apply_start = time.perf_counter()
+        stats.apply(delta_rows)
+        apply_ms = (time.perf_counter() - apply_start) * 1000
+
+        expected = row_transfer_average(codes, scores)
+        assert abs(stats.average(today) - expected) < 1e-6
+
+        transfer_p50, transfer_p99 = percentiles(lambda: row_transfer_average(codes, scores), rounds=5)
+        stats_p50, stats_p99 = percentiles(lambda: (stats.average(today), stats.average(today, stock_code='000100')), rounds=200)
+        print(f"{n_rows:>9} {transfer_p50:>13.2f} {transfer_p99:>13.2f} {stats_p50:>10.4f} {stats_p99:>10.4f} {apply_ms:>10.1f}  (ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+# 관심 종목 상세(/api/stock_detail) 벤치마크: 뉴스 → 체결가 순차 조회(기존) vs 동시 조회 vs (종목, 마지막 틱) 캐시
+# 실행: python -m benchmarks.bench_stock_detail  (DB 없이 왕복마다 RTT_MS만큼 기다리는 가짜 커넥션 사용)
+# 실제 DB에서는 쿼리 실행 시간이 더해지므로 동시 조회로 줄어드는 시간은 더 커짐
+# p99는 스레드 스케줄링에 따라 실행마다 크게 흔들리므로 RUNS번 실행한 값의 중앙값과 범위를 함께 출력
+
+import datetime
+import time
+
+import numpy as np
+
+from app.services.stock import chart_utils, latest_quote, sentiment_index, stock_detail
+
+RTT_MS = 2.0
+RUNS = 7
+N_STOCKS = 200
+
+
+class FakeCursor:
+    def __init__(self, quotes):
+        self._quotes = quotes
+        self._rows = []
+
+    def execute(self, sql, args=None):
+        time.sleep(RTT_MS / 1000)
+        if 'FROM company_news' in sql:
+            self._rows = [{'title': f'{args[0]} 뉴스 {i}', 'link': f'https://news.example.com/{i}'} for i in range(args[1])]
+        elif 'SELECT execution_price' in sql:
+            self._rows = [{'execution_price': 10_000 + i} for i in range(args[1])]
+        elif 'FROM stock_sentiment' in sql:
+            self._rows = make_sentiment_rows(self._quotes) if 'date >=' in sql else []
+        else:
+            self._rows = list(self._quotes)
+        return len(self._rows)
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeConnection:
+    def __init__(self, quotes):
+        self._quotes = quotes
+
+    def cursor(self):
+        return FakeCursor(self._quotes)
+
+    def close(self):
+        pass
+
+
+def make_quotes(n_stocks):
+    now = datetime.datetime.now()
+    return [
+        {'stock_code': f'{i:06d}', 'stock_name': f'종목{i:04d}', 'execution_price': 10_000 + i,
+         'price_change': (i % 3) - 1, 'volume': 1_000 + i, 'date': now.date(), 'time': now.time()}
+        for i in range(n_stocks)
+    ]
+
+
+# 종목마다 오늘 분석된 stock_sentiment 한 행
+def make_sentiment_rows(quotes):
+    analyzed_at = datetime.datetime.combine(datetime.date.today(), datetime.time(9))
+    return [
+        {'stock_code': quote['stock_code'], 'score': float(i % 100), 'reason': '#합성', 'positive': 6, 'negative': 3,
+         'neutral': 1, 'date': analyzed_at}
+        for i, quote in enumerate(quotes)
+    ]
+
+
+# 기존 get_stock_detail_db와 같은 순서: 뉴스 조회가 끝난 뒤 체결가 조회
+def sequential_detail(stock_code):
+    quote = latest_quote.latest_quote_store.get(stock_code)
+    return stock_detail.get_recent_news(quote['stock_name']), chart_utils.get_recent_stock_prices(stock_code, stock_detail.DETAIL_CHART_POINTS)
+
+
+def percentiles(fn, codes, rounds=3):
+    samples = []
+    for _ in range(rounds):
+        for code in codes:
+            start = time.perf_counter()
+            fn(code)
+            samples.append((time.perf_counter() - start) * 1000)
+    return np.percentile(samples, 50), np.percentile(samples, 99)
+
+
+def main():
+    quotes = make_quotes(N_STOCKS)
+    fake_connection = lambda: FakeConnection(quotes)
+    for module in (chart_utils, latest_quote, sentiment_index, stock_detail):
+        module.get_connection = fake_connection
+    for store in (latest_quote.latest_quote_store, sentiment_index.stock_sentiment_index):
+        store.refresh_interval = 3600
+        store.refresh()
+    codes = [quote['stock_code'] for quote in quotes]
+
+    def parallel_detail(code):
+        return stock_detail.build_stock_detail(latest_quote.latest_quote_store.get(code))
+
+    stock_detail.stock_detail_cache.ttl = None
+    stock_detail.stock_detail_cache.maxsize = N_STOCKS
+    for code in codes:
+        stock_detail.get_stock_detail(code)
+
+    modes = (('sequential', sequential_detail), ('parallel', parallel_detail), ('cached', stock_detail.get_stock_detail))
+    results = {label: [] for label, _ in modes}
+    # 모드를 번갈아 실행해서 실행 시점의 부하가 한 모드에만 몰리지 않게 함
+    for _ in range(RUNS):
+        for label, fn in modes:
+            results[label].append(percentiles(fn, codes))
+
+    print(f"RTT {RTT_MS}ms, {N_STOCKS} stocks, {RUNS} runs (median of runs, p99 min-max)")
+    print(f"{'mode':>11} {'p50(ms)':>8} {'p99(ms)':>8} {'p99 range(ms)':>16}")
+    for label, _ in modes:
+        p50s, p99s = zip(*results[label])
+        print(f"{label:>11} {np.median(p50s):>8.3f} {np.median(p99s):>8.3f} {min(p99s):>7.3f}-{max(p99s):<8.3f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# 종목 검색 분석 경로 벤치마크: 전체 merge + 불리언 필터(기존) vs StockIndex 구간 조회
+# 실행: python -m benchmarks.bench_stock_index  (DB 없이 합성 데이터 사용)
+
+import contextlib
+import io
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.services.stock.data_loader import analyze_stock_data, analyze_stock_slice
+from app.services.stock.stock_index import StockIndex
+
+
+def make_frames(n_stocks, n_days=63, news_ratio=0.3, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=n_days)
+    names = [f'종목{i:05d}' for i in range(n_stocks)]
+    codes = [f'{i:06d}' for i in range(n_stocks)]
+    stock_df = pd.DataFrame({
+        '종목명': np.repeat(names, n_days),
+        '주식코드': np.repeat(codes, n_days),
+        '날짜': np.tile(dates, n_stocks),
+        '시가': rng.integers(1000, 100000, n_stocks * n_days),
+        '종가': rng.integers(1000, 100000, n_stocks * n_days),
+        '전일비': rng.integers(-500, 500, n_stocks * n_days),
+        '거래량': rng.integers(1000, 10_000_000, n_stocks * n_days),
+    })
+    has_news = rng.random(len(stock_df)) < news_ratio
+    news_df = stock_df[['종목명', '주식코드', '날짜']].copy()
+    news_df['제목'] = np.where(has_news, '뉴스 제목 ' + news_df.index.astype(str), None)
+    news_df['링크'] = np.where(has_news, 'http://news/' + news_df.index.astype(str), None)
+    return stock_df, news_df
+
+
+def timeit(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn()
+        samples.append(time.perf_counter() - start)
+    return np.median(samples) * 1000
+
+
+def main():
+    print(f"{'stocks':>8} {'rows':>10} {'merge+scan(ms)':>15} {'index(ms)':>10} {'speedup':>8}")
+    for n_stocks in (100, 500, 2000):
+        stock_df, news_df = make_frames(n_stocks)
+        target = f'종목{n_stocks // 2:05d}'
+        index = StockIndex().with_prices(stock_df).with_news(news_df)
+
+        def before():
+            merged = pd.merge(stock_df, news_df, on=['종목명', '날짜'], how='left')
+            analyze_stock_data(merged, target)
+
+        def after():
+            analyze_stock_slice(index.get(target))
+
+        before_ms = timeit(before, 5)
+        after_ms = timeit(after, 50)
+        print(f"{n_stocks:>8} {len(stock_df):>10} {before_ms:>15.2f} {after_ms:>10.3f} {before_ms / after_ms:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# 주가 로더 최대 메모리 벤치마크: fetchall()로 dict 행 전체를 받은 뒤 프레임 생성(기존) vs 서버 측 커서 청크 스트리밍
+# 실행: python -m benchmarks.bench_streaming_loader  (DB 없이 행을 하나씩 만들어 주는 가짜 커서 사용)
+# 최대 메모리는 tracemalloc 기준, 드라이버가 받은 행을 들고 있는 양만 비교하므로 네트워크 버퍼는 포함되지 않음
+
+import contextlib
+import datetime
+import time
+import tracemalloc
+
+import pandas as pd
+
+from app.services.stock.data_loader import compact_frame, stream_query_frame, STOCK_DATA_COLUMNS
+
+
+def generate_rows(n_stocks, n_days):
+    today = datetime.date.today()
+    for i in range(n_stocks):
+        name, code = f'종목{i:04d}', f'{i:06d}'
+        for offset in range(n_days - 1, -1, -1):
+            price = 10_000 + (i * 37 + offset * 11) % 90_000
+            yield (name, code, today - datetime.timedelta(days=offset), price, price, offset % 200 - 100, 1_000 + i * offset)
+
+
+class FakeStreamingCursor:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def execute(self, sql, params=None):
+        pass
+
+    def fetchmany(self, size):
+        return [row for _, row in zip(range(size), self._rows)]
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self._rows = rows
+
+    @contextlib.contextmanager
+    def cursor(self, cursorclass=None):
+        yield FakeStreamingCursor(self._rows)
+
+
+# 기존 stock_data_db: DictCursor로 fetchall() 후 프레임 생성
+def buffered_load(n_stocks, n_days):
+    rows = [dict(zip(STOCK_DATA_COLUMNS, row)) for row in generate_rows(n_stocks, n_days)]
+    df = pd.DataFrame(rows)
+    df['날짜'] = pd.to_datetime(df['날짜'], errors='coerce')
+    df['종목명'] = df['종목명'].astype(str).str.strip().str.upper()
+    return compact_frame(df)
+
+
+def streaming_load(n_stocks, n_days, chunk_size):
+    conn = FakeConnection(generate_rows(n_stocks, n_days))
+    with contextlib.redirect_stdout(None):
+        return stream_query_frame(conn, '', (), STOCK_DATA_COLUMNS, chunk_size, label='bench')
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    df = fn()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result_mb = df.memory_usage(index=True, deep=True).sum() / 1024 / 1024
+    return len(df), peak / 1024 / 1024, result_mb, seconds
+
+
+def main():
+    print(f"{'window':>7} {'loader':>16} {'rows':>8} {'peak(MB)':>9} {'frame(MB)':>10} {'seconds':>8}")
+    for label, n_days in (('3m', 92), ('1y', 366)):
+        runs = [('fetchall', lambda: buffered_load(2500, n_days))]
+        runs += [(f'stream {chunk_size}', lambda chunk_size=chunk_size: streaming_load(2500, n_days, chunk_size))
+                 for chunk_size in (10_000, 50_000)]
+        for name, fn in runs:
+            rows, peak_mb, result_mb, seconds = measure(fn)
+            print(f"{label:>7} {name:>16} {rows:>8} {peak_mb:>9.1f} {result_mb:>10.1f} {seconds:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,15 +1,279 @@
 # db.py
+import os
+import threading
+import time
+from collections import deque
+
 import pymysql
 
+DB_CONFIG = {
+    'host': 'localhost',
+    'user': 'root',
+    'password': '12tlswogy',
+    'db': 'member_db',
+    'charset': 'utf8mb4',
+    'cursorclass': pymysql.cursors.DictCursor,
+}
+
+# 커넥션 풀 기본값 (app/config.py의 DB_POOL_* 설정으로 덮어씀)
+POOL_DEFAULTS = {
+    'DB_POOL_SIZE': 10,             # 동시에 열 수 있는 최대 커넥션 수
+    'DB_POOL_TIMEOUT': 10,          # 풀이 가득 찼을 때 대기할 최대 시간(초)
+    'DB_POOL_IDLE_TIMEOUT': 300,    # 이 시간(초) 이상 놀고 있던 커넥션은 폐기
+    'DB_POOL_MAX_LIFETIME': 1800,   # 생성 후 이 시간(초)이 지난 커넥션은 폐기
+    'DB_POOL_PING_ON_BORROW': True, # 대여 시 ping으로 살아있는지 확인
+}
+
+
+class PoolTimeoutError(pymysql.err.OperationalError):
+    """풀이 가득 차서 DB_POOL_TIMEOUT 안에 커넥션을 빌리지 못했을 때 발생"""
+
+
+class PooledConnection:
+    """pymysql 커넥션을 감싸는 래퍼. close() 하면 실제로 닫지 않고 풀에 반납합니다."""
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+
+    def close(self):
+        if self._raw is not None:
+            raw, self._raw = self._raw, None
+            self._pool._release(raw)
+
+    def __getattr__(self, name):
+        if self._raw is None:
+            raise pymysql.err.InterfaceError(0, '이미 풀에 반납된 커넥션입니다.')
+        return getattr(self._raw, name)
+
+    def __bool__(self):
+        return True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):
+        # close()를 빠뜨린 호출부가 있어도 풀 슬롯이 새지 않도록 반납
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """스레드 안전한 고정 크기 pymysql 커넥션 풀"""
+
+    def __init__(self, connect_kwargs, size=10, timeout=10, idle_timeout=300,
+                 max_lifetime=1800, ping_on_borrow=True):
+        self.connect_kwargs = dict(connect_kwargs)
+        self.size = size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.ping_on_borrow = ping_on_borrow
+
+        self._cond = threading.Condition()
+        self._idle = deque()        # (raw 커넥션, 생성 시각, 마지막 반납 시각)
+        self._created_at = {}       # id(raw) -> 생성 시각
+        self._in_use = 0
+        self._waiting = 0
+
+        # 풀 지표
+        self._created = 0
+        self._discarded = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._checkout_time_total = 0.0
+        self._checkout_time_max = 0.0
+
+    def _open(self):
+        raw = pymysql.connect(**self.connect_kwargs)
+        with self._cond:
+            self._created_at[id(raw)] = time.monotonic()
+            self._created += 1
+        return raw
+
+    # 풀 장부에서만 지움 (_cond를 잡은 상태에서 호출), 실제 소켓 종료는 _close로 락 밖에서 함
+    def _discard(self, raw):
+        self._created_at.pop(id(raw), None)
+        self._discarded += 1
+
+    # 느린 소켓 종료가 다른 스레드의 대여를 막지 않도록 _cond 밖에서 호출
+    @staticmethod
+    def _close(raws):
+        for raw in raws:
+            try:
+                raw.close()
+            except Exception:
+                pass
+
+    def _is_expired(self, created_at, returned_at, now):
+        if self.max_lifetime and now - created_at > self.max_lifetime:
+            return True
+        if self.idle_timeout and now - returned_at > self.idle_timeout:
+            return True
+        return False
+
+    def acquire(self):
+        start = time.monotonic()
+        deadline = start + self.timeout if self.timeout else None
+        raw = None
+        expired = []
+        try:
+            with self._cond:
+                while True:
+                    now = time.monotonic()
+                    # 만료된 유휴 커넥션 정리
+                    while self._idle:
+                        candidate, created_at, returned_at = self._idle.pop()
+                        if self._is_expired(created_at, returned_at, now):
+                            self._discard(candidate)
+                            expired.append(candidate)
+                            continue
+                        raw = candidate
+                        break
+                    if raw is not None or self._in_use + len(self._idle) < self.size:
+                        self._in_use += 1
+                        break
+                    remaining = None if deadline is None else deadline - now
+                    if remaining is not None and remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(2013, f'커넥션 풀 대기 시간 초과 ({self.timeout}초, size={self.size})')
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+        finally:
+            self._close(expired)
+
+        # 실제 연결/ping은 락 밖에서 수행
+        try:
+            if raw is not None and self.ping_on_borrow:
+                try:
+                    raw.ping(reconnect=False)
+                except Exception:
+                    with self._cond:
+                        self._discard(raw)
+                    self._close([raw])
+                    raw = None
+            if raw is None:
+                raw = self._open()
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        elapsed = time.monotonic() - start
+        with self._cond:
+            self._checkouts += 1
+            self._checkout_time_total += elapsed
+            self._checkout_time_max = max(self._checkout_time_max, elapsed)
+        return PooledConnection(self, raw)
+
+    def _release(self, raw):
+        # 커밋/롤백하지 않은 트랜잭션이 다음 사용자에게 넘어가지 않도록 롤백 후 반납
+        healthy = True
+        try:
+            raw.rollback()
+        except Exception:
+            healthy = False
+        discarded = False
+        with self._cond:
+            self._in_use -= 1
+            created_at = self._created_at.get(id(raw))
+            now = time.monotonic()
+            if not healthy or created_at is None or self._is_expired(created_at, now, now):
+                self._discard(raw)
+                discarded = True
+            else:
+                self._idle.append((raw, created_at, now))
+            self._cond.notify()
+        if discarded:
+            self._close([raw])
+
+    def close_all(self):
+        closing = []
+        with self._cond:
+            while self._idle:
+                raw, _, _ = self._idle.pop()
+                self._discard(raw)
+                closing.append(raw)
+        self._close(closing)
+
+    def stats(self):
+        with self._cond:
+            return {
+                'size': self.size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'waiting': self._waiting,
+                'created': self._created,
+                'discarded': self._discarded,
+                'checkouts': self._checkouts,
+                'timeouts': self._timeouts,
+                'checkout_avg_ms': round(self._checkout_time_total / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+                'checkout_max_ms': round(self._checkout_time_max * 1000, 3),
+            }
+
+
+_pool = None
+_pool_settings = dict(POOL_DEFAULTS)
+_pool_lock = threading.Lock()
+
+
+def configure_pool(config):
+    """app.config 등 매핑에서 DB_POOL_* 값을 읽어 풀을 (재)설정합니다."""
+    global _pool
+    with _pool_lock:
+        for key in POOL_DEFAULTS:
+            if key in config:
+                _pool_settings[key] = config[key]
+        if _pool is not None:
+            _pool.close_all()
+            _pool = None
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    DB_CONFIG,
+                    size=_pool_settings['DB_POOL_SIZE'],
+                    timeout=_pool_settings['DB_POOL_TIMEOUT'],
+                    idle_timeout=_pool_settings['DB_POOL_IDLE_TIMEOUT'],
+                    max_lifetime=_pool_settings['DB_POOL_MAX_LIFETIME'],
+                    ping_on_borrow=_pool_settings['DB_POOL_PING_ON_BORROW'],
+                )
+    return _pool
+
+
+# 풀 지표 (사용 중 / 유휴 / 대기 스레드 수, 대여 대기 시간), /healthz/pool에서 사용
+def get_pool_stats():
+    return get_pool().stats()
+
+
+# 기존 호출부는 그대로 get_connection() / conn.close()를 사용하면 풀에서 빌리고 반납합니다.
 def get_connection():
-    return pymysql.connect(
-        host='localhost',
-        user='root',
-        password='12tlswogy',
-        db='member_db',
-        charset='utf8mb4',
-        cursorclass=pymysql.cursors.DictCursor
-    )
+    return get_pool().acquire()
+
+
+# fork된 자식 프로세스(gunicorn preload 워커 등)는 부모의 소켓을 같이 쓰면 안 되므로 빈 풀로 다시 시작
+# 부모 커넥션은 close() 하지 않고 버림 (자식에서 COM_QUIT을 보내면 부모 세션까지 끊김)
+def _reset_pool_after_fork():
+    global _pool, _pool_lock
+    _pool_lock = threading.Lock()
+    _pool = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_pool_after_fork)
 
 # def get_news_connection():
 #     return pymysql.connect(
@@ -0,0 +1,50 @@
+# gunicorn 설정 (preload + fork로 시장 데이터를 워커끼리 공유)
+# 실행: gunicorn -c gunicorn.conf.py app:app
+#
+# - preload_app: 마스터에서 create_app()을 한 번 실행해 주가/뉴스 프레임을 로드하고, 워커는 fork로 같은 메모리를 공유함
+#   (copy-on-write, 워커가 프레임을 수정하지 않는 한 페이지가 복사되지 않음)
+# - 마스터의 갱신 스레드가 프레임을 계속 새로 만들고, max_requests로 재시작되는 워커가 새 프레임을 물려받음
+# - 워커도 WORKER_MARKET_DATA_REFRESH_INTERVAL(초, 기본 300)마다 직접 증분 갱신함
+#   트레이드오프: 첫 갱신 뒤 워커의 프레임은 그 워커만의 메모리가 되어 fork 공유 효과가 사라짐 (워커 수 x 프레임 크기)
+#   0으로 끄면 프레임을 계속 공유하지만, 요청이 적은 워커는 max_requests로 재시작될 때까지 preload 시점 데이터를 보게 됨
+#   이때는 MARKET_DATA_MAX_STALENESS(초, 기본 900)가 상한: 프레임이 그보다 오래되면 다음 요청 때 백그라운드에서 갱신
+
+import gc
+import os
+
+# app.config가 import될 때 읽으므로 app을 import하기 전에 설정해야 함
+# 마스터에서 로드가 끝난 뒤 fork해야 워커가 같은 프레임을 공유함
+os.environ.setdefault('MARKET_DATA_LOAD_MODE', 'eager')
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', 4))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+preload_app = True
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = max_requests // 10
+
+
+def when_ready(server):
+    from app.services.memory import process_memory, format_memory
+    server.log.info(f"[INFO] 마스터 메모리 (preload 후): {format_memory(process_memory())}")
+
+
+def pre_fork(server, worker):
+    # 지금까지 만든 객체를 GC 추적 대상에서 빼서, 워커의 GC가 객체 헤더를 건드려 공유 페이지가 복사되지 않게 함
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    from app.services.memory import process_memory, format_memory
+    from app.services.stock.market_data_store import market_data_store
+
+    # 마스터에서 로드에 실패한 데이터셋은 워커에서 다시 시도
+    if not market_data_store.is_ready():
+        market_data_store.start_background_warm_up(int(os.environ.get('MARKET_DATA_RETRY_INTERVAL', 30)))
+    market_data_store.start_background_refresh(int(os.environ.get('WORKER_MARKET_DATA_REFRESH_INTERVAL', 300)))
+    server.log.info(f"[INFO] 워커 메모리 (fork 직후): {format_memory(process_memory())}")
+
+
+def worker_exit(server, worker):
+    from app.services.memory import process_memory, format_memory
+    server.log.info(f"[INFO] 워커 메모리 (종료 시): {format_memory(process_memory())}")
@@ -0,0 +1,14 @@
+-- prefer_stock: 사용자별 같은 종목이 한 번만 등록되도록 (user_id, stock_code) 유니크 키 추가
+-- 관심 종목 추가는 이 키를 전제로 INSERT 한 번만 실행하고, 중복 등록은 Duplicate entry(1062) 오류로 구분함 (app/services/favorites.py)
+-- 실행: mysql <DB> < migrations/20261018_prefer_stock_unique.sql
+
+-- 1) 이미 중복 등록된 (user_id, stock_code) 확인
+--    결과가 있으면 한 행만 남기고 정리한 뒤 2)를 실행 (중복이 남아 있으면 2)는 Duplicate entry 오류로 실패하고 아무것도 바꾸지 않음)
+SELECT user_id, stock_code, COUNT(*) AS rows_count
+FROM prefer_stock
+GROUP BY user_id, stock_code
+HAVING COUNT(*) > 1;
+
+-- 2) 유니크 키 추가
+ALTER TABLE prefer_stock
+    ADD UNIQUE KEY uq_prefer_stock_user_stock (user_id, stock_code);